@@ -1,23 +1,58 @@
 #!/usr/bin/env python3
 import sys
-import json
 import argparse
 import logging
-from claude_ai_service import claude_ai_service
-from ml_recruitment_service import recruitment_service
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def write_response(response_data):
+    """Write the response payload to stdout as indented JSON"""
+    sys.stdout.buffer.write(orjson.dumps(response_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+    sys.stdout.buffer.flush()
+
+def write_event(event):
+    """Write one streaming event to stdout as a single JSON line"""
+    sys.stdout.buffer.write(orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+    sys.stdout.buffer.flush()
+
+def rescore_students():
+    """Re-score every stored student whose profile is complete in one recommendation batch"""
+    from claude_ai_service import claude_ai_service
+    from ml_recruitment_service import recruitment_service
+    
+    batch_requests = []
+    for student_id, student_record in recruitment_service.students.items():
+        student_profile = claude_ai_service.create_student_profile(student_record.get('data', {}))
+        if not claude_ai_service.get_missing_college_scorecard_data(student_profile):
+            batch_requests.append({'student_id': student_id})
+    
+    logger.info("Re-scoring %s of %s stored students", len(batch_requests), len(recruitment_service.students))
+    return claude_ai_service.generate_recommendations_batch(batch_requests)
+
 def main():
     parser = argparse.ArgumentParser(description='AI Chat Handler')
-    parser.add_argument('--message', required=True, help='User message')
-    parser.add_argument('--student_id', required=True, help='Student ID')
+    parser.add_argument('--message', help='User message')
+    parser.add_argument('--student_id', help='Student ID')
+    parser.add_argument('--stream', action='store_true', help='Emit newline-delimited JSON events as the response is generated')
+    parser.add_argument('--rescore', action='store_true', help='Re-score all complete stored profiles through one Message Batch (e.g. after a retrain)')
     
     args = parser.parse_args()
     
+    if args.rescore:
+        # Non-interactive job: errors are raised rather than turned into a chat reply
+        write_response(rescore_students())
+        return
+    if not args.message or not args.student_id:
+        parser.error('--message and --student_id are required unless --rescore is given')
+    
     try:
+        # Imported here so argument errors don't pay for loading the AI/ML stack,
+        # and import failures are reported through the JSON error response
+        from claude_ai_service import claude_ai_service
+        
         logger.info(f"Processing message for student {args.student_id}")
         logger.info(f"Message: {args.message}")
         
@@ -27,10 +62,15 @@ def main():
         logger.info(f"Starting fresh conversation (no previous history loaded)")
         
         # Generate AI response
+        on_text = None
+        if args.stream:
+            on_text = lambda text: write_event({'type': 'delta', 'text': text})
+        
         result = claude_ai_service.generate_ai_response(
             args.message, 
             args.student_id, 
-            student_conversations
+            student_conversations,
+            on_text=on_text
         )
         
         logger.info(f"AI Response generated. Confidence: {result.get('confidence', 'unknown')}")
@@ -38,14 +78,18 @@ def main():
             logger.info(f"ML Prediction: {result['prediction']}")
         
         # Only add conversation to dataset if we have sufficient data (confidence is not 'collecting_data')
+        conversation_id = 0
         if result.get('confidence') != 'collecting_data':
+            from ml_recruitment_service import recruitment_service
+            
             conversation = recruitment_service.add_conversation(
                 args.student_id,
                 args.message,
                 result['response'],
                 result.get('prediction')
             )
-            logger.info(f"Conversation added to dataset. Total conversations: {len(recruitment_service.conversations)}")
+            conversation_id = recruitment_service.conversation_count()
+            logger.info(f"Conversation added to dataset. Total conversations: {conversation_id}")
         else:
             logger.info(f"Conversation NOT saved - still collecting data")
         
@@ -54,10 +98,13 @@ def main():
             'response': result['response'],
             'prediction': result.get('prediction'),
             'confidence': result.get('confidence', 'low'),
-            'conversation_id': len(recruitment_service.conversations) if result.get('confidence') != 'collecting_data' else 0
+            'conversation_id': conversation_id
         }
         
-        print(json.dumps(response_data, indent=2))
+        if args.stream:
+            write_event({'type': 'done', **response_data})
+        else:
+            write_response(response_data)
         
     except Exception as e:
         logger.error(f"Error in AI chat handler: {e}")
@@ -67,7 +114,10 @@ def main():
             'confidence': 'low',
             'conversation_id': 0
         }
-        print(json.dumps(error_response, indent=2))
+        if args.stream:
+            write_event({'type': 'done', **error_response})
+        else:
+            write_response(error_response)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
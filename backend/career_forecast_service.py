@@ -4,28 +4,57 @@
 
 import pandas as pd
 import numpy as np
-import json
+import logging
+import re
+import orjson
 import requests
 import warnings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from statsmodels.tsa.arima.model import ARIMA
 from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error
 from sklearn.linear_model import LinearRegression
 import os
+import math
+import multiprocessing
 import io
-from collections import defaultdict
+import csv
+import itertools
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from joblib import Parallel, delayed
 warnings.filterwarnings('ignore')
 
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
 DATASET_PATH = '../data/career_forecast_dataset.csv'
+DATASET_COLUMNS = ['OCC_CODE', 'OCC_TITLE', 'YEAR', 'TOT_EMP', 'A_MEDIAN']  # the only columns forecasting uses
 MUSE_API_URL = "https://www.themuse.com/api/public/jobs"
-REALTIME_DATA_FILE = '../data/realtime_job_data.json'
+REALTIME_DATA_FILE = '../data/realtime_job_data.jsonl'  # one job record per line
+LEGACY_REALTIME_DATA_FILE = '../data/realtime_job_data.json'
+REALTIME_INDEX_DB = '../data/realtime_job_index.db'
+MODEL_CACHE_DIR = '../data/model_cache'
+SERIES_CACHE_DIR = '../data/series_cache'  # memory-mapped per-occupation series shared by worker processes
+FORECAST_CACHE_SIZE = 2048  # room for every occupation, with and without realtime jobs
+MUSE_JOBS_TTL = 900  # seconds before an occupation's MUSE jobs are refreshed in the background
+FORECAST_CACHE_TTL = 3600  # seconds; forecasts without realtime jobs only change when the dataset does
+REALTIME_FORECAST_CACHE_TTL = 900  # seconds; keep realtime job listings reasonably fresh
 
 # MUSE API Job Categories for mapping
 MUSE_CATEGORIES = [
@@ -120,83 +149,160 @@ OCCUPATION_TO_MUSE_MAPPING = {
     "logistics": ["Transportation and Logistics"]
 }
 
+# All mapping keywords compiled into one alternation, longest first so that
+# multi-word keys like "civil engineer" win over "engineer". Matches must start
+# on a word boundary but may run into a suffix ("engineers", "developers").
+_MUSE_KEYWORD_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(keyword) for keyword in sorted(OCCUPATION_TO_MUSE_MAPPING, key=len, reverse=True)) + ")"
+)
+# When several keywords match, the one listed first in the mapping wins
+_MUSE_KEYWORD_PRIORITY = {keyword: rank for rank, keyword in enumerate(OCCUPATION_TO_MUSE_MAPPING)}
+
+# Whole-word fallbacks checked in order when no keyword matched
+_MUSE_FALLBACK_WORDS = (
+    (frozenset({'software', 'developer', 'programmer'}), "Software Engineering"),
+    (frozenset({'nurse', 'doctor', 'medical'}), "Healthcare"),
+    (frozenset({'teacher', 'instructor', 'professor'}), "Education"),
+    (frozenset({'manager', 'executive'}), "Management"),
+    (frozenset({'analyst', 'data'}), "Data Science"),
+    (frozenset({'accountant', 'auditor', 'accounting'}), "Accounting"),
+)
+
 # ============================================================================
 # ENHANCED FORECASTING FUNCTIONS
 # ============================================================================
 
-def enhanced_random_walk_forecast(ts, forecast_periods=7):
+# Exponential smoothing candidates as (name, trend)
+_ES_MODELS = (("Simple", None), ("Linear Trend", "add"))
+_ES_MODELS_POSITIVE = _ES_MODELS + (("Exponential Trend", "mul"),)
+
+# ARIMA (p, d, q) candidates
+_ARIMA_ORDERS = ((0, 1, 0), (1, 0, 0), (0, 0, 1), (1, 1, 0), (0, 1, 1), (1, 1, 1))
+
+# Set by the analytics pool initializer (_mark_pool_worker) in its worker processes
+_IN_POOL_WORKER = False
+
+def _random_walk_kernel(first_value, last_value, drift, drift_std, n_obs, forecast_periods):
+    """Fitted path, forecasts and 95% bounds for a random walk with drift"""
+    fitted = first_value + drift * np.arange(n_obs)
+    
+    steps = np.arange(1, forecast_periods + 1)
+    raw_forecasts = last_value + drift * steps
+    confidence_intervals = 1.96 * drift_std * np.sqrt(steps)
+    
+    forecasts = np.maximum(raw_forecasts, 0.0)
+    lower_bounds = np.maximum(raw_forecasts - confidence_intervals, 0.0)
+    upper_bounds = raw_forecasts + confidence_intervals
+    
+    return fitted, forecasts, lower_bounds, upper_bounds
+
+def _is_all_positive(ts):
+    """Whether every observation is > 0 (MAPE and multiplicative trends need this)"""
+    return bool((ts.to_numpy() > 0).all())
+
+def enhanced_random_walk_forecast(ts, forecast_periods=7, all_positive=None):
     """Enhanced Random Walk with Drift and confidence intervals"""
     if len(ts) < 3:
         return None
     
+    if all_positive is None:
+        all_positive = _is_all_positive(ts)
+    
     try:
-        changes = ts.diff().dropna()
-        drift = changes.mean()
-        drift_std = changes.std()
+        values = ts.to_numpy(dtype=float)
+        # nan-aware reductions match the NaN-skipping pandas stats used previously
+        changes = np.diff(values)
+        drift = np.nanmean(changes)
+        drift_std = np.nanstd(changes, ddof=1)
         
         if np.isnan(drift) or np.isnan(drift_std) or drift_std == 0:
-            drift_std = abs(drift) * 0.1 if abs(drift) > 0 else ts.std() * 0.1
-        
-        forecasts = []
-        lower_bounds = []
-        upper_bounds = []
-        last_value = ts.iloc[-1]
-        
-        for i in range(forecast_periods):
-            forecast = last_value + drift * (i + 1)
-            confidence_interval = 1.96 * drift_std * np.sqrt(i + 1)
-            
-            forecasts.append(max(forecast, 0))
-            lower_bounds.append(max(forecast - confidence_interval, 0))
-            upper_bounds.append(forecast + confidence_interval)
+            drift_std = abs(drift) * 0.1 if abs(drift) > 0 else np.nanstd(values, ddof=1) * 0.1
         
-        fitted_rw = [ts.iloc[0]]
-        for i in range(1, len(ts)):
-            fitted_rw.append(fitted_rw[-1] + drift)
+        fitted_rw, forecasts, lower_bounds, upper_bounds = _random_walk_kernel(
+            values[0], values[-1], drift, drift_std, len(values), forecast_periods
+        )
         
-        fitted_series = pd.Series(fitted_rw, index=ts.index)
-        mae = mean_absolute_error(ts, fitted_series)
-        mape = mean_absolute_percentage_error(ts, fitted_series) * 100 if np.all(ts > 0) else 50.0
+        mae = mean_absolute_error(values, fitted_rw)
+        mape = np.mean(np.abs((values - fitted_rw) / values)) * 100 if all_positive else 50.0
         
         return {
             'method': 'Random Walk with Drift',
-            'forecasts': np.array(forecasts),
-            'lower_bounds': np.array(lower_bounds),
-            'upper_bounds': np.array(upper_bounds),
-            'fitted_values': fitted_series,
+            'forecasts': forecasts,
+            'lower_bounds': lower_bounds,
+            'upper_bounds': upper_bounds,
+            'fitted_values': pd.Series(fitted_rw, index=ts.index),
             'mae': mae,
             'mape': mape
         }
     except Exception as e:
         return None
 
-def enhanced_exponential_smoothing_forecast(ts, forecast_periods=7):
+def _model_params_path(model_key, method, spec):
+    digest = hashlib.sha1(f"{model_key}|{method}|{spec}".encode()).hexdigest()
+    return os.path.join(MODEL_CACHE_DIR, f"{digest}.npy")
+
+def _load_start_params(model_key, method, spec):
+    """Parameters from the previous fit of this model, used to warm-start the optimiser"""
+    if model_key is None:
+        return None
+    try:
+        return np.load(_model_params_path(model_key, method, spec))
+    except (OSError, ValueError):
+        return None
+
+def _store_start_params(model_key, method, spec, params):
+    """Persist fitted parameters so the next refit of this model starts from them"""
+    params = np.asarray(params, dtype=float)
+    if model_key is None or not np.all(np.isfinite(params)):
+        return
+    path = _model_params_path(model_key, method, spec)
+    # Fits on other threads and pool processes read this directory concurrently, so swap the file in whole
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, params)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def _es_param_vector(fitted_model, trend):
+    """Optimised Holt-Winters parameters in the order ExponentialSmoothing.fit expects for start_params"""
+    names = ['smoothing_level', 'smoothing_trend', 'initial_level', 'initial_trend'] if trend else ['smoothing_level', 'initial_level']
+    return [fitted_model.params[name] for name in names]
+
+def enhanced_exponential_smoothing_forecast(ts, forecast_periods=7, model_key=None, all_positive=None):
     """Enhanced Exponential Smoothing with model selection"""
     if len(ts) < 4:
         return None
     
+    if all_positive is None:
+        all_positive = _is_all_positive(ts)
+    
     try:
-        models_to_try = [
-            {'trend': None, 'seasonal': None, 'name': 'Simple'},
-            {'trend': 'add', 'seasonal': None, 'name': 'Linear Trend'},
-        ]
-        
-        if np.all(ts > 0):
-            models_to_try.append({'trend': 'mul', 'seasonal': None, 'name': 'Exponential Trend'})
+        # A multiplicative trend is only defined for strictly positive data
+        models_to_try = _ES_MODELS_POSITIVE if all_positive else _ES_MODELS
         
         best_model = None
         best_aic = np.inf
         best_config = None
         
-        for model_config in models_to_try:
+        for config_name, trend in models_to_try:
             try:
-                model = ExponentialSmoothing(ts, trend=model_config['trend'], seasonal=model_config['seasonal'])
-                fitted_model = model.fit(optimized=True, use_brute=False)
+                model = ExponentialSmoothing(ts, trend=trend, seasonal=None)
+                start_params = _load_start_params(model_key, 'es', config_name)
+                try:
+                    fitted_model = model.fit(optimized=True, use_brute=False, start_params=start_params)
+                except Exception:
+                    if start_params is None:
+                        raise
+                    fitted_model = model.fit(optimized=True, use_brute=False)
+                _store_start_params(model_key, 'es', config_name, _es_param_vector(fitted_model, trend))
                 
                 if fitted_model.aic < best_aic:
                     best_aic = fitted_model.aic
                     best_model = fitted_model
-                    best_config = model_config['name']
+                    best_config = config_name
             except:
                 continue
         
@@ -213,7 +319,7 @@ def enhanced_exponential_smoothing_forecast(ts, forecast_periods=7):
         
         fitted_values = best_model.fittedvalues
         mae = mean_absolute_error(ts, fitted_values)
-        mape = mean_absolute_percentage_error(ts, fitted_values) * 100 if np.all(ts > 0) else 50.0
+        mape = mean_absolute_percentage_error(ts, fitted_values) * 100 if all_positive else 50.0
         
         return {
             'method': f'Exponential Smoothing ({best_config})',
@@ -228,32 +334,44 @@ def enhanced_exponential_smoothing_forecast(ts, forecast_periods=7):
     except:
         return None
 
-def enhanced_arima_forecast(ts, forecast_periods=7):
+def _fit_arima(ts, order, model_key=None):
+    """Fit one ARIMA candidate, returning (order, fitted_model) or None on failure"""
+    try:
+        model = ARIMA(ts, order=order)
+        start_params = _load_start_params(model_key, 'arima', order)
+        try:
+            fitted_model = model.fit(start_params=start_params)
+        except Exception:
+            if start_params is None:
+                raise
+            fitted_model = model.fit()
+        _store_start_params(model_key, 'arima', order, fitted_model.params)
+        return order, fitted_model
+    except:
+        return None
+
+def enhanced_arima_forecast(ts, forecast_periods=7, model_key=None, all_positive=None):
     """Enhanced ARIMA with automatic model selection"""
     if len(ts) < 5:
         return None
     
-    orders_to_try = [(0, 1, 0), (1, 0, 0), (0, 0, 1), (1, 1, 0), (0, 1, 1), (1, 1, 1)]
-    
-    best_model = None
-    best_aic = np.inf
-    best_order = None
+    if all_positive is None:
+        all_positive = _is_all_positive(ts)
     
-    for order in orders_to_try:
-        try:
-            model = ARIMA(ts, order=order)
-            fitted_model = model.fit()
-            
-            if fitted_model.aic < best_aic:
-                best_aic = fitted_model.aic
-                best_model = fitted_model
-                best_order = order
-        except:
-            continue
+    # Candidate orders are independent fits; run them side by side, except in an analytics
+    # pool worker, where the other workers already occupy the remaining cores
+    n_jobs = 1 if _IN_POOL_WORKER else min(len(_ARIMA_ORDERS), os.cpu_count() or 1)
+    fits = Parallel(n_jobs=n_jobs, backend="threading")(
+        delayed(_fit_arima)(ts, order, model_key) for order in _ARIMA_ORDERS
+    )
+    fits = [fit for fit in fits if fit is not None and np.isfinite(fit[1].aic)]
     
-    if best_model is None:
+    if not fits:
         return None
     
+    best_order, best_model = min(fits, key=lambda fit: fit[1].aic)
+    best_aic = best_model.aic
+    
     try:
         forecast_result = best_model.get_forecast(steps=forecast_periods)
         forecasts = forecast_result.predicted_mean.values
@@ -266,8 +384,11 @@ def enhanced_arima_forecast(ts, forecast_periods=7):
         lower_bounds = np.maximum(lower_bounds, 0)
         
         fitted_values = best_model.fittedvalues
-        mae = mean_absolute_error(ts[-len(fitted_values):], fitted_values)
-        mape = mean_absolute_percentage_error(ts[-len(fitted_values):], fitted_values) * 100 if np.all(ts[-len(fitted_values):] > 0) else 50.0
+        observed = ts[-len(fitted_values):]
+        if len(observed) != len(ts):
+            all_positive = _is_all_positive(observed)
+        mae = mean_absolute_error(observed, fitted_values)
+        mape = mean_absolute_percentage_error(observed, fitted_values) * 100 if all_positive else 50.0
         
         return {
             'method': f'ARIMA{best_order}',
@@ -283,26 +404,56 @@ def enhanced_arima_forecast(ts, forecast_periods=7):
     except:
         return None
 
-def robust_ensemble_forecast(ts, forecast_periods=7):
+class _SeriesKey:
+    """Hashable wrapper that compares time series by contents while keeping the original"""
+    __slots__ = ('ts', 'key')
+    
+    def __init__(self, ts):
+        self.ts = ts
+        self.key = (ts.values.tobytes(), ts.values.dtype.str, type(ts.index).__name__, tuple(ts.index))
+    
+    def __hash__(self):
+        return hash(self.key)
+    
+    def __eq__(self, other):
+        return self.key == other.key
+
+def robust_ensemble_forecast(ts, forecast_periods=7, model_key=None):
+    """Robust ensemble with linear regression fallback, memoised on the series contents
+    
+    model_key identifies the series across refits (e.g. occupation + measure) so the
+    ES/ARIMA optimisers can warm-start from the previous fit's parameters.
+    """
+    result = _cached_ensemble_forecast(_SeriesKey(ts), forecast_periods, model_key)
+    # Shallow copy so callers can't mutate the cached entry's keys
+    return dict(result) if result else result
+
+@lru_cache(maxsize=256)
+def _cached_ensemble_forecast(series_key, forecast_periods, model_key):
+    return _robust_ensemble_forecast(series_key.ts, forecast_periods, model_key)
+
+def _robust_ensemble_forecast(ts, forecast_periods=7, model_key=None):
     """Robust ensemble with linear regression fallback"""
     methods = []
     weights = []
     method_names = []
     
+    all_positive = _is_all_positive(ts)
+    
     # Try all time series methods
-    rw_result = enhanced_random_walk_forecast(ts, forecast_periods)
+    rw_result = enhanced_random_walk_forecast(ts, forecast_periods, all_positive=all_positive)
     if rw_result and rw_result['mape'] < 200:
         methods.append(rw_result)
         weights.append(1 / max(rw_result['mape'], 0.1))
         method_names.append('RW')
     
-    es_result = enhanced_exponential_smoothing_forecast(ts, forecast_periods)
+    es_result = enhanced_exponential_smoothing_forecast(ts, forecast_periods, model_key, all_positive=all_positive)
     if es_result and es_result['mape'] < 200:
         methods.append(es_result)
         weights.append(1 / max(es_result['mape'], 0.1))
         method_names.append('ES')
     
-    arima_result = enhanced_arima_forecast(ts, forecast_periods)
+    arima_result = enhanced_arima_forecast(ts, forecast_periods, model_key, all_positive=all_positive)
     if arima_result and arima_result['mape'] < 200:
         methods.append(arima_result)
         weights.append(1 / max(arima_result['mape'], 0.1))
@@ -328,7 +479,7 @@ def robust_ensemble_forecast(ts, forecast_periods=7):
             
             fitted_values = pd.Series(lr.predict(X), index=ts.index)
             mae = mean_absolute_error(ts, fitted_values)
-            mape = mean_absolute_percentage_error(ts, fitted_values) * 100 if np.all(ts > 0) else 50.0
+            mape = mean_absolute_percentage_error(ts, fitted_values) * 100 if all_positive else 50.0
             
             return {
                 'method': 'Linear Trend (Fallback)',
@@ -349,22 +500,16 @@ def robust_ensemble_forecast(ts, forecast_periods=7):
     weights = np.array(weights)
     weights = weights / weights.sum()
     
-    ensemble_forecasts = np.zeros(forecast_periods)
-    ensemble_lower = np.zeros(forecast_periods)
-    ensemble_upper = np.zeros(forecast_periods)
-    
-    for i, method in enumerate(methods):
-        ensemble_forecasts += weights[i] * method['forecasts']
-        ensemble_lower += weights[i] * method['lower_bounds']
-        ensemble_upper += weights[i] * method['upper_bounds']
+    # One (methods x periods) matrix per output, reduced by the weight vector
+    ensemble_forecasts = weights @ np.stack([m['forecasts'] for m in methods])
+    ensemble_lower = weights @ np.stack([m['lower_bounds'] for m in methods])
+    ensemble_upper = weights @ np.stack([m['upper_bounds'] for m in methods])
     
     # Ensemble fitted values
-    ensemble_fitted = None
-    for i, method in enumerate(methods):
-        if ensemble_fitted is None:
-            ensemble_fitted = weights[i] * method['fitted_values']
-        else:
-            ensemble_fitted += weights[i] * method['fitted_values']
+    ensemble_fitted = pd.Series(
+        weights @ np.stack([np.asarray(m['fitted_values']) for m in methods]),
+        index=methods[0]['fitted_values'].index
+    )
     
     best_method = min(methods, key=lambda x: x['mape'])
     
@@ -386,240 +531,432 @@ def robust_ensemble_forecast(ts, forecast_periods=7):
 # MUSE API INTEGRATION
 # ============================================================================
 
+# Shared keep-alive session so successive page requests reuse one connection
+_MUSE_SESSION = requests.Session()
+_MUSE_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET"], raise_on_status=False)
+))
+
+@lru_cache(maxsize=2048)
 def map_occupation_to_muse_category(occupation_title):
-    """Map occupation title to MUSE API categories"""
-    print(f"🔍 DEBUG: Mapping occupation '{occupation_title}' to MUSE category")
+    """Map occupation title to MUSE API categories (memoised per title)"""
+    logger.debug("🔍 Mapping occupation '%s' to MUSE category", occupation_title)
     
     occupation_lower = occupation_title.lower()
-    print(f"🔤 DEBUG: Lowercase occupation: '{occupation_lower}'")
+    logger.debug("🔤 Lowercase occupation: '%s'", occupation_lower)
     
     # Direct keyword matching with word boundaries
-    for keyword, categories in OCCUPATION_TO_MUSE_MAPPING.items():
-        # Use word boundary matching to avoid false matches
-        if keyword in occupation_lower:
-            # Check if it's a whole word or part of a larger word
-            words = occupation_lower.split()
-            if keyword in words or any(keyword in word for word in words):
-                print(f"✅ DEBUG: Found keyword match '{keyword}' -> category '{categories[0]}'")
-                return categories[0]  # Return the most relevant category
-    
-    # Special handling for multi-word occupations
-    if "civil engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'civil engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    elif "mechanical engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'mechanical engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    elif "electrical engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'electrical engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    elif "chemical engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'chemical engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    elif "environmental engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'environmental engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    elif "industrial engineer" in occupation_lower:
-        print(f"✅ DEBUG: Special match 'industrial engineer' -> 'Science and Engineering'")
-        return "Science and Engineering"
-    
-    print(f"🔍 DEBUG: No direct keyword match found, trying fallback mappings")
+    matched_keywords = _MUSE_KEYWORD_PATTERN.findall(occupation_lower)
+    if matched_keywords:
+        keyword = min(matched_keywords, key=_MUSE_KEYWORD_PRIORITY.__getitem__)
+        category = OCCUPATION_TO_MUSE_MAPPING[keyword][0]  # Return the most relevant category
+        logger.debug("✅ Found keyword match '%s' -> category '%s'", keyword, category)
+        return category
+    
+    logger.debug("🔍 No direct keyword match found, trying fallback mappings")
     
     # Fallback mappings with better word matching
-    words = occupation_lower.split()
-    
-    if any(word in ['software', 'developer', 'programmer'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'software/developer/programmer' -> 'Software Engineering'")
-        return "Software Engineering"
-    elif any(word in ['nurse', 'doctor', 'medical'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'nurse/doctor/medical' -> 'Healthcare'")
-        return "Healthcare"
-    elif any(word in ['teacher', 'instructor', 'professor'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'teacher/instructor/professor' -> 'Education'")
-        return "Education"
-    elif any(word in ['manager', 'executive'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'manager/executive' -> 'Management'")
-        return "Management"
-    elif any(word in ['analyst', 'data'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'analyst/data' -> 'Data Science'")
-        return "Data Science"
-    elif any(word in ['accountant', 'auditor', 'accounting'] for word in words):
-        print(f"✅ DEBUG: Fallback match 'accountant/auditor/accounting' -> 'Accounting'")
-        return "Accounting"
-    else:
-        print(f"❌ DEBUG: No mapping found for '{occupation_title}' -> returning 'Unknown'")
-        return "Unknown"
+    words = set(occupation_lower.split())
+    
+    for fallback_words, category in _MUSE_FALLBACK_WORDS:
+        if not fallback_words.isdisjoint(words):
+            logger.debug("✅ Fallback match %s -> '%s'", fallback_words & words, category)
+            return category
+    
+    logger.debug("❌ No mapping found for '%s' -> returning 'Unknown'", occupation_title)
+    return "Unknown"
 
 def fetch_muse_job_data(occupation_title, max_pages=5):
     """Fetch real-time job data from MUSE API"""
-    print(f"\n🔍 DEBUG: Starting MUSE API fetch for occupation: '{occupation_title}'")
+    logger.debug("🔍 Starting MUSE API fetch for occupation: '%s'", occupation_title)
     
     muse_category = map_occupation_to_muse_category(occupation_title)
-    print(f"📋 DEBUG: Mapped occupation to MUSE category: '{muse_category}'")
+    logger.debug("📋 Mapped occupation to MUSE category: '%s'", muse_category)
     
     if muse_category == "Unknown":
-        print(f"❌ DEBUG: No MUSE category found for '{occupation_title}' - skipping API call")
+        logger.debug("❌ No MUSE category found for '%s' - skipping API call", occupation_title)
         return []
     
     all_jobs = []
     total_pages_fetched = 0
     
-    print(f"🌐 DEBUG: Making API calls to: {MUSE_API_URL}")
+    logger.debug("🌐 Making API calls to: %s", MUSE_API_URL)
     
-    for page in range(1, max_pages + 1):
-        try:
+    # Pages are independent, so request them all at once and consume them in
+    # order; anything after the first empty or failed page is discarded.
+    with ThreadPoolExecutor(max_workers=max_pages) as executor:
+        futures = []
+        for page in range(1, max_pages + 1):
             params = {
                 'page': page,
                 'category': muse_category,
                 'location': 'United States'  # Focus on US jobs
             }
-            
-            print(f"📄 DEBUG: Fetching page {page} with params: {params}")
-            response = requests.get(MUSE_API_URL, params=params, timeout=10)
-            
-            print(f"📡 DEBUG: API Response Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"🔍 DEBUG: API Response structure: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+            logger.debug("📄 Fetching page %d with params: %s", page, params)
+            futures.append(executor.submit(_MUSE_SESSION.get, MUSE_API_URL, params=params, timeout=10))
+        
+        for page, future in enumerate(futures, start=1):
+            try:
+                response = future.result()
                 
-                jobs = data.get('results', [])
-                print(f"📊 DEBUG: Page {page} returned {len(jobs)} jobs")
+                logger.debug("📡 API Response Status: %s", response.status_code)
                 
-                if not jobs:
-                    print(f"📭 DEBUG: No jobs found on page {page} - stopping pagination")
+                if response.status_code == 200:
+                    data = response.json()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("🔍 API Response structure: %s", list(data.keys()) if isinstance(data, dict) else 'Not a dict')
+                    
+                    jobs = data.get('results', [])
+                    logger.debug("📊 Page %d returned %d jobs", page, len(jobs))
+                    
+                    if not jobs:
+                        logger.debug("📭 No jobs found on page %d - stopping pagination", page)
+                        break
+                    
+                    for i, job in enumerate(jobs):
+                        try:
+                            # Debug the job structure
+                            if i == 0 and logger.isEnabledFor(logging.DEBUG):  # Only debug first job to avoid spam
+                                logger.debug("🔍 First job structure: %s", list(job.keys()) if isinstance(job, dict) else 'Not a dict')
+                                logger.debug("🔍 Sample job data: %s", job)
+                            
+                            # Extract relevant job data with correct field names based on API response
+                            job_data = {
+                                'title': job.get('name', '') if isinstance(job, dict) else str(job),  # API uses 'name' not 'title'
+                                'company': job.get('company', {}).get('name', '') if isinstance(job, dict) and isinstance(job.get('company'), dict) else '',
+                                'location': job.get('locations', [{}])[0].get('name', '') if isinstance(job, dict) and job.get('locations') and isinstance(job.get('locations'), list) and len(job.get('locations')) > 0 else '',
+                                'publication_date': job.get('publication_date', ''),
+                                'category': muse_category,
+                                'salary_min': job.get('salary_min'),
+                                'salary_max': job.get('salary_max'),
+                                'salary_currency': job.get('salary_currency'),
+                                'job_type': job.get('type', {}).get('name', '') if isinstance(job, dict) and isinstance(job.get('type'), dict) else '',
+                                'experience_level': job.get('levels', [{}])[0].get('name', '') if isinstance(job, dict) and job.get('levels') and isinstance(job.get('levels'), list) and len(job.get('levels')) > 0 else ''
+                            }
+                            
+                            # Debug first job details
+                            if i == 0:
+                                logger.debug("🔍 Extracted job data: %s", job_data)
+                            
+                            all_jobs.append(job_data)
+                        except Exception as e:
+                            logger.debug("❌ Error processing job %d: %s", i, e)
+                            logger.debug("🔍 Job data: %s", job)
+                            continue
+                    
+                    total_pages_fetched += 1
+                    
+                else:
+                    logger.warning("❌ MUSE API error: %s", response.status_code)
+                    logger.debug("🔍 Response content: %.200s...", response.text)
                     break
-                
-                for i, job in enumerate(jobs):
-                    try:
-                        # Debug the job structure
-                        if i == 0:  # Only debug first job to avoid spam
-                            print(f"🔍 DEBUG: First job structure: {list(job.keys()) if isinstance(job, dict) else 'Not a dict'}")
-                            print(f"🔍 DEBUG: Sample job data: {job}")
-                        
-                        # Extract relevant job data with correct field names based on API response
-                        job_data = {
-                            'title': job.get('name', '') if isinstance(job, dict) else str(job),  # API uses 'name' not 'title'
-                            'company': job.get('company', {}).get('name', '') if isinstance(job, dict) and isinstance(job.get('company'), dict) else '',
-                            'location': job.get('locations', [{}])[0].get('name', '') if isinstance(job, dict) and job.get('locations') and isinstance(job.get('locations'), list) and len(job.get('locations')) > 0 else '',
-                            'publication_date': job.get('publication_date', ''),
-                            'category': muse_category,
-                            'salary_min': job.get('salary_min'),
-                            'salary_max': job.get('salary_max'),
-                            'salary_currency': job.get('salary_currency'),
-                            'job_type': job.get('type', {}).get('name', '') if isinstance(job, dict) and isinstance(job.get('type'), dict) else '',
-                            'experience_level': job.get('levels', [{}])[0].get('name', '') if isinstance(job, dict) and job.get('levels') and isinstance(job.get('levels'), list) and len(job.get('levels')) > 0 else ''
-                        }
-                        
-                        # Debug first job details
-                        if i == 0:
-                            print(f"🔍 DEBUG: Extracted job data: {job_data}")
-                        
-                        all_jobs.append(job_data)
-                    except Exception as e:
-                        print(f"❌ DEBUG: Error processing job {i}: {e}")
-                        print(f"🔍 DEBUG: Job data: {job}")
-                        continue
-                
-                total_pages_fetched += 1
-                
-            else:
-                print(f"❌ DEBUG: MUSE API error: {response.status_code}")
-                print(f"🔍 DEBUG: Response content: {response.text[:200]}...")
+                    
+            except Exception as e:
+                logger.warning("❌ Error fetching MUSE data on page %d: %s", page, e)
                 break
-                
-        except Exception as e:
-            print(f"❌ DEBUG: Error fetching MUSE data on page {page}: {e}")
-            break
     
-    print(f"✅ DEBUG: MUSE API fetch completed:")
-    print(f"   📊 Total pages fetched: {total_pages_fetched}")
-    print(f"   📋 Total jobs collected: {len(all_jobs)}")
-    print(f"   🏢 Sample jobs: {[job['title'][:30] + '...' for job in all_jobs[:3]]}")
+    logger.debug("✅ MUSE API fetch completed:")
+    logger.debug("   📊 Total pages fetched: %d", total_pages_fetched)
+    logger.debug("   📋 Total jobs collected: %d", len(all_jobs))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   🏢 Sample jobs: %s", [job['title'][:30] + '...' for job in all_jobs[:3]])
     
     return all_jobs
 
+# Per-occupation MUSE results: title -> (fetched_at, jobs), plus refreshes currently running
+_muse_jobs_cache = {}
+_muse_refreshing = {}
+_muse_cache_lock = threading.Lock()
+
+def _refresh_muse_jobs(occupation_title):
+    """Fetch and store MUSE jobs for an occupation, then update the in-memory cache"""
+    try:
+        jobs = fetch_muse_job_data(occupation_title)
+        if jobs:
+            new_jobs_count = save_realtime_data(occupation_title, jobs)
+            logger.debug("💾 Saved %d new jobs to storage", new_jobs_count)
+        with _muse_cache_lock:
+            _muse_jobs_cache[occupation_title] = (time.monotonic(), jobs)
+        return jobs
+    finally:
+        with _muse_cache_lock:
+            _muse_refreshing.pop(occupation_title, None)
+
+def muse_jobs_future(occupation_title):
+    """Future for an occupation's MUSE jobs
+    
+    Cached jobs are returned immediately, even when stale; a stale or missing entry
+    starts one background refresh, and only a cold miss has to wait for it.
+    """
+    with _muse_cache_lock:
+        entry = _muse_jobs_cache.get(occupation_title)
+        refresh = _muse_refreshing.get(occupation_title)
+        if refresh is None and (entry is None or time.monotonic() - entry[0] > MUSE_JOBS_TTL):
+            refresh = _muse_refreshing[occupation_title] = _FORECAST_EXECUTOR.submit(_refresh_muse_jobs, occupation_title)
+    
+    if entry is None:
+        return refresh
+    cached = Future()
+    cached.set_result(entry[1])
+    return cached
+
+REALTIME_CSV_HEADER = ['Occupation', 'Job Title', 'Company', 'Location', 'Publication Date', 'Category', 'Salary Min', 'Salary Max', 'Salary Currency', 'Job Type', 'Experience Level', 'Timestamp']
+REALTIME_CSV_FIELDS = ('title', 'company', 'location', 'publication_date', 'category', 'salary_min', 'salary_max', 'salary_currency', 'job_type', 'experience_level', 'timestamp')
+
+def realtime_job_id(job):
+    """Deduplication key for a saved job (title + company)"""
+    return f"{job.get('title', '')}_{job.get('company', '')}"
+
+def _realtime_record_lines(occupation_title, jobs):
+    """Serialise jobs as JSON Lines records tagged with their occupation"""
+    return b''.join(
+        orjson.dumps({'occupation': occupation_title, **job}, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n'
+        for job in jobs
+    )
+
+def _migrate_legacy_realtime_data():
+    """Convert the old whole-dict JSON store to JSON Lines the first time it is needed"""
+    if os.path.exists(REALTIME_DATA_FILE) or not os.path.exists(LEGACY_REALTIME_DATA_FILE):
+        return
+    with open(LEGACY_REALTIME_DATA_FILE, 'rb') as f:
+        legacy_data = orjson.loads(f.read())
+    # Per-process temp name: several workers can reach the migration at startup
+    tmp_path = f"{REALTIME_DATA_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for occupation, jobs in legacy_data.items():
+            f.write(_realtime_record_lines(occupation, jobs))
+    os.replace(tmp_path, REALTIME_DATA_FILE)
+
+def iter_realtime_records():
+    """Yield every stored job record, each carrying an 'occupation' field"""
+    _migrate_legacy_realtime_data()
+    if not os.path.exists(REALTIME_DATA_FILE):
+        return
+    with open(REALTIME_DATA_FILE, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+def load_realtime_data():
+    """Stored jobs grouped by occupation, in the order they were saved"""
+    data = {}
+    for record in iter_realtime_records():
+        occupation = record.pop('occupation', '')
+        data.setdefault(occupation, []).append(record)
+    return data
+
+def _open_realtime_index():
+    """Open the on-disk job-id index, seeding it from REALTIME_DATA_FILE on first use"""
+    is_new = not os.path.exists(REALTIME_INDEX_DB)
+    conn = sqlite3.connect(REALTIME_INDEX_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS job_ids ("
+        "occupation TEXT NOT NULL, job_id TEXT NOT NULL, PRIMARY KEY (occupation, job_id))"
+    )
+    if is_new:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_ids VALUES (?, ?)",
+                ((record.get('occupation', ''), realtime_job_id(record)) for record in iter_realtime_records())
+            )
+    return conn
+
 def save_realtime_data(occupation_title, job_data):
-    """Save real-time job data to avoid duplicates"""
-    print(f"\n💾 DEBUG: Saving real-time data for occupation: '{occupation_title}'")
-    print(f"📊 DEBUG: Received {len(job_data)} jobs to save")
+    """Append new real-time jobs to REALTIME_DATA_FILE, skipping ones already saved"""
+    logger.debug("💾 Saving real-time data for occupation: '%s'", occupation_title)
+    logger.debug("📊 Received %d jobs to save", len(job_data))
     
     try:
-        # Load existing data
-        if os.path.exists(REALTIME_DATA_FILE):
-            with open(REALTIME_DATA_FILE, 'r') as f:
-                existing_data = json.load(f)
-            print(f"📁 DEBUG: Loaded existing data from {REALTIME_DATA_FILE}")
-        else:
-            existing_data = {}
-            print(f"📁 DEBUG: No existing data file found, creating new one")
-        
-        # Add new data with timestamp
-        timestamp = datetime.now().isoformat()
-        if occupation_title not in existing_data:
-            existing_data[occupation_title] = []
-            print(f"🆕 DEBUG: First time saving data for this occupation")
-        else:
-            print(f"📈 DEBUG: Found {len(existing_data[occupation_title])} existing jobs for this occupation")
-        
-        # Check for duplicates based on job title and company
-        existing_job_ids = set()
-        for job in existing_data[occupation_title]:
-            job_id = f"{job.get('title', '')}_{job.get('company', '')}"
-            existing_job_ids.add(job_id)
-        
-        print(f"🔍 DEBUG: Found {len(existing_job_ids)} existing job IDs")
-        
-        # Add only new jobs
-        new_jobs = []
-        for job in job_data:
-            job_id = f"{job.get('title', '')}_{job.get('company', '')}"
-            if job_id not in existing_job_ids:
-                job['timestamp'] = timestamp
-                new_jobs.append(job)
-                existing_job_ids.add(job_id)
-            else:
-                print(f"🔍 DEBUG: Skipping duplicate job: {job.get('title', '')} at {job.get('company', '')}")
-        
-        print(f"✅ DEBUG: Added {len(new_jobs)} new jobs (filtered out duplicates)")
-        
-        existing_data[occupation_title].extend(new_jobs)
-        
-        # Save updated data
-        with open(REALTIME_DATA_FILE, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        with closing(_open_realtime_index()) as index, index:
+            # Add only new jobs; the (occupation, job_id) primary key rejects duplicates
+            timestamp = datetime.now().isoformat()
+            new_jobs = []
+            for job in job_data:
+                inserted = index.execute(
+                    "INSERT OR IGNORE INTO job_ids VALUES (?, ?)", (occupation_title, realtime_job_id(job))
+                ).rowcount
+                if inserted:
+                    job['timestamp'] = timestamp
+                    new_jobs.append(job)
+                else:
+                    logger.debug("🔍 Skipping duplicate job: %s at %s", job.get('title', ''), job.get('company', ''))
+            
+            logger.debug("✅ Added %d new jobs (filtered out duplicates)", len(new_jobs))
+            
+            if not new_jobs:
+                return 0
+            
+            # Append only the new records; the index transaction only commits if this succeeds
+            with open(REALTIME_DATA_FILE, 'ab') as f:
+                f.write(_realtime_record_lines(occupation_title, new_jobs))
+            
+            total_saved = index.execute(
+                "SELECT COUNT(*) FROM job_ids WHERE occupation = ?", (occupation_title,)
+            ).fetchone()[0]
         
-        print(f"💾 DEBUG: Successfully saved data to {REALTIME_DATA_FILE}")
-        print(f"📊 DEBUG: Total jobs now saved for '{occupation_title}': {len(existing_data[occupation_title])}")
+        logger.debug("💾 Successfully saved data to %s", REALTIME_DATA_FILE)
+        logger.debug("📊 Total jobs now saved for '%s': %d", occupation_title, total_saved)
         
         return len(new_jobs)
         
     except Exception as e:
-        print(f"❌ DEBUG: Error saving real-time data: {e}")
+        logger.error("❌ Error saving real-time data: %s", e)
         return 0
 
 # ============================================================================
 # CAREER FORECASTER CLASS
 # ============================================================================
 
+# Forecast rating tables, indexed by np.searchsorted buckets of MAPE and growth.
+# Quality: MAPE buckets <10, <20, <40, rest (side='right'); |1-year growth| buckets <25, <50, rest (NaN last).
+_QUALITY_MAPE_EDGES = np.array([10.0, 20.0, 40.0])
+_QUALITY_GROWTH_EDGES = np.array([25.0, 50.0])
+_EXCELLENT = ("EXCELLENT", "High")
+_GOOD = ("GOOD", "Medium")
+_FAIR = ("FAIR", "Low")
+_POOR = ("POOR", "Very Low")
+_QUALITY_TABLE = (
+    (_EXCELLENT, _GOOD, _FAIR),
+    (_GOOD, _GOOD, _FAIR),
+    (_FAIR, _FAIR, _FAIR),
+    (_POOR, _POOR, _POOR),
+)
+
+# Recommendation: total growth buckets <-10, <=0, <=10, <=20, >20, NaN (side='left');
+# MAPE buckets <10, <15, <25, rest (side='right').
+_RECOMMENDATION_GROWTH_EDGES = np.array([np.nextafter(-10.0, -np.inf), 0.0, 10.0, 20.0, np.inf])
+_RECOMMENDATION_MAPE_EDGES = np.array([10.0, 15.0, 25.0])
+_EXCELLENT_CHOICE = ("🚀 EXCELLENT CAREER CHOICE", "High growth potential with reliable forecasts")
+_STRONG_CHOICE = ("✅ STRONG CAREER CHOICE", "Good growth prospects with solid reliability")
+_MODERATE_CHOICE = ("🟨 MODERATE CAREER CHOICE", "Positive growth but some uncertainty")
+_DECLINING_FIELD = ("⚠️ DECLINING FIELD", "Negative growth trend - consider alternatives")
+_STABLE_FIELD = ("🔍 STABLE FIELD", "Minimal growth expected - research specializations")
+_RECOMMENDATION_TABLE = (
+    (_DECLINING_FIELD,) * 4,
+    (_STABLE_FIELD,) * 4,
+    (_MODERATE_CHOICE, _MODERATE_CHOICE, _MODERATE_CHOICE, _STABLE_FIELD),
+    (_STRONG_CHOICE, _STRONG_CHOICE, _MODERATE_CHOICE, _STABLE_FIELD),
+    (_EXCELLENT_CHOICE, _STRONG_CHOICE, _MODERATE_CHOICE, _STABLE_FIELD),
+    (_STABLE_FIELD,) * 4,
+)
+
+def rate_forecast(mape, growth_1yr, growth_total):
+    """(quality, confidence, recommendation, advice) for a forecast's MAPE and growth"""
+    quality, confidence = _QUALITY_TABLE[
+        np.searchsorted(_QUALITY_MAPE_EDGES, mape, side='right')
+    ][np.searchsorted(_QUALITY_GROWTH_EDGES, abs(growth_1yr), side='right')]
+    recommendation, advice = _RECOMMENDATION_TABLE[
+        np.searchsorted(_RECOMMENDATION_GROWTH_EDGES, growth_total, side='left')
+    ][np.searchsorted(_RECOMMENDATION_MAPE_EDGES, mape, side='right')]
+    return quality, confidence, recommendation, advice
+
+# Runs the salary ensemble and MUSE fetch alongside the employment ensemble
+_FORECAST_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+def _reset_forecast_executor():
+    """Forked children don't inherit the parent's worker threads"""
+    global _FORECAST_EXECUTOR
+    _FORECAST_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_forecast_executor)
+
+class ForecastCache:
+    """Thread-safe LRU cache with per-entry expiry; concurrent misses on one key share a single computation"""
+    
+    def __init__(self, maxsize=FORECAST_CACHE_SIZE, ttl=FORECAST_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight = {}  # key -> Future for a computation already running
+        self._lock = threading.RLock()
+    
+    def put(self, key, value, ttl=None):
+        """Store a value computed elsewhere (e.g. by the startup warm-up)"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+    
+    def get(self, key):
+        """Return the cached value, or None if it is missing or expired; never computes"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return (value, cached); falsy results are not stored"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1], True
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[key] = Future()
+        
+        if not is_owner:
+            return future.result(), False
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            if value:
+                self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            self._in_flight.pop(key, None)
+        future.set_result(value)
+        return value, False
+
 class CareerForecaster:
     """Complete career forecasting system"""
     
     def __init__(self):
         self.df = None
         self.occupations = []
-        self.forecast_cache = {}
+        self.series_by_title = {}
+        self._occupations_arr = np.array([], dtype=str)
+        self._occupations_lower = np.array([], dtype=str)
+        self._bigram_index = {}
+        self.forecast_cache = ForecastCache()
         self.load_dataset()
     
     def load_dataset(self):
         """Load and prepare the career forecasting dataset"""
         try:
-            self.df = pd.read_csv(DATASET_PATH)
-            print(f"✅ Dataset loaded: {len(self.df):,} records")
+            # Workers started after the first one map the series it wrote instead of re-reading the dataset
+            if self._load_series_cache():
+                self._build_search_index()
+                return
+            
+            self.df = self._read_dataset()
+            logger.info("✅ Dataset loaded: %s records", f"{len(self.df):,}")
             
             # Filter for occupations with sufficient historical data (4+ years)
             # This matches the newer service logic for reliable forecasting
-            occupation_years = self.df.groupby('OCC_CODE')['YEAR'].nunique()
+            occupation_years = self.df.groupby('OCC_CODE', observed=True)['YEAR'].nunique()
             occupations_with_sufficient_data = occupation_years[occupation_years >= 4].index
             
             # Get occupation titles for codes with sufficient data
@@ -631,22 +968,151 @@ class CareerForecaster:
             # Use OCC_TITLE for the occupation list (user-facing)
             self.occupations = sorted(self.occupation_mapping['OCC_TITLE'].unique())
             
+            self._build_search_index()
+            
             # Store the forecastable occupation codes (for internal use)
             self.forecastable_codes = list(occupations_with_sufficient_data)
             
             # Store the filtered dataset for forecasting
             self.filtered_df = filtered_df
             
-            print(f"📊 Total unique occupation codes: {len(self.df['OCC_CODE'].unique()):,}")
-            print(f"📈 Occupation codes with 4+ years of data: {len(occupations_with_sufficient_data):,}")
-            print(f"📋 Available occupations (filtered): {len(self.occupations):,}")
-            print(f"✅ Using filtered dataset with {len(filtered_df)} records for forecasting")
-            print(f"🎯 Matching newer service: {len(occupations_with_sufficient_data)} forecastable occupations")
+            # Precompute each occupation's yearly series once so forecasts are a dict lookup
+            self.series_by_title = self._build_series_by_title(filtered_df)
+            self._write_series_cache()
+            
+            logger.info("📊 Total unique occupation codes: %s", f"{self.df['OCC_CODE'].nunique():,}")
+            logger.info("📈 Occupation codes with 4+ years of data: %s", f"{len(occupations_with_sufficient_data):,}")
+            logger.info("📋 Available occupations (filtered): %s", f"{len(self.occupations):,}")
+            logger.info("✅ Using filtered dataset with %d records for forecasting", len(filtered_df))
+            logger.info("🎯 Matching newer service: %d forecastable occupations", len(occupations_with_sufficient_data))
             
         except Exception as e:
-            print(f"❌ Error loading dataset: {e}")
+            logger.error("❌ Error loading dataset: %s", e)
             self.df = None
     
+    def _build_search_index(self):
+        """Search index: titles and their lowercase forms as NumPy string arrays, plus a bigram index"""
+        self._occupations_arr = np.array(self.occupations, dtype=str)
+        self._occupations_lower = np.char.lower(self._occupations_arr)
+        self._bigram_index = self._build_bigram_index(self._occupations_lower.tolist())
+    
+    @staticmethod
+    def _dataset_stamp():
+        """Identifies the DATASET_PATH contents a series cache was built from"""
+        stat = os.stat(DATASET_PATH)
+        return [os.path.abspath(DATASET_PATH), stat.st_mtime_ns, stat.st_size]
+    
+    def _write_series_cache(self):
+        """Save series_by_title as three concatenated .npy arrays plus per-title offsets"""
+        titles = list(self.series_by_title)
+        lengths = [len(self.series_by_title[title][0]) for title in titles]
+        meta = {
+            'stamp': self._dataset_stamp(),
+            'titles': titles,
+            'offsets': np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))).tolist(),
+            'occupations': list(self.occupations),
+            'forecastable_codes': [str(code) for code in self.forecastable_codes]
+        }
+        try:
+            os.makedirs(SERIES_CACHE_DIR, exist_ok=True)
+            for position, name in enumerate(('years', 'emp', 'salary')):
+                values = np.concatenate([self.series_by_title[title][position] for title in titles]) if titles else np.array([])
+                tmp_path = os.path.join(SERIES_CACHE_DIR, f"{name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, values)
+                os.replace(tmp_path, os.path.join(SERIES_CACHE_DIR, f"{name}.npy"))
+            # meta.json goes last: it is what marks the cache as complete
+            tmp_path = os.path.join(SERIES_CACHE_DIR, f"meta.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(meta))
+            os.replace(tmp_path, os.path.join(SERIES_CACHE_DIR, 'meta.json'))
+        except OSError as e:
+            logger.warning("⚠️ Could not write series cache to %s: %s", SERIES_CACHE_DIR, e)
+    
+    def _load_series_cache(self):
+        """Memory-map the series cache if it was built from the current DATASET_PATH
+        
+        The arrays are opened read-only with mmap_mode='r', so every worker process
+        shares the same page-cache copy instead of holding its own.
+        """
+        try:
+            with open(os.path.join(SERIES_CACHE_DIR, 'meta.json'), 'rb') as f:
+                meta = orjson.loads(f.read())
+            if meta['stamp'] != self._dataset_stamp():
+                return False
+            years, emp, salary = (
+                np.load(os.path.join(SERIES_CACHE_DIR, f"{name}.npy"), mmap_mode='r')
+                for name in ('years', 'emp', 'salary')
+            )
+        except (OSError, ValueError, KeyError):
+            return False
+        
+        offsets = meta['offsets']
+        self.series_by_title = {
+            title: (years[start:end], emp[start:end], salary[start:end])
+            for title, start, end in zip(meta['titles'], offsets, offsets[1:])
+        }
+        self.occupations = meta['occupations']
+        self.forecastable_codes = meta['forecastable_codes']
+        logger.info("✅ Mapped %d occupation series from %s", len(self.series_by_title), SERIES_CACHE_DIR)
+        return True
+    
+    @staticmethod
+    def _read_dataset():
+        """Read only DATASET_COLUMNS, preferring a Parquet copy of DATASET_PATH that is kept beside it"""
+        parquet_path = os.path.splitext(DATASET_PATH)[0] + '.parquet'
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(DATASET_PATH):
+            try:
+                return pd.read_parquet(parquet_path, columns=DATASET_COLUMNS)  # categoricals round-trip as dictionaries
+            except Exception as e:
+                logger.warning("⚠️ Could not read %s, falling back to CSV: %s", parquet_path, e)
+        
+        # Codes and titles repeat once per area/year row, so store them as integer-coded categoricals
+        csv_options = dict(usecols=DATASET_COLUMNS, dtype={'OCC_CODE': 'category', 'OCC_TITLE': 'category'})
+        try:
+            df = pd.read_csv(DATASET_PATH, engine='pyarrow', **csv_options)
+        except ImportError:
+            df = pd.read_csv(DATASET_PATH, **csv_options)
+        
+        # One-time conversion so later start-ups skip CSV parsing (needs a Parquet engine);
+        # written under a per-process name and renamed so other workers never read a partial file
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, parquet_path)
+            logger.info("✅ Wrote Parquet copy of dataset: %s", parquet_path)
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning("⚠️ Could not write %s: %s", parquet_path, e)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return df
+    
+    @staticmethod
+    def _build_series_by_title(filtered_df):
+        """Map OCC_TITLE -> (years, mean TOT_EMP, mean A_MEDIAN) arrays sorted by year
+        
+        Titles shared by several OCC_CODEs use the code with the most rows.
+        """
+        code_counts = filtered_df.groupby(['OCC_TITLE', 'OCC_CODE'], observed=True).size().reset_index(name='rows')
+        best_codes = (
+            code_counts.sort_values(['OCC_TITLE', 'rows', 'OCC_CODE'], ascending=[True, False, True])
+            .drop_duplicates('OCC_TITLE')
+        )
+        selected = filtered_df.merge(best_codes[['OCC_TITLE', 'OCC_CODE']], on=['OCC_TITLE', 'OCC_CODE'])
+        
+        yearly = selected.groupby(['OCC_TITLE', 'YEAR'], sort=True, observed=True)[['TOT_EMP', 'A_MEDIAN']].mean()
+        series_by_title = {}
+        for title, group in yearly.groupby(level='OCC_TITLE', sort=False, observed=True):
+            series_by_title[title] = (
+                group.index.get_level_values('YEAR').to_numpy(),
+                group['TOT_EMP'].to_numpy(np.float64),
+                group['A_MEDIAN'].to_numpy(np.float64)
+            )
+        return series_by_title
+    
     def get_occupations(self):
         """Get list of available occupations"""
         return self.occupations
@@ -657,59 +1123,66 @@ class CareerForecaster:
     
     def forecast_occupation(self, occupation_title, include_realtime=True):
         """Generate comprehensive forecast for an occupation"""
-        if self.df is None:
+        if not self.series_by_title:
             return None
         
-        # Filter data for the occupation using the filtered dataset
-        occ_data = self.filtered_df[self.filtered_df['OCC_TITLE'] == occupation_title].copy()
+        # Yearly series precomputed in load_dataset
+        series = self.series_by_title.get(occupation_title)
         
-        if len(occ_data) == 0:
-            print(f"❌ Occupation '{occupation_title}' not found in filtered dataset")
+        if series is None:
+            logger.debug("❌ Occupation '%s' not found in filtered dataset", occupation_title)
             return None
         
-        # If there are multiple OCC_CODEs for this title, use the one with most data
-        if occ_data['OCC_CODE'].nunique() > 1:
-            code_counts = occ_data.groupby('OCC_CODE').size()
-            best_code = code_counts.idxmax()
-            occ_data = occ_data[occ_data['OCC_CODE'] == best_code].copy()
-            print(f"📊 Using OCC_CODE {best_code} for '{occupation_title}' (most data)")
+        years, emp_values, salary_values = series
+        year_index = pd.Index(years, name='YEAR')
         
         # Prepare employment time series
-        emp_ts = occ_data.groupby('YEAR')['TOT_EMP'].mean().sort_index()
+        emp_ts = pd.Series(emp_values, index=year_index, name='TOT_EMP')
         
         if len(emp_ts) < 3:
             return None
 
+        # Start the MUSE fetch first so its network round-trips overlap the model fits
+        realtime_future = None
+        if include_realtime:
+            logger.debug("🔄 Starting real-time data collection for '%s'", occupation_title)
+            realtime_future = muse_jobs_future(occupation_title)
+        
+        # Prepare salary time series; its ensemble is independent of employment, so fit it alongside
+        salary_ts = pd.Series(salary_values, index=year_index, name='A_MEDIAN')
+        salary_future = None
+        salary_forecast = None
+        if len(salary_ts) >= 3:
+            if _IN_POOL_WORKER:
+                # Pool workers are sized to one core each
+                salary_forecast = robust_ensemble_forecast(salary_ts, model_key=f"{occupation_title}|A_MEDIAN")
+            else:
+                salary_future = _FORECAST_EXECUTOR.submit(
+                    robust_ensemble_forecast, salary_ts, model_key=f"{occupation_title}|A_MEDIAN"
+                )
+
         # Generate employment forecast
-        emp_forecast = robust_ensemble_forecast(emp_ts)
+        emp_forecast = robust_ensemble_forecast(emp_ts, model_key=f"{occupation_title}|TOT_EMP")
         
         if not emp_forecast:
             return None
         
-        # Prepare salary time series
-        salary_ts = occ_data.groupby('YEAR')['A_MEDIAN'].mean().sort_index()
-        
-        if len(salary_ts) < 3:
-            salary_forecast = None
-        else:
-            salary_forecast = robust_ensemble_forecast(salary_ts)
+        if salary_future is not None:
+            salary_forecast = salary_future.result()
         
-        # Fetch real-time data if requested
+        # Collect real-time data if requested
         realtime_data = []
         if include_realtime:
-            print(f"\n🔄 DEBUG: Starting real-time data collection for '{occupation_title}'")
-            realtime_jobs = fetch_muse_job_data(occupation_title)
-            print(f"📊 DEBUG: MUSE API returned {len(realtime_jobs)} jobs")
+            realtime_jobs = realtime_future.result()
+            logger.debug("📊 %d MUSE jobs available (cached or freshly fetched)", len(realtime_jobs))
             
             if realtime_jobs:
-                new_jobs_count = save_realtime_data(occupation_title, realtime_jobs)
-                print(f"💾 DEBUG: Saved {new_jobs_count} new jobs to storage")
                 realtime_data = realtime_jobs[:10]  # Limit to 10 most recent
-                print(f"📋 DEBUG: Using {len(realtime_data)} jobs for forecast display")
+                logger.debug("📋 Using %d jobs for forecast display", len(realtime_data))
             else:
-                print(f"⚠️ DEBUG: No real-time jobs found for '{occupation_title}'")
+                logger.debug("⚠️ No real-time jobs found for '%s'", occupation_title)
         else:
-            print(f"⏭️ DEBUG: Skipping real-time data collection (include_realtime=False)")
+            logger.debug("⏭️ Skipping real-time data collection (include_realtime=False)")
         
         # Calculate metrics
         current_employment = emp_ts.iloc[-1]
@@ -719,50 +1192,23 @@ class CareerForecaster:
         growth_1yr = ((forecast_2024 - current_employment) / current_employment) * 100
         growth_total = ((forecast_2030 - current_employment) / current_employment) * 100
         
-        # Quality assessment
-        if emp_forecast['mape'] < 10 and abs(growth_1yr) < 25:
-            quality = "EXCELLENT"
-            confidence = "High"
-        elif emp_forecast['mape'] < 20 and abs(growth_1yr) < 50:
-            quality = "GOOD"
-            confidence = "Medium"
-        elif emp_forecast['mape'] < 40:
-            quality = "FAIR"
-            confidence = "Low"
-        else:
-            quality = "POOR"
-            confidence = "Very Low"
-        
-        # Student recommendation
-        if growth_total > 20 and emp_forecast['mape'] < 10:
-            recommendation = "🚀 EXCELLENT CAREER CHOICE"
-            advice = "High growth potential with reliable forecasts"
-        elif growth_total > 10 and emp_forecast['mape'] < 15:
-            recommendation = "✅ STRONG CAREER CHOICE"
-            advice = "Good growth prospects with solid reliability"
-        elif growth_total > 0 and emp_forecast['mape'] < 25:
-            recommendation = "🟨 MODERATE CAREER CHOICE"
-            advice = "Positive growth but some uncertainty"
-        elif growth_total < -10:
-            recommendation = "⚠️ DECLINING FIELD"
-            advice = "Negative growth trend - consider alternatives"
-        else:
-            recommendation = "🔍 STABLE FIELD"
-            advice = "Minimal growth expected - research specializations"
+        # Quality assessment and student recommendation
+        quality, confidence, recommendation, advice = rate_forecast(emp_forecast['mape'], growth_1yr, growth_total)
         
-        # Prepare result
+        # Prepare result; ndarray.tolist() yields plain Python floats in one pass
+        year_keys = years.astype(str).tolist()
         result = {
             'occupation_title': occupation_title,
-            'historical_employment': {str(k): float(v) for k, v in emp_ts.to_dict().items()},
-            'historical_salary': {str(k): float(v) for k, v in salary_ts.to_dict().items()} if salary_forecast else {},
+            'historical_employment': dict(zip(year_keys, emp_values.tolist())),
+            'historical_salary': dict(zip(year_keys, salary_values.tolist())) if salary_forecast else {},
             'current_employment': float(current_employment),
             'forecast_2024': float(forecast_2024),
             'forecast_2030': float(forecast_2030),
             'growth_1yr_percent': float(growth_1yr),
             'growth_total_percent': float(growth_total),
-            'employment_forecasts': [float(x) for x in emp_forecast['forecasts']],
-            'employment_lower_bounds': [float(x) for x in emp_forecast['lower_bounds']],
-            'employment_upper_bounds': [float(x) for x in emp_forecast['upper_bounds']],
+            'employment_forecasts': np.asarray(emp_forecast['forecasts'], dtype=float).tolist(),
+            'employment_lower_bounds': np.asarray(emp_forecast['lower_bounds'], dtype=float).tolist(),
+            'employment_upper_bounds': np.asarray(emp_forecast['upper_bounds'], dtype=float).tolist(),
             'forecast_years': list(range(2024, 2024 + len(emp_forecast['forecasts']))),
             'employment_method': emp_forecast['method'],
             'employment_accuracy_mape': float(emp_forecast['mape']),
@@ -785,9 +1231,9 @@ class CareerForecaster:
                 'current_salary': float(current_salary),
                 'salary_forecast_2024': float(salary_forecast_2024),
                 'salary_forecast_2030': float(salary_forecast_2030),
-                'salary_forecasts': [float(x) for x in salary_forecast['forecasts']],
-                'salary_lower_bounds': [float(x) for x in salary_forecast['lower_bounds']],
-                'salary_upper_bounds': [float(x) for x in salary_forecast['upper_bounds']],
+                'salary_forecasts': np.asarray(salary_forecast['forecasts'], dtype=float).tolist(),
+                'salary_lower_bounds': np.asarray(salary_forecast['lower_bounds'], dtype=float).tolist(),
+                'salary_upper_bounds': np.asarray(salary_forecast['upper_bounds'], dtype=float).tolist(),
                 'salary_method': salary_forecast['method'],
                 'salary_accuracy_mape': float(salary_forecast['mape']),
                 'salary_mae': float(salary_forecast['mae'])
@@ -797,25 +1243,52 @@ class CareerForecaster:
     
     def search_occupations(self, search_term, limit=10):
         """Search occupations by title"""
-        if not search_term or len(search_term) < 2:
+        if not search_term or len(search_term) < 2 or limit < 1:
             return []
         
-        search_term_lower = search_term.lower()
-        matches = []
+        term = search_term.lower()
+        postings = [self._bigram_index.get(term[i:i + 2]) for i in range(len(term) - 1)]
+        if any(p is None for p in postings):
+            return []
         
-        for occupation in self.occupations:
-            if search_term_lower in occupation.lower():
-                matches.append(occupation)
-                if len(matches) >= limit:
-                    break
+        # Titles containing every bigram of the term, smallest posting list first; confirm the substring on those only
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
         
+        matches = []
+        for i in candidates:
+            if term in self._occupations_lower[i]:
+                matches.append(self._occupations_arr[i].item())
+                if len(matches) == limit:
+                    break
         return matches
+    
+    @staticmethod
+    def _build_bigram_index(titles_lower):
+        """Map each two-character substring to the sorted indices of the titles containing it"""
+        index = defaultdict(list)
+        for i, title in enumerate(titles_lower):
+            for bigram in {title[j:j + 2] for j in range(len(title) - 1)}:
+                index[bigram].append(i)
+        return {bigram: np.array(ids, dtype=np.int32) for bigram, ids in index.items()}
 
 # ============================================================================
 # FLASK APPLICATION
 # ============================================================================
 
+class ORJSONProvider(JSONProvider):
+    """orjson-backed JSON for jsonify and request.get_json (keys sorted like Flask's default provider)"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 forecaster = CareerForecaster()
 
@@ -861,48 +1334,48 @@ def search_occupations():
 @app.route('/api/career-forecast/forecast', methods=['POST'])
 def generate_forecast():
     """Generate forecast for an occupation"""
-    print(f"\n🚀 DEBUG: Received forecast request")
+    logger.debug("🚀 Received forecast request")
     try:
         data = request.get_json()
         occupation_title = data.get('occupation_title', '')
         include_realtime = data.get('include_realtime', True)
         
-        print(f"📋 DEBUG: Request parameters:")
-        print(f"   🏢 Occupation: '{occupation_title}'")
-        print(f"   🔄 Include realtime: {include_realtime}")
+        logger.debug("📋 Request parameters: occupation='%s', include_realtime=%s", occupation_title, include_realtime)
         
         if not occupation_title:
-            print(f"❌ DEBUG: Missing occupation title")
+            logger.debug("❌ Missing occupation title")
             return jsonify({
                 'success': False,
                 'error': 'Occupation title is required'
             }), 400
         
-        # Check cache first
+        # Check cache first; a miss generates the forecast (once, even for simultaneous requests)
+        def compute_forecast():
+            logger.debug("🔄 Generating new forecast for '%s'", occupation_title)
+            return forecaster.forecast_occupation(occupation_title, include_realtime)
+        
         cache_key = f"{occupation_title}_{include_realtime}"
-        if cache_key in forecaster.forecast_cache:
-            print(f"📋 DEBUG: Returning cached result for '{occupation_title}'")
+        result, cached = forecaster.forecast_cache.get_or_compute(
+            cache_key, compute_forecast,
+            ttl=REALTIME_FORECAST_CACHE_TTL if include_realtime else FORECAST_CACHE_TTL
+        )
+        
+        if cached:
+            logger.debug("📋 Returning cached result for '%s'", occupation_title)
             return jsonify({
                 'success': True,
-                'data': forecaster.forecast_cache[cache_key],
+                'data': result,
                 'cached': True
             })
         
-        print(f"🔄 DEBUG: Generating new forecast for '{occupation_title}'")
-        # Generate forecast
-        result = forecaster.forecast_occupation(occupation_title, include_realtime)
-        
         if not result:
-            print(f"❌ DEBUG: No forecast available for '{occupation_title}'")
+            logger.debug("❌ No forecast available for '%s'", occupation_title)
             return jsonify({
                 'success': False,
                 'error': f'No forecast available for "{occupation_title}"'
             }), 404
         
-        # Cache result
-        forecaster.forecast_cache[cache_key] = result
-        print(f"✅ DEBUG: Successfully generated and cached forecast")
-        print(f"📊 DEBUG: Forecast includes {result.get('realtime_jobs_count', 0)} real-time jobs")
+        logger.debug("✅ Generated and cached forecast with %d real-time jobs", result.get('realtime_jobs_count', 0))
         
         return jsonify({
             'success': True,
@@ -911,12 +1384,79 @@ def generate_forecast():
         })
         
     except Exception as e:
-        print(f"❌ DEBUG: Error generating forecast: {e}")
+        logger.error("❌ Error generating forecast: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+_analytics_pool = None
+_analytics_pool_lock = threading.Lock()
+
+# Each gunicorn worker gets its own pool, so split the cores between them
+# (gunicorn also reads WEB_CONCURRENCY as its default worker count)
+_WEB_WORKERS = max(1, int(os.environ.get('WEB_CONCURRENCY', '1')))
+
+def _mark_pool_worker():
+    """Pool initializer: fits in this process run single-threaded"""
+    global _IN_POOL_WORKER
+    _IN_POOL_WORKER = True
+
+def _get_analytics_pool():
+    """Worker pool for /analytics and the warm-up, created on first use rather than at import"""
+    global _analytics_pool
+    with _analytics_pool_lock:
+        if _analytics_pool is None:
+            # Created from a threaded server: forking here could hand workers locks held by other threads
+            # (ForecastCache's among them), so start them from a fresh interpreter instead
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _analytics_pool = ProcessPoolExecutor(
+                max_workers=max(1, (os.cpu_count() or 1) // _WEB_WORKERS),
+                mp_context=multiprocessing.get_context(method),
+                initializer=_mark_pool_worker
+            )
+    return _analytics_pool
+
+def shutdown_analytics_pool():
+    """Stop the analytics pool (if started) so a process about to fork doesn't hand its threads to the children"""
+    global _analytics_pool
+    with _analytics_pool_lock:
+        if _analytics_pool is not None:
+            _analytics_pool.shutdown()
+            _analytics_pool = None
+
+def _analytics_summary(occupation_title, result):
+    """Keep the analytics fields of one occupation's forecast"""
+    if not result:
+        return None
+    return {
+        'occupation': occupation_title,
+        'mape': result['employment_accuracy_mape'],
+        'quality': result['quality_rating'],
+        'growth': result['growth_total_percent']
+    }
+
+def _forecast_without_realtime(occupation_title):
+    """Full forecast without realtime data (runs in a pool worker)"""
+    try:
+        return forecaster.forecast_occupation(occupation_title, include_realtime=False)
+    except Exception:
+        return None
+
+def warm_forecast_cache():
+    """Precompute every occupation's forecast (without realtime jobs) into forecaster.forecast_cache"""
+    titles = forecaster.get_occupations()
+    if not titles:
+        return
+    started = time.time()
+    warmed = 0
+    for title, result in zip(titles, _get_analytics_pool().map(_forecast_without_realtime, titles, chunksize=8)):
+        if result:
+            # These only change with the dataset, so keep them for the life of the process
+            forecaster.forecast_cache.put(f"{title}_False", result, ttl=math.inf)
+            warmed += 1
+    logger.info("🔥 Precomputed %d forecasts in %.1fs", warmed, time.time() - started)
+
 @app.route('/api/career-forecast/analytics', methods=['GET'])
 def get_analytics():
     """Get model performance analytics"""
@@ -926,30 +1466,37 @@ def get_analytics():
         
         # Sample some occupations for analytics
         sample_occupations = forecaster.occupations[:50]  # First 50 for analytics
-        analytics_results = []
         
-        for occ in sample_occupations:
-            try:
-                result = forecaster.forecast_occupation(occ, include_realtime=False)
-                if result:
-                    analytics_results.append({
-                        'occupation': occ,
-                        'mape': result['employment_accuracy_mape'],
-                        'quality': result['quality_rating'],
-                        'growth': result['growth_total_percent']
-                    })
-            except:
-                continue
+        # Forecasts already cached (e.g. by the warm-up) are reused; each miss is an independent
+        # CPU-bound fit, so those are spread across processes and then cached like any other forecast
+        missing = [title for title in sample_occupations if forecaster.forecast_cache.get(f"{title}_False") is None]
+        fitted = dict(zip(missing, _get_analytics_pool().map(_forecast_without_realtime, missing, chunksize=4)))
+        analytics_results = []
+        for title in sample_occupations:
+            result, _ = forecaster.forecast_cache.get_or_compute(
+                f"{title}_False",
+                lambda title=title: fitted[title] if title in fitted else _forecast_without_realtime(title),
+                ttl=FORECAST_CACHE_TTL
+            )
+            summary = _analytics_summary(title, result)
+            if summary:
+                analytics_results.append(summary)
         
         if analytics_results:
-            avg_mape = np.mean([r['mape'] for r in analytics_results])
-            quality_distribution = defaultdict(int)
-            for r in analytics_results:
-                quality_distribution[r['quality']] += 1
+            total_analyzed = len(analytics_results)
+            
+            # One pass into a structured array; every statistic below is a NumPy reduction over it
+            stats = np.fromiter(
+                ((r['mape'], r['growth']) for r in analytics_results),
+                dtype=[('mape', 'f8'), ('growth', 'f8')], count=total_analyzed
+            )
+            mape_values = stats['mape']
+            growth_values = stats['growth']
+            avg_mape = mape_values.mean()
+            mape_median = np.median(mape_values)
             
-            # Calculate detailed accuracy metrics
-            mape_values = [r['mape'] for r in analytics_results]
-            growth_values = [r['growth'] for r in analytics_results]
+            qualities, quality_counts = np.unique([r['quality'] for r in analytics_results], return_counts=True)
+            quality_distribution = dict(zip(qualities.tolist(), quality_counts.tolist()))
             
             # Calculate precision, recall, F1-score equivalents for forecasting
             excellent_count = quality_distribution.get('EXCELLENT', 0)
@@ -957,8 +1504,6 @@ def get_analytics():
             fair_count = quality_distribution.get('FAIR', 0)
             poor_count = quality_distribution.get('POOR', 0)
             
-            total_analyzed = len(analytics_results)
-            
             # Calculate metrics similar to classification metrics
             high_quality_count = excellent_count + good_count
             low_quality_count = fair_count + poor_count
@@ -968,8 +1513,8 @@ def get_analytics():
             f1_score = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
             
             # Calculate ROC-AUC equivalent (using MAPE distribution)
-            mape_threshold = np.median(mape_values) if mape_values else 0
-            low_mape_count = sum(1 for mape in mape_values if mape < mape_threshold)
+            mape_threshold = mape_median
+            low_mape_count = int(np.count_nonzero(mape_values < mape_threshold))
             roc_auc = low_mape_count / total_analyzed if total_analyzed > 0 else 0
             
             return jsonify({
@@ -978,7 +1523,7 @@ def get_analytics():
                     'total_occupations': total_occupations,
                     'sample_size': len(analytics_results),
                     'average_mape': avg_mape,
-                    'quality_distribution': dict(quality_distribution),
+                    'quality_distribution': quality_distribution,
                     'sample_results': analytics_results[:10],  # First 10 for display
                     'detailed_metrics': {
                         'accuracy': precision,
@@ -986,10 +1531,10 @@ def get_analytics():
                         'recall': recall,
                         'f1_score': f1_score,
                         'roc_auc': roc_auc,
-                        'mape_median': np.median(mape_values) if mape_values else 0,
-                        'mape_std': np.std(mape_values) if mape_values else 0,
-                        'growth_median': np.median(growth_values) if growth_values else 0,
-                        'growth_std': np.std(growth_values) if growth_values else 0
+                        'mape_median': mape_median,
+                        'mape_std': mape_values.std(),
+                        'growth_median': np.median(growth_values),
+                        'growth_std': growth_values.std()
                     }
                 }
             })
@@ -1009,10 +1554,8 @@ def get_analytics():
 def get_realtime_data(occupation):
     """Get real-time job data for an occupation"""
     try:
-        if os.path.exists(REALTIME_DATA_FILE):
-            with open(REALTIME_DATA_FILE, 'r') as f:
-                data = json.load(f)
-            
+        data = load_realtime_data()
+        if data:
             if occupation in data:
                 return jsonify({
                     'success': True,
@@ -1039,73 +1582,57 @@ def get_realtime_data(occupation):
 @app.route('/api/career-forecast/realtime-download', methods=['GET'])
 def download_realtime_data():
     """Download all real-time job data as CSV"""
-    print(f"\n📥 DEBUG: Received CSV download request")
+    logger.debug("📥 Received CSV download request")
     try:
-        print(f"🔍 DEBUG: Checking for real-time data file: {REALTIME_DATA_FILE}")
+        logger.debug("🔍 Checking for real-time data file: %s", REALTIME_DATA_FILE)
         
-        if not os.path.exists(REALTIME_DATA_FILE):
-            print(f"❌ DEBUG: Real-time data file not found")
+        if not os.path.exists(REALTIME_DATA_FILE) and not os.path.exists(LEGACY_REALTIME_DATA_FILE):
+            logger.debug("❌ Real-time data file not found")
             return jsonify({
                 'success': False,
                 'error': 'No real-time data available'
             }), 404
         
-        print(f"✅ DEBUG: Real-time data file found, loading data...")
-        with open(REALTIME_DATA_FILE, 'r') as f:
-            data = json.load(f)
+        logger.debug("✅ Real-time data file found, streaming data...")
+        records = iter_realtime_records()
+        first_record = next(records, None)
         
-        print(f"📊 DEBUG: Loaded data for {len(data)} occupations")
-        
-        if not data:
-            print(f"❌ DEBUG: No data in real-time file")
+        if first_record is None:
+            logger.debug("❌ No data in real-time file")
             return jsonify({
                 'success': False,
                 'error': 'No real-time data available'
             }), 404
         
-        # Convert to CSV format
-        csv_data = []
-        csv_data.append(['Occupation', 'Job Title', 'Company', 'Location', 'Publication Date', 'Category', 'Salary Min', 'Salary Max', 'Salary Currency', 'Job Type', 'Experience Level', 'Timestamp'])
-        
-        total_jobs = 0
-        for occupation, jobs in data.items():
-            print(f"📋 DEBUG: Processing {len(jobs)} jobs for {occupation}")
-            total_jobs += len(jobs)
-            for job in jobs:
-                csv_data.append([
-                    occupation,
-                    job.get('title', ''),
-                    job.get('company', ''),
-                    job.get('location', ''),
-                    job.get('publication_date', ''),
-                    job.get('category', ''),
-                    job.get('salary_min', ''),
-                    job.get('salary_max', ''),
-                    job.get('salary_currency', ''),
-                    job.get('job_type', ''),
-                    job.get('experience_level', ''),
-                    job.get('timestamp', '')
-                ])
-        
-        print(f"📊 DEBUG: Total jobs to export: {total_jobs}")
-        
-        # Create CSV content
-        csv_content = '\n'.join([','.join([f'"{str(cell)}"' for cell in row]) for row in csv_data])
-        
-        print(f"✅ DEBUG: CSV content created, size: {len(csv_content)} characters")
+        def generate_csv():
+            # Rows are written straight from the JSON Lines store, in the order they were saved
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator='\n')
+            writer.writerow(REALTIME_CSV_HEADER)
+            yield buffer.getvalue()
+            
+            total_jobs = 0
+            for job in itertools.chain((first_record,), records):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerow([job.get('occupation', '')] + [job.get(field, '') for field in REALTIME_CSV_FIELDS])
+                yield buffer.getvalue()
+                total_jobs += 1
+            
+            logger.debug("📊 Total jobs exported: %d", total_jobs)
         
         # Create response with CSV headers
-        response = Response(csv_content, mimetype='text/csv')
+        response = Response(stream_with_context(generate_csv()), mimetype='text/csv')
         response.headers['Content-Disposition'] = 'attachment; filename=realtime_job_data.csv'
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Access-Control-Allow-Methods'] = 'GET'
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         
-        print(f"✅ DEBUG: CSV download response created successfully")
+        logger.debug("✅ CSV download response streaming")
         return response
         
     except Exception as e:
-        print(f"❌ DEBUG: Error in CSV download: {e}")
+        logger.error("❌ Error in CSV download: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1114,7 +1641,7 @@ def download_realtime_data():
 @app.route('/api/career-forecast/test-download', methods=['GET'])
 def test_download():
     """Test endpoint to check if download functionality works"""
-    print(f"\n🧪 DEBUG: Testing download endpoint")
+    logger.debug("🧪 Testing download endpoint")
     try:
         # Create a simple test CSV
         test_data = [
@@ -1129,19 +1656,26 @@ def test_download():
         response.headers['Content-Disposition'] = 'attachment; filename=test_download.csv'
         response.headers['Access-Control-Allow-Origin'] = '*'
         
-        print(f"✅ DEBUG: Test download response created")
+        logger.debug("✅ Test download response created")
         return response
         
     except Exception as e:
-        print(f"❌ DEBUG: Test download error: {e}")
+        logger.error("❌ Test download error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Opt-in (FORECAST_WARMUP=1) cache warm-up; importing the module never starts it.
+# Production: WEB_CONCURRENCY=4 gunicorn -c forecast_gunicorn.conf.py -k gthread --threads 8 -b 0.0.0.0:5003 career_forecast_service:app
+# The config warms once in the gunicorn master before the workers fork, so they all inherit the cache.
+FORECAST_WARMUP = os.environ.get('FORECAST_WARMUP', '0') == '1'
+
 if __name__ == '__main__':
-    print("🚀 Career Forecasting Service Starting...")
-    print(f"📊 Dataset: {DATASET_PATH}")
-    print(f"🔗 MUSE API: {MUSE_API_URL}")
-    print(f"💾 Real-time data: {REALTIME_DATA_FILE}")
-    app.run(port=5003, debug=True) 
\ No newline at end of file
+    logger.info("🚀 Career Forecasting Service Starting...")
+    logger.info("📊 Dataset: %s", DATASET_PATH)
+    logger.info("🔗 MUSE API: %s", MUSE_API_URL)
+    logger.info("💾 Real-time data: %s", REALTIME_DATA_FILE)
+    if FORECAST_WARMUP:
+        threading.Thread(target=warm_forecast_cache, name='forecast-warmup', daemon=True).start()
+    app.run(port=5003, debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True) 
\ No newline at end of file
@@ -1,8 +1,12 @@
 import anthropic
 import json
 import os
-from datetime import datetime
+import re
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
 import logging
+from functools import lru_cache
 from ml_recruitment_service import recruitment_service
 from sunway_programs_service import sunway_programs_service
 from dotenv import load_dotenv
@@ -14,10 +18,610 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-3-5-sonnet-20241022"
+
+# Bounds on the conversation history replayed to Claude each turn
+HISTORY_USER_CHARS = 500      # keep the tail of earlier student messages
+HISTORY_AI_CHARS = 1000       # keep the head of earlier AI responses
+HISTORY_MAX_AGE = timedelta(minutes=30)
+
+# ===== PARSING PATTERNS =====
+# Compiled once at import; parse_student_response runs on every chat message
+CONF_NUM_RE = re.compile(r'(\d+)')
+DIGIT_RE = re.compile(r'\d')  # every numeric pattern below needs one; checked once per message
+
+# Numeric patterns that start with a number are anchored with (?<!\d) so a search only tries them at the
+# start of a digit run, and write "digits, optional decimals" as \d+(?:\.\d*)? rather than the ambiguous
+# \d+\.?\d*. Both keep matching linear on long digit strings typed into the chat.
+GROUP_ANSWERS_RE = re.compile(r'^\d+(?:\s*[,;/\s]\s*\d+)*$')  # "1", "1,3,2", "1 3 2"
+
+GPA_PATTERNS = [re.compile(p) for p in (
+    r'^(\d+(?:\.\d+)?)$',  # 3.5, 4.0, 3, 4, etc.
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*-\s*(\d+(?:\.\d*)?)',  # "3.9 - 4.0" or "3.5-4.0"
+    r'gpa[:\s]*(\d+(?:\.\d*)?)',  # "GPA: 3.5" or "GPA 3.5"
+    r'grade[:\s]*(\d+(?:\.\d*)?)',  # "Grade: 3.5" or "Grade 3.5"
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*(?:gpa|grade)',  # "3.5 GPA" or "3.5 Grade"
+    r'my\s+(?:gpa|grade)\s+is\s+(\d+(?:\.\d*)?)',  # "My GPA is 3.5"
+    r'(?<!\d)(\d+(?:\.\d*)?)\s+out\s+of\s+4',  # "3.5 out of 4"
+    r'(?<!\d)(\d+(?:\.\d*)?)\s+point\s+(?:gpa|grade)',  # "3.5 point GPA"
+)]
+
+BUDGET_PATTERNS = [re.compile(p) for p in (
+    r'^\d+$',  # Standalone number like "25000"
+    r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',  # $25,000 or $25000.50
+    r'(?<!\d)(\d+(?:,\d{3})*(?:\.\d{2})?)\s*dollars?',  # 25000 dollars
+    r'(?<!\d)(\d+(?:,\d{3})*(?:\.\d{2})?)\s*k',  # 25k
+    r'(?<!\d)(\d+(?:,\d{3})*(?:\.\d{2})?)\s*thousand',  # 25 thousand
+    r'(?<!\d)(\d+)\s*(?:dollar|buck)',  # 25000 dollar
+)]
+
+TOTAL_PATTERNS = [re.compile(p) for p in (
+    r'total[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "total: $50,000"
+    r'total\s+budget[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "total budget $30,000"
+    r'(?<!\d)(\d+(?:,\d{3})*(?:\.\d{2})?)\s*total',  # "50000 total"
+    r'including[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "including $50,000"
+    r'(?<!\d)(\d+(?:,\d{3})*(?:\.\d{2})?)\s*all\s+included',  # "50000 all included"
+)]
+
+# Free-form answers covering several grouped questions at once (parse_grouped_response)
+GROUPED_GPA_PATTERNS = [re.compile(p) for p in (
+    r'gpa[:\s]*(\d+(?:\.\d*)?)',
+    r'grade[:\s]*(\d+(?:\.\d*)?)',
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*(?:gpa|grade)',
+    r'(?<!\d)(\d+(?:\.\d*)?)\s*-\s*(\d+(?:\.\d*)?)',  # GPA ranges
+)]
+GROUPED_INTERESTS_PATTERNS = [re.compile(p) for p in (
+    r'interest[:\s]*(business|engineering|computing|arts|hospitality|medicine)',
+    r'(business|engineering|computing|arts|hospitality|medicine)',
+)]
+GROUPED_STUDY_MODE_PATTERNS = [re.compile(p) for p in (
+    r'study[:\s]*(full|part|time)',
+    r'(full|part)[\s-]*time',
+    r'(fulltime|parttime)',
+)]
+GROUPED_CONFIDENCE_PATTERNS = [re.compile(p) for p in (
+    r'confident[:\s]*(\d+)',
+    r'confidence[:\s]*(\d+)',
+    r'(?<!\d)(\d+)\s*(?:out\s+of\s+10|scale)',
+)]
+GROUPED_INTERNATIONAL_PATTERNS = [re.compile(p) for p in (
+    r'(local|international|foreign)',
+    r'(domestic|overseas)',
+)]
+GROUPED_INCOME_PATTERNS = [re.compile(p) for p in (
+    r'income[:\s]*(low|medium|high)',
+    r'(low|medium|high)\s*income',
+)]
+GROUPED_BUDGET_PATTERNS = [re.compile(p) for p in (
+    r'budget[:\s]*\$?(\d+(?:,\d{3})*)',
+    r'\$(\d+(?:,\d{3})*)',
+    r'(?<!\d)(\d+(?:,\d{3})*)\s*(?:dollar|k|thousand)',
+)]
+GROUPED_TOTAL_BUDGET_PATTERNS = [re.compile(p) for p in (
+    r'total[:\s]*\$?(\d+(?:,\d{3})*)',
+    r'cost[:\s]*\$?(\d+(?:,\d{3})*)',
+    r'expenses[:\s]*\$?(\d+(?:,\d{3})*)',
+)]
+GROUPED_FINANCIAL_AID_PATTERNS = [re.compile(p) for p in (
+    r'aid[:\s]*(yes|no|high|medium|low)',
+    r'financial[:\s]*(aid|assistance)',
+    r'(high|medium|low)\s*aid',
+)]
+GROUPED_INSTITUTION_PATTERNS = [re.compile(p) for p in (
+    r'institution[:\s]*(public|private)',
+    r'(public|private)\s*university',
+    r'(public|private)\s*institution',
+)]
+GROUPED_CLASS_SIZE_PATTERNS = [re.compile(p) for p in (
+    r'class[:\s]*(small|medium|large)',
+    r'(small|medium|large)\s*class',
+    r'(small|medium|large)\s*classes',
+    r'(?<!\d)(\d+)\s*students?',
+)]
+
+# College Scorecard variables the ML model needs from the conversation
+SCORECARD_VARIABLES = (
+    'ADM_RATE', 'PCTPELL', 'C150_4', 'RET_FT4',
+    'TUITIONFEE_IN', 'TUITIONFEE_OUT', 'COSTT4_A',
+    'NPT4_PUB', 'NPT4_PRIV', 'UGDS'
+)
+SCORECARD_KEYS = tuple(f'college_scorecard_{var}' for var in SCORECARD_VARIABLES)
+
+def _keyword_re(*words):
+    """Compile keywords into one alternation (substring match, like `word in text`)"""
+    return re.compile('|'.join(re.escape(word) for word in words))
+
+def _word_start_re(*words):
+    """Like _keyword_re, but only at the start of a word; two-letter words must match whole"""
+    return re.compile(r'\b(?:' + '|'.join(re.escape(word) + (r'\b' if len(word) <= 2 else '') for word in words) + ')')
+
+# Keyword scans: one compiled alternation per category, checked in order
+INCOME_INDICATORS_RE = _keyword_re('income', 'money', 'financial', 'family', 'economic', 'budget', 'afford')
+INCOME_HINTS_RE = _keyword_re('low', 'medium', 'high', 'poor', 'rich', 'wealthy', 'struggling')
+INCOME_LEVELS = (
+    ('low', _keyword_re('low', 'poor', 'struggling', 'minimum', 'barely', 'scraping', 'tight', 'limited', 'modest', 'humble')),
+    ('medium', _keyword_re('medium', 'middle', 'average', 'moderate', 'decent', 'reasonable', 'stable')),
+    ('high', _keyword_re('high', 'rich', 'wealthy', 'well-off', 'comfortable', 'affluent', 'privileged', 'upper', 'substantial')),
+)
+
+CONFIDENCE_INDICATORS_RE = _keyword_re('confident', 'confidence', 'sure', 'certain', 'definitely', 'probably', 'likely', 'think', 'feel')
+CONFIDENCE_LEVELS = (
+    (0.8, _keyword_re('very', 'extremely', 'highly', 'absolutely', 'completely', 'totally', 'definitely')),
+    (0.6, _keyword_re('somewhat', 'moderate', 'fairly', 'reasonably', 'pretty', 'quite')),
+    (0.4, _keyword_re('not', 'unsure', 'uncertain', 'doubtful', 'maybe', 'possibly', 'might')),
+)
+
+STUDY_INDICATORS_RE = _keyword_re('full', 'part', 'time', 'study', 'enrollment', 'load', 'course')
+STUDY_MODES = (
+    ('yes', _keyword_re('full', 'full-time', 'fulltime', 'complete', 'entire')),
+    ('no', _keyword_re('part', 'part-time', 'parttime', 'partial', 'some')),
+)
+
+INTERNATIONAL_INDICATORS_RE = _keyword_re('international', 'foreign', 'overseas', 'abroad', 'country', 'nationality', 'citizen', 'local', 'locally')
+INTERNATIONAL_STATUSES = (
+    (True, _keyword_re('international', 'foreign', 'overseas', 'abroad', 'other', 'different')),
+    (False, _keyword_re('local', 'locally', 'domestic', 'home', 'same', 'this', 'national', 'malaysia')),
+)
+
+BUDGET_INDICATORS_RE = _keyword_re('budget', 'tuition', 'cost', 'dollar', '$', 'pay', 'afford', 'price', 'fee')
+TOTAL_COST_INDICATORS_RE = _keyword_re('total', 'overall', 'complete', 'entire', 'all', 'including', 'plus')
+COST_TERMS_RE = _keyword_re('budget', 'cost', 'tuition')
+
+AID_INDICATORS_RE = _keyword_re('financial aid', 'aid', 'scholarship', 'grant', 'help', 'assistance', 'support')
+AID_ELIGIBILITY = (
+    ('yes', _keyword_re('yes', 'qualify', 'eligible', 'need', 'require', 'apply', 'get', 'receive')),
+    ('no', _keyword_re('no', 'not', "don't", "doesn't", 'ineligible', 'disqualify')),
+)
+
+INSTITUTION_INDICATORS_RE = _keyword_re('private', 'public', 'institution', 'university', 'college', 'school')
+INSTITUTION_PREFERENCES = (
+    ('yes', _keyword_re('private', 'prefer', 'interested', 'consider', 'like', 'want')),
+    ('no', _keyword_re('public', 'state', 'government', 'prefer', 'interested')),
+)
+
+CLASS_SIZE_INDICATORS_RE = _keyword_re('class size', 'class', 'size', 'crowd', 'intimate', 'personal', 'large', 'small')
+CLASS_SIZES = (
+    ('small', _keyword_re('small', 'intimate', 'personal', 'individual', 'close', 'tight')),
+    ('large', _keyword_re('large', 'crowded', 'big', 'huge', 'massive', 'many', 'lot')),
+    ('medium', _keyword_re('medium', 'moderate', 'average', 'decent', 'reasonable')),
+)
+
+# Scorecard step functions for numeric answers: (ascending thresholds, value below the first and at/above each)
+ADM_RATE_BY_GPA = ((3.0, 3.5, 3.8), (0.6, 0.7, 0.8, 0.9))
+C150_BY_CONFIDENCE = ((6, 8), (0.5, 0.7, 0.8))
+TUITION_BY_BUDGET = ((25000, 40000), (15000, 25000, 35000))
+COST_BY_TOTAL_BUDGET = ((30000, 50000), (20000, 30000, 45000))
+
+def _step_lookup(table, value):
+    """Value of a (thresholds, values) step table at value"""
+    thresholds, values = table
+    return values[bisect_right(thresholds, value)]
+
+# Scorecard values for categorical answers; anything unlisted gets the mapper's fallback
+PELL_BY_INCOME = {'low': 0.7, 'very_low': 0.7, 'medium': 0.4, 'high': 0.2}  # Pell percentage falls as income rises
+ENROLLMENT_BY_CLASS_SIZE = {'small': 2000, 'medium': 5000, 'large': 15000}
+
+# Keyword-driven preferences parsed the same way: (profile field, indicators, choices, Scorecard variable, value per choice, log label)
+PREFERENCE_PARSERS = (
+    ('financial_aid_eligible', AID_INDICATORS_RE, AID_ELIGIBILITY, 'NPT4_PUB',
+     {'yes': 10000, 'no': 20000}, 'financial aid'),  # lower net price with aid
+    ('prefer_private', INSTITUTION_INDICATORS_RE, INSTITUTION_PREFERENCES, 'NPT4_PRIV',
+     {'yes': 30000, 'no': 20000}, 'institution preference'),  # private net price is higher
+    ('preferred_class_size', CLASS_SIZE_INDICATORS_RE, CLASS_SIZES, 'UGDS',
+     ENROLLMENT_BY_CLASS_SIZE, 'class size'),  # enrollment
+)
+
+# Academic fields mapped to standardized values; every matching field is recorded.
+# Matched at word starts so short keys like "art" and "ui" don't fire inside "start" or "build".
+# There are no bare "it"/"ai" keys: in lowercased text "IT" can't be told apart from the pronoun.
+ACADEMIC_FIELDS = (
+    ('business', _word_start_re('business', 'commerce', 'management', 'administration', 'entrepreneur')),
+    ('engineering', _word_start_re('engineering', 'engineer', 'technical', 'mechanical', 'electrical', 'civil')),
+    ('arts', _word_start_re('arts', 'art', 'creative', 'design', 'visual', 'fine', 'performing')),
+    ('sciences', _word_start_re('science', 'scientific', 'biology', 'chemistry', 'physics', 'natural')),
+    ('computing', _word_start_re('computing', 'computer', 'software', 'programming', 'coding', 'information')),
+    ('technology', _word_start_re('technology', 'tech', 'digital', 'innovation', 'artificial')),
+    ('design', _word_start_re('design', 'graphic', 'web', 'ui', 'ux', 'visual')),
+    ('hospitality', _word_start_re('hospitality', 'hotel', 'tourism', 'travel', 'service', 'guest')),
+    ('tourism', _word_start_re('tourism', 'travel', 'hospitality', 'hotel')),
+    ('finance', _word_start_re('finance', 'financial', 'banking', 'investment', 'accounting', 'economics')),
+    ('marketing', _word_start_re('marketing', 'advertising', 'promotion', 'brand', 'sales')),
+    ('management', _word_start_re('management', 'leadership', 'administration', 'strategy', 'project')),
+    ('medicine', _word_start_re('medicine', 'medical', 'health', 'healthcare', 'nursing', 'pharmacy')),
+    ('law', _word_start_re('law', 'legal', 'justice', 'criminal', 'civil')),
+    ('education', _word_start_re('education', 'teaching', 'pedagogy', 'learning', 'academic')),
+    ('psychology', _word_start_re('psychology', 'psych', 'mental', 'behavior', 'counseling')),
+    ('communications', _word_start_re('communications', 'communication', 'media', 'journalism', 'public')),
+    ('environmental', _word_start_re('environmental', 'environment', 'sustainability', 'green', 'ecology')),
+    ('mathematics', _word_start_re('mathematics', 'math', 'statistics', 'data', 'analytics')),
+    ('languages', _word_start_re('language', 'linguistics', 'translation', 'interpretation', 'foreign')),
+)
+
+FIRST_GEN_INDICATORS_RE = _keyword_re('first generation', 'first-gen', 'firstgen', 'parents', 'family', 'college')
+# Short yes/no trigger words match at word starts, so "no" doesn't fire inside "know" or "another"
+FIRST_GEN_YES_RE = _word_start_re('first', 'none', 'never', "didn't", 'didnt')
+WORK_INDICATORS_RE = _keyword_re('work', 'job', 'employment', 'experience', 'career', 'professional')
+WORK_YES_RE = _word_start_re('yes', 'have', 'worked', 'experience', 'employed')
+WORK_NO_RE = _word_start_re('no', 'not', 'never', 'none')
+EXTRACURRICULAR_INDICATORS_RE = _keyword_re('extracurricular', 'activity', 'club', 'sport', 'volunteer', 'hobby')
+EXTRACURRICULAR_ACTIVITIES = ('sports', 'music', 'drama', 'debate', 'robotics', 'volunteer', 'leadership', 'art', 'dance')
+EXTRACURRICULAR_ACTIVITIES_RE = _word_start_re(*EXTRACURRICULAR_ACTIVITIES)
+
+# Question types keyed off the question text; the first type with any keyword present wins (get_question_type)
+QUESTION_TYPES = (
+    ('gpa', _keyword_re('gpa', 'grade')),
+    ('income', _keyword_re('income', 'financial')),
+    ('confidence', _keyword_re('confident', 'confidence')),
+    ('study_mode', _keyword_re('full-time', 'part-time', 'study')),
+    ('international', _keyword_re('international', 'local')),
+    ('budget', _keyword_re('budget', 'tuition', 'cost')),
+    ('academic_interests', _keyword_re('interest', 'field', 'major')),
+    ('class_size', _keyword_re('class size', 'size')),
+    ('financial_aid', _keyword_re('financial aid', 'aid')),
+    ('institution_type', _keyword_re('private', 'public', 'institution')),
+)
+
+# Sentiment words for analyze_conversation_sentiment, matched at word starts ("hard" not in "orchard")
+POSITIVE_WORDS_RE = _word_start_re('interested', 'excited', 'great', 'good', 'love', 'want', 'help')
+NEGATIVE_WORDS_RE = _word_start_re('worried', 'concerned', 'expensive', 'difficult', 'hard', 'problem')
+
+# Message context used by apply_contextual_inferences
+FINANCIAL_NEED_RE = _word_start_re('scholarship', 'financial aid', 'need money', "can't afford", 'expensive')
+ACADEMIC_EXCELLENCE_RE = _word_start_re('excellent', 'top', 'high achiever', 'straight a', 'outstanding')
+BUDGET_CONSCIOUS_RE = _word_start_re('budget', 'affordable', 'cheap', 'cost-effective', 'value')
+
+# ===== GROUPED QUESTIONS =====
+# Options worded the same for grouped and single questions; shared by both tables below
+STUDY_MODE_OPTIONS = [
+    {'label': 'Full-time', 'value': 'yes', 'mapped_value': 0.8},
+    {'label': 'Part-time', 'value': 'no', 'mapped_value': 0.6}
+]
+
+# Consolidated grouped questions with preset options - 3 smaller groups, asked in order
+GROUPED_QUESTIONS = {
+    'academic_basics': {
+        'title': 'Academic Basics',
+        'description': 'Quick academic info:',
+        'questions': [
+            {
+                'variable': 'ADM_RATE',
+                'question': 'Your GPA?',
+                'type': 'gpa',
+                'options': [
+                    {'label': '3.0-3.2', 'value': '3.1', 'mapped_value': 0.7},
+                    {'label': '3.3-3.5', 'value': '3.4', 'mapped_value': 0.8},
+                    {'label': '3.6-3.8', 'value': '3.7', 'mapped_value': 0.9},
+                    {'label': '3.9-4.0', 'value': '3.95', 'mapped_value': 0.95}
+                ]
+            },
+            {
+                'variable': 'academic_interests',
+                'question': 'Main interest?',
+                'type': 'academic_interests',
+                'options': [
+                    {'label': 'Business', 'value': 'business', 'mapped_value': 'business'},
+                    {'label': 'Engineering', 'value': 'engineering', 'mapped_value': 'engineering'},
+                    {'label': 'Computing', 'value': 'computing', 'mapped_value': 'computing'},
+                    {'label': 'Arts', 'value': 'arts', 'mapped_value': 'arts'},
+                    {'label': 'Hospitality', 'value': 'hospitality', 'mapped_value': 'hospitality'},
+                    {'label': 'Medicine', 'value': 'medicine', 'mapped_value': 'medicine'}
+                ]
+            },
+            {
+                'variable': 'TUITIONFEE_OUT',
+                'question': 'International student?',
+                'type': 'international',
+                'options': [
+                    {'label': 'Local', 'value': 'no', 'mapped_value': 30000},
+                    {'label': 'International', 'value': 'yes', 'mapped_value': 40000}
+                ]
+            }
+        ]
+    },
+    'study_preferences': {
+        'title': 'Study Preferences',
+        'description': 'Study mode & confidence:',
+        'questions': [
+            {
+                'variable': 'RET_FT4',
+                'question': 'Study mode?',
+                'type': 'study_mode',
+                'options': STUDY_MODE_OPTIONS
+            },
+            {
+                'variable': 'C150_4',
+                'question': 'Completion confidence?',
+                'type': 'confidence',
+                'options': [
+                    {'label': 'Low (1-3)', 'value': '2', 'mapped_value': 0.5},
+                    {'label': 'Medium (4-6)', 'value': '5', 'mapped_value': 0.6},
+                    {'label': 'High (7-8)', 'value': '7.5', 'mapped_value': 0.7},
+                    {'label': 'Very High (9-10)', 'value': '9.5', 'mapped_value': 0.8}
+                ]
+            },
+            {
+                'variable': 'UGDS',
+                'question': 'Class size preference?',
+                'type': 'class_size',
+                'options': [
+                    {'label': 'Small (<30)', 'value': 'small', 'mapped_value': 2000},
+                    {'label': 'Medium (30-100)', 'value': 'medium', 'mapped_value': 5000},
+                    {'label': 'Large (>100)', 'value': 'large', 'mapped_value': 15000}
+                ]
+            }
+        ]
+    },
+    'financial_profile': {
+        'title': 'Financial Profile',
+        'description': 'Budget & financial aid:',
+        'questions': [
+            {
+                'variable': 'PCTPELL',
+                'question': 'Family income?',
+                'type': 'income',
+                'options': [
+                    {'label': 'Low', 'value': 'low', 'mapped_value': 0.7},
+                    {'label': 'Medium', 'value': 'medium', 'mapped_value': 0.4},
+                    {'label': 'High', 'value': 'high', 'mapped_value': 0.2}
+                ]
+            },
+            {
+                'variable': 'TUITIONFEE_IN',
+                'question': 'Tuition budget/year?',
+                'type': 'budget',
+                'options': [
+                    {'label': '$10K-20K', 'value': '15000', 'mapped_value': 15000},
+                    {'label': '$20K-30K', 'value': '25000', 'mapped_value': 25000},
+                    {'label': '$30K-40K', 'value': '35000', 'mapped_value': 35000},
+                    {'label': '$40K+', 'value': '45000', 'mapped_value': 45000}
+                ]
+            },
+            {
+                'variable': 'COSTT4_A',
+                'question': 'Total budget (inc. living)?',
+                'type': 'total_budget',
+                'options': [
+                    {'label': '$15K-25K', 'value': '20000', 'mapped_value': 20000},
+                    {'label': '$25K-35K', 'value': '30000', 'mapped_value': 30000},
+                    {'label': '$35K-45K', 'value': '40000', 'mapped_value': 40000},
+                    {'label': '$45K+', 'value': '50000', 'mapped_value': 50000}
+                ]
+            },
+            {
+                'variable': 'NPT4_PUB',
+                'question': 'Financial aid expectation?',
+                'type': 'financial_aid',
+                'options': [
+                    {'label': 'High aid needed', 'value': 'high_aid', 'mapped_value': 10000},
+                    {'label': 'Some aid', 'value': 'medium_aid', 'mapped_value': 15000},
+                    {'label': 'No aid needed', 'value': 'no_aid', 'mapped_value': 20000}
+                ]
+            },
+            {
+                'variable': 'NPT4_PRIV',
+                'question': 'Institution type?',
+                'type': 'institution_type',
+                'options': [
+                    {'label': 'Public', 'value': 'public', 'mapped_value': 20000},
+                    {'label': 'Private', 'value': 'private', 'mapped_value': 30000}
+                ]
+            }
+        ]
+    }
+}
+
+# Every grouped question by its variable, for mapping numeric answers back (parse_grouped_selection)
+QUESTIONS_BY_VARIABLE = {
+    question['variable']: question
+    for group_data in GROUPED_QUESTIONS.values()
+    for question in group_data['questions']
+}
+
+# Profile field that answers each grouped question; the question is skipped once the field is set
+ANSWER_FIELDS = {
+    'ADM_RATE': 'gpa',
+    'PCTPELL': 'family_income_level',  # 'unknown' until parsed
+    'C150_4': 'completion_confidence',
+    'RET_FT4': 'fulltime_study',
+    'TUITIONFEE_IN': 'tuition_budget',
+    'TUITIONFEE_OUT': 'international_student',
+    'COSTT4_A': 'college_scorecard_COSTT4_A',
+    'NPT4_PUB': 'college_scorecard_NPT4_PUB',
+    'NPT4_PRIV': 'college_scorecard_NPT4_PRIV',
+    'UGDS': 'preferred_class_size',
+    'academic_interests': 'academic_interests'
+}
+
+# Single-question order: the first type whose profile field is still unanswered is asked next
+CURRENT_QUESTION_RULES = (
+    ('gpa', lambda profile: not profile.get('gpa')),
+    ('income', lambda profile: profile.get('family_income_level') in (None, '', 'unknown')),
+    ('confidence', lambda profile: not profile.get('completion_confidence')),
+    ('study_mode', lambda profile: not profile.get('fulltime_study')),
+    ('international', lambda profile: profile.get('international_student') is None),  # False is an answer
+    ('budget', lambda profile: not profile.get('tuition_budget')),
+    ('academic_interests', lambda profile: not profile.get('academic_interests')),
+    ('class_size', lambda profile: not profile.get('preferred_class_size')),
+    ('financial_aid', lambda profile: not profile.get('financial_aid_eligible')),
+    ('institution_type', lambda profile: not profile.get('prefer_private')),
+)
+
+# Pre-set answer options for single questions, mapped to dataset values
+PRESET_ANSWER_OPTIONS = {
+    'gpa': [
+        {'label': '3.0 - 3.2', 'value': '3.1', 'mapped_value': 0.7},
+        {'label': '3.3 - 3.5', 'value': '3.4', 'mapped_value': 0.8},
+        {'label': '3.6 - 3.8', 'value': '3.7', 'mapped_value': 0.9},
+        {'label': '3.9 - 4.0', 'value': '3.95', 'mapped_value': 0.95}
+    ],
+    'income': [
+        {'label': 'Low Income', 'value': 'low', 'mapped_value': 0.7},
+        {'label': 'Medium Income', 'value': 'medium', 'mapped_value': 0.4},
+        {'label': 'High Income', 'value': 'high', 'mapped_value': 0.2}
+    ],
+    'confidence': [
+        {'label': 'Not Very Confident (1-3)', 'value': '2', 'mapped_value': 0.5},
+        {'label': 'Somewhat Confident (4-6)', 'value': '5', 'mapped_value': 0.6},
+        {'label': 'Confident (7-8)', 'value': '7.5', 'mapped_value': 0.7},
+        {'label': 'Very Confident (9-10)', 'value': '9.5', 'mapped_value': 0.8}
+    ],
+    'study_mode': STUDY_MODE_OPTIONS,
+    'international': [
+        {'label': 'Local Student', 'value': 'no', 'mapped_value': 30000},
+        {'label': 'International Student', 'value': 'yes', 'mapped_value': 40000}
+    ],
+    'budget': [
+        {'label': '$10,000 - $20,000', 'value': '15000', 'mapped_value': 15000},
+        {'label': '$20,000 - $30,000', 'value': '25000', 'mapped_value': 25000},
+        {'label': '$30,000 - $40,000', 'value': '35000', 'mapped_value': 35000},
+        {'label': '$40,000+', 'value': '45000', 'mapped_value': 45000}
+    ],
+    'academic_interests': [
+        {'label': 'Business & Management', 'value': 'business', 'mapped_value': 'business'},
+        {'label': 'Engineering & Technology', 'value': 'engineering', 'mapped_value': 'engineering'},
+        {'label': 'Computer Science', 'value': 'computing', 'mapped_value': 'computing'},
+        {'label': 'Arts & Design', 'value': 'arts', 'mapped_value': 'arts'},
+        {'label': 'Hospitality & Tourism', 'value': 'hospitality', 'mapped_value': 'hospitality'},
+        {'label': 'Medicine & Health', 'value': 'medicine', 'mapped_value': 'medicine'}
+    ],
+    'class_size': [
+        {'label': 'Small Classes (< 30 students)', 'value': 'small', 'mapped_value': 2000},
+        {'label': 'Medium Classes (30-100 students)', 'value': 'medium', 'mapped_value': 5000},
+        {'label': 'Large Classes (> 100 students)', 'value': 'large', 'mapped_value': 15000}
+    ],
+    'financial_aid': [
+        {'label': 'Yes, I need financial aid', 'value': 'yes', 'mapped_value': 10000},
+        {'label': 'No, I don\'t need financial aid', 'value': 'no', 'mapped_value': 20000}
+    ],
+    'institution_type': [
+        {'label': 'Public Institution', 'value': 'no', 'mapped_value': 20000},
+        {'label': 'Private Institution', 'value': 'yes', 'mapped_value': 30000}
+    ]
+}
+
+# Same options keyed by lower-cased label, for matching typed-out answers
+PRESET_OPTIONS_BY_LABEL = {
+    question_type: {option['label'].lower(): option for option in options}
+    for question_type, options in PRESET_ANSWER_OPTIONS.items()
+}
+
+# Same options pre-rendered as the numbered list shown in the prompt
+PRESET_OPTIONS_TEXT = {
+    question_type: "\n".join(f"{i}. {option['label']}" for i, option in enumerate(options, 1))
+    for question_type, options in PRESET_ANSWER_OPTIONS.items()
+}
+
+# Out-of-state tuition (TUITIONFEE_OUT) by international status
+INTL_TUITION = 40000      # Higher for international
+DOMESTIC_TUITION = 30000  # Lower for domestic
+
+# Fallback values for College Scorecard variables not collected in the conversation
+SCORECARD_DEFAULTS = {
+    'ADM_RATE': 0.7,      # Moderate admission rate
+    'PCTPELL': 0.3,       # Moderate Pell percentage
+    'C150_4': 0.6,        # Moderate completion rate
+    'RET_FT4': 0.7,       # Moderate retention rate
+    'TUITIONFEE_IN': 25000,  # Moderate in-state tuition
+    'TUITIONFEE_OUT': 35000, # Moderate out-of-state tuition
+    'COSTT4_A': 30000,       # Moderate total cost
+    'NPT4_PUB': 15000,       # Moderate public net price
+    'NPT4_PRIV': 25000,      # Moderate private net price
+    'UGDS': 5000,            # Moderate enrollment
+    'CONTROL': 1,            # Public institution
+    'LOCALE': 2              # Suburban
+}
+
+# ML feature name → profile key for every variable the model takes
+FEATURE_KEYS = {var: f'college_scorecard_{var}' for var in SCORECARD_DEFAULTS}
+
+# Recommendation enhancements (enhance_response_with_prediction), by recruitment likelihood
+LIKELIHOOD_HIGHLIGHTS = {
+    'high': "\n\n🎯 **Great news!** Based on your profile, you're an excellent match for Sunway University programs! Your background and interests align perfectly with our offerings.",
+    'moderate': "\n\n✨ **Excellent potential!** Your profile shows strong compatibility with Sunway University. We believe you'll thrive in our academic environment.",
+    'low': "\n\n💡 **Every student's journey is unique!** While we've identified some areas for consideration, Sunway University offers various support programs and pathways to help you succeed."
+}
+CALLBACK_TEXT = "\n\n📞 **Next Steps:** Would you like to schedule a personalized consultation with our admissions team? They can provide detailed information about programs, financial aid, and application requirements tailored to your specific situation."
+
+# Cluster-specific line appended to recommendations (enhance_response_with_prediction)
+CLUSTER_HIGHLIGHTS = {
+    'engineering_tech': "\n🔧 **Engineering & Technology Focus:** Our programs emphasize practical skills and industry connections.",
+    'business_finance': "\n💼 **Business & Finance Excellence:** Access to real-world projects and industry partnerships.",
+    'computer_science': "\n💻 **Computer Science Innovation:** Cutting-edge technology and AI-focused curriculum.",
+    'arts_design': "\n🎨 **Creative Arts & Design:** State-of-the-art facilities and industry mentorship.",
+    'hospitality_tourism': "\n🏨 **Hospitality & Tourism:** International partnerships and hands-on training."
+}
+DEFAULT_CLUSTER_HIGHLIGHT = "\n🌟 **Personalized Learning:** Programs tailored to your interests and career goals."
+
+# Program recommendation prompt, filled in per student by _build_recommendation_messages
+RECOMMENDATION_PROMPT = """You are an AI university advisor for Sunway University. You have analyzed the student's profile and are now providing personalized program recommendations.
+
+Student Profile:
+{profile_summary}
+
+ML Analysis Results:
+- Recruitment Likelihood: {likelihood}
+- Recommended Program Cluster: {cluster}
+- Confidence Level: {confidence}
+
+Guidelines:
+- Present programs from ALL the student's academic interests
+- If the student has multiple interests (e.g., Engineering AND Medicine), ensure you mention programs from BOTH areas
+- Explain why each program is recommended based on their specific interests
+- Include key details like duration, tuition, and department
+- Be enthusiastic about Sunway University
+- Encourage the student to learn more about specific programs
+- Offer to help with the application process
+- Explicitly mention that you've considered all their interests when making recommendations
+
+Program Recommendations:
+{program_suggestions}
+
+Provide a warm, encouraging response that presents these programs and guides the student toward next steps. Make sure to acknowledge that you've considered all their academic interests."""
+
+# Default student profile; list fields hold immutable () and are swapped for fresh lists per profile
+_DEFAULT_PROFILE = {
+    'academic_interests': (),
+    'financial_concerns': False,
+    'geographic_preferences': (),
+    'career_goals': (),
+    'academic_level': 'undergraduate',  # default
+    'family_income_level': 'unknown',
+    'first_generation': False,
+    'international_student': False,
+    'gpa': None,
+    'test_scores': None,
+    'extracurriculars': (),
+    'work_experience': False
+}
+_PROFILE_LIST_FIELDS = ('academic_interests', 'geographic_preferences', 'career_goals', 'extracurriculars')
+
+# Most questions packed into one data-collection turn
+MAX_GROUPED_QUESTIONS = 5
+
+@lru_cache(maxsize=32)
+def _format_profile_summary(interests, income_level, academic_level, gpa, first_generation, international_student):
+    """Render the profile summary (memoised on the summarised fields)"""
+    # Each candidate line is only formatted when its field is present
+    summary = [line for line in (
+        interests and f"Interests: {', '.join(interests)}",
+        income_level != 'unknown' and f"Income Level: {income_level}",
+        academic_level and f"Academic Level: {academic_level}",
+        gpa and f"GPA: {gpa}",
+        first_generation and "First Generation Student: Yes",
+        international_student and "International Student: Yes",
+    ) if line]
+    
+    return "\n".join(summary) if summary else "Profile information being collected..."
+
 class ClaudeAIService:
     def __init__(self):
         self.client = None
         self.api_key = os.getenv('CLAUDE_API_KEY')
+        # Writes staged during a turn and persisted once at its end (see flush_pending_writes)
+        self._pending_profiles = {}
+        self._pending_histories = []
+        # Question group asked per student (None once answered); kept beside the profile, not in it
+        self._pending_question_groups = {}
         self.initialize_client()
         
     def initialize_client(self):
@@ -33,29 +637,63 @@ class ClaudeAIService:
     
     def create_student_profile(self, student_data):
         """Create a student profile based on conversation data"""
-        # Start with default profile
-        profile = {
-            'academic_interests': [],
-            'financial_concerns': False,
-            'geographic_preferences': [],
-            'career_goals': [],
-            'academic_level': 'undergraduate',  # default
-            'family_income_level': 'unknown',
-            'first_generation': False,
-            'international_student': False,
-            'gpa': None,
-            'test_scores': None,
-            'extracurriculars': [],
-            'work_experience': False
-        }
+        # Start with default profile, updated with existing student data (preserve all fields)
+        profile = {**_DEFAULT_PROFILE, **student_data} if student_data else _DEFAULT_PROFILE.copy()
+        
+        # List defaults are shared empty tuples in the template - give each profile its own lists
+        for field in _PROFILE_LIST_FIELDS:
+            if profile[field] == ():
+                profile[field] = []
         
-        # Update with existing student data (preserve all fields)
-        if student_data:
-            profile.update(student_data)
+        # Older versions kept the asked question group inside the profile; it now lives on the student record
+        profile.pop('asked_question_group', None)
         
         return profile
     
-    def generate_ai_response(self, message, student_id, conversation_history=None):
+    def _build_messages(self, system_prompt, user_message, conversation_history, history_turns=2):
+        """Build the Claude message list: prompt, the last few conversation turns, then the new message"""
+        messages = [{"role": "user", "content": system_prompt}]
+        
+        if conversation_history:
+            cutoff = (datetime.now() - HISTORY_MAX_AGE).isoformat()
+            for conv in conversation_history[-history_turns:]:
+                # Skip stale turns; entries without a timestamp are kept
+                if conv.get('timestamp', cutoff) < cutoff:
+                    continue
+                messages.append({"role": "user", "content": conv['message'][-HISTORY_USER_CHARS:]})
+                messages.append({"role": "assistant", "content": conv['ai_response'][:HISTORY_AI_CHARS]})
+        
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _invoke_claude(self, system_prompt, user_message, conversation_history, *, max_tokens=400, history_turns=2, on_text=None):
+        """Build the messages for a prompt and call Claude, returning the response text"""
+        messages = self._build_messages(system_prompt, user_message, conversation_history, history_turns)
+        return self._create_message(messages, max_tokens, on_text)
+    
+    def _create_message(self, messages, max_tokens, on_text=None):
+        """Call Claude and return the response text, streaming chunks to on_text if given"""
+        if on_text is None:
+            response = self.client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=messages,
+                temperature=0.7
+            )
+            return response.content[0].text
+        
+        # Stream so the first tokens reach the client while the rest is generated
+        with self.client.messages.stream(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            messages=messages,
+            temperature=0.7
+        ) as stream:
+            for text in stream.text_stream:
+                on_text(text)
+            return stream.get_final_text()
+    
+    def generate_ai_response(self, message, student_id, conversation_history=None, on_text=None):
         """Generate AI response using Claude API with data collection and ML prediction"""
         try:
             if not self.client:
@@ -70,24 +708,21 @@ class ClaudeAIService:
             student_profile = self.create_student_profile(student_data)
             
             # Parse student response and update profile
-            self.parse_student_response(message, student_profile)
+            self.parse_student_response(message, student_profile, student_id)
             
-            # Save updated student profile back to recruitment service
-            recruitment_service.add_student({
-                'id': student_id,
-                'data': student_profile
-            })
+            # Stage updated student profile; it is saved once when the turn ends
+            self._pending_profiles[student_id] = student_profile
             
             # Check if we have enough data for ML prediction
             has_sufficient_data = self.check_sufficient_data(student_profile, conversation_history)
             
             if not has_sufficient_data:
                 # Data collection phase
-                response = self.collect_student_data(message, student_profile, conversation_history)
+                response = self.collect_student_data(message, student_profile, conversation_history, on_text=on_text, student_id=student_id)
                 return response
             else:
                 # ML prediction and program recommendation phase
-                recommendation_result = self.generate_program_recommendations(message, student_profile, conversation_history)
+                recommendation_result = self.generate_program_recommendations(message, student_profile, conversation_history, on_text=on_text)
                 return {
                     'response': recommendation_result['response'],
                     'prediction': recommendation_result.get('prediction'),
@@ -101,45 +736,56 @@ class ClaudeAIService:
                 'prediction': None,
                 'confidence': 'low'
             }
+        finally:
+            self.flush_pending_writes()
+    
+    def flush_pending_writes(self):
+        """Persist profiles staged during the turn, then record staged conversation history"""
+        try:
+            # add_student rewrites the whole data store, so do it once per student per turn
+            for student_id, student_profile in self._pending_profiles.items():
+                student_record = {
+                    'id': student_id,
+                    'data': student_profile
+                }
+                if student_id in self._pending_question_groups:
+                    student_record['asked_question_group'] = self._pending_question_groups[student_id]
+                recruitment_service.add_student(student_record)
+            
+            for student_id, conversation_history in self._pending_histories:
+                recruitment_service.save_conversation_history(student_id, conversation_history)
+        except Exception as e:
+            logger.error(f"Error saving student data: {e}")
+        finally:
+            self._pending_profiles.clear()
+            self._pending_histories.clear()
+            self._pending_question_groups.clear()
     
     def check_sufficient_data(self, student_profile, conversation_history):
         """Check if we have sufficient data for ML prediction"""
-        # Check if we have collected enough College Scorecard variables
-        required_variables = [
-            'ADM_RATE', 'PCTPELL', 'C150_4', 'RET_FT4',
-            'TUITIONFEE_IN', 'TUITIONFEE_OUT', 'COSTT4_A',
-            'NPT4_PUB', 'NPT4_PRIV', 'UGDS'
-        ]
+        # Check conversation history first - early turns never reach the variable count
+        if not conversation_history or len(conversation_history) < 2:
+            return False
         
         # Check if we have at least 6 out of 10 required variables
-        collected_variables = 0
-        for var in required_variables:
-            if student_profile.get(f'college_scorecard_{var}'):
-                collected_variables += 1
-        
-        has_sufficient_variables = collected_variables >= 6
-        
-        # Check if we have conversation history
-        has_conversation_history = conversation_history and len(conversation_history) >= 2
-        
-        return has_sufficient_variables and has_conversation_history
+        collected_variables = sum(1 for key in SCORECARD_KEYS if student_profile.get(key))
+        return collected_variables >= 6
     
-    def collect_student_data(self, message, student_profile, conversation_history):
+    def collect_student_data(self, message, student_profile, conversation_history, on_text=None, student_id=None):
         """Collect student data through conversation based on College Scorecard variables"""
+        # The message has already been parsed into student_profile by generate_ai_response;
+        # parsing again would let a single numeric reply answer two consecutive questions
         
         # Get current conversation state
-        student_id = student_profile.get('student_id', 'default')
+        student_id = student_id or student_profile.get('student_id', 'default')
         conversation_state = self.get_conversation_state(student_id)
         
-        # Parse the student's response first to update the profile
-        self.parse_student_response(message, student_profile)
-        
         # Determine what information we still need
         missing_info = self.get_missing_college_scorecard_data(student_profile)
         
         if not missing_info:
             # We have all the data, move to prediction phase
-            recommendation_result = self.generate_program_recommendations(message, student_profile, conversation_history)
+            recommendation_result = self.generate_program_recommendations(message, student_profile, conversation_history, on_text=on_text)
             return {
                 'response': recommendation_result['response'],
                 'prediction': recommendation_result.get('prediction'),
@@ -168,7 +814,7 @@ class ClaudeAIService:
 CRITICAL FORMATTING REQUIREMENTS:
 - Present each question as a clear multiple-choice format
 - Number each option clearly (1, 2, 3, 4, etc.)
-- Make it easy for users to respond with just a number
+- Make it easy for users to answer every question in one reply: one option number per question, in question order
 - Keep responses concise and friendly
 - Explain briefly why this information helps with program matching
 
@@ -185,30 +831,18 @@ Question 2: What are your main interests?
 3. Arts & Humanities
 4. Sciences
 
+Reply with one number per question, in order - for example "3, 2" means GPA 3.6 - 3.8 and Engineering.
+
 Questions:
 {chr(10).join(formatted_questions)}
 
-IMPORTANT: Ask users to respond with just the number corresponding to their choice (e.g., "1", "2", "3"). Make it clear they don't need to type full answers."""
-            
-            # Build conversation history
-            messages = [{"role": "user", "content": system_prompt}]
-            
-            if conversation_history:
-                for conv in conversation_history[-2:]:  # Last 2 messages for context
-                    messages.append({"role": "user", "content": conv['message']})
-                    messages.append({"role": "assistant", "content": conv['ai_response']})
-            
-            messages.append({"role": "user", "content": message})
+IMPORTANT: Ask users to answer all the questions in one message with one option number per question, in the order the questions are listed, separated by commas (e.g., "1, 3, 2" answers three questions). Make it clear they don't need to type full answers."""
             
             # Call Claude API
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=600,  # Allow for grouped questions
-                messages=messages,
-                temperature=0.7
-            )
+            ai_response = self._invoke_claude(system_prompt, message, conversation_history, max_tokens=600, on_text=on_text)  # Allow for grouped questions
             
-            ai_response = response.content[0].text
+            # Remember which questions were asked so numeric replies ("1, 3, 2") map back positionally
+            self._pending_question_groups[student_id] = [question['variable'] for question in group_data['questions']]
             
             # Save conversation state with updated profile
             conversation_state['student_profile'] = student_profile
@@ -224,7 +858,6 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
         if isinstance(next_question_data, str):
             next_question = next_question_data
             question_type = self.get_question_type(next_question)
-            preset_options = self.get_preset_answer_options(question_type)
         else:
             # If it's not a string, it should be a grouped question that wasn't handled
             logger.error(f"Unexpected question data format: {next_question_data}")
@@ -282,29 +915,12 @@ CRITICAL INSTRUCTIONS:
 
 PRESET ANSWER OPTIONS:
 Present these options in a clear numbered format:
-{self.format_preset_options(preset_options)}
+{self.get_preset_options_text(question_type)}
 
 IMPORTANT: Ask users to respond with just the number corresponding to their choice (e.g., "1", "2", "3"). Make it clear they don't need to type full answers."""
         
-        # Build conversation history
-        messages = [{"role": "user", "content": system_prompt}]
-        
-        if conversation_history:
-            for conv in conversation_history[-2:]:  # Last 2 messages for context
-                messages.append({"role": "user", "content": conv['message']})
-                messages.append({"role": "assistant", "content": conv['ai_response']})
-        
-        messages.append({"role": "user", "content": message})
-        
         # Call Claude API
-        response = self.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=400,  # Allow for preset options
-            messages=messages,
-            temperature=0.7
-        )
-        
-        ai_response = response.content[0].text
+        ai_response = self._invoke_claude(system_prompt, message, conversation_history, max_tokens=400, on_text=on_text)  # Allow for preset options
         
         # Save conversation state with updated profile
         conversation_state['student_profile'] = student_profile
@@ -316,64 +932,59 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
             'confidence': 'collecting_data'
         }
     
-    def parse_student_response(self, message, student_profile):
+    def parse_student_response(self, message, student_profile, student_id=None):
         """Parse student response and update profile with College Scorecard variables"""
-        message_lower = message.lower().strip()
+        stripped = message.strip()
+        message_lower = stripped.lower()
+        has_digit = DIGIT_RE.search(stripped) is not None
         
         # Add logging to track what's being parsed
-        logger.info(f"Parsing message: '{message}' for student profile")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsing message: '%s' for student profile", message)
+        
+        # ===== GROUPED ANSWER PARSING =====
+        # Numbers answering the last grouped question set, in the order the questions were asked
+        asked_question_group = self.get_asked_question_group(student_id) if student_id else None
+        if asked_question_group and GROUP_ANSWERS_RE.match(stripped):
+            unanswered = self.parse_grouped_selection(message, student_profile, asked_question_group)
+            if unanswered is not None:
+                # Keep whatever is still open; the next grouped prompt replaces it
+                self._pending_question_groups[student_id] = unanswered or None
+                return
         
         # ===== PRESET ANSWER SELECTION PARSING =====
-        # Check if user selected a preset option (1, 2, 3, 4, etc.)
-        import re
-        preset_selection = re.search(r'^(\d+)$', message.strip())
-        if preset_selection:
-            selection_number = int(preset_selection.group(1))
-            # Get the current question type to determine which preset options to use
-            current_question_type = self.get_current_question_type(student_profile)
+        # Get the current question type to determine which preset options to use
+        current_question_type = self.get_current_question_type(student_profile)
+        
+        # Check if user selected a preset option (1, 2, 3, 4, etc.) - the common tapped-a-button case
+        if stripped.isdecimal():
+            selection_number = int(stripped)
             preset_options = self.get_preset_answer_options(current_question_type)
-            
             if 1 <= selection_number <= len(preset_options):
                 selected_option = preset_options[selection_number - 1]
                 # Map the selected option to the appropriate field
                 self.map_preset_selection_to_profile(selected_option, current_question_type, student_profile)
-                logger.info(f"Parsed preset selection: {selection_number} → {selected_option['label']}")
+                logger.info("Parsed preset selection: %s → %s", selection_number, selected_option['label'])
                 return
         
         # Check if user provided a text-based preset answer (like "3.9 - 4.0")
-        current_question_type = self.get_current_question_type(student_profile)
-        preset_options = self.get_preset_answer_options(current_question_type)
-        
-        for option in preset_options:
-            if message.strip().lower() == option['label'].lower():
-                # Map the selected option to the appropriate field
-                self.map_preset_selection_to_profile(option, current_question_type, student_profile)
-                logger.info(f"Parsed text preset selection: {message} → {option['label']}")
-                return
+        option = self.get_preset_answer_options_by_label(current_question_type).get(message_lower)
+        if option:
+            # Map the selected option to the appropriate field
+            self.map_preset_selection_to_profile(option, current_question_type, student_profile)
+            logger.info("Parsed text preset selection: %s → %s", message, option['label'])
+            return
         
         # Handle grouped responses (multiple answers in one message)
-        self.parse_grouped_response(message, student_profile)
+        self.parse_grouped_response(message, student_profile, message_lower, has_digit)
         
         # ===== INTELLIGENT RESPONSE MAPPING =====
         # The AI should map responses to standardized values that match the ML model's training data
         
         # ===== GPA PARSING FOR ADM_RATE =====
-        if not student_profile.get('gpa'):
-            # Comprehensive GPA patterns with intelligent mapping
-            gpa_patterns = [
-                r'^(\d+\.\d+)$',  # 3.5, 4.0, etc.
-                r'^(\d+)$',        # 3, 4, etc.
-                r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)',  # "3.9 - 4.0" or "3.5-4.0"
-                r'gpa[:\s]*(\d+\.?\d*)',  # "GPA: 3.5" or "GPA 3.5"
-                r'grade[:\s]*(\d+\.?\d*)',  # "Grade: 3.5" or "Grade 3.5"
-                r'(\d+\.?\d*)\s*(?:gpa|grade)',  # "3.5 GPA" or "3.5 Grade"
-                r'my\s+(?:gpa|grade)\s+is\s+(\d+\.?\d*)',  # "My GPA is 3.5"
-                r'(\d+\.?\d*)\s+out\s+of\s+4',  # "3.5 out of 4"
-                r'(\d+\.?\d*)\s+point\s+(?:gpa|grade)',  # "3.5 point GPA"
-            ]
-            
-            for pattern in gpa_patterns:
-                gpa_match = re.search(pattern, message_lower)
+        if has_digit and not student_profile.get('gpa'):
+            for pattern in GPA_PATTERNS:
+                gpa_match = pattern.search(message_lower)
                 if gpa_match:
                     try:
                         if len(gpa_match.groups()) == 2:  # Range pattern
@@ -388,33 +999,21 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
                         if 0.0 <= gpa <= 4.0:
                             student_profile['gpa'] = gpa
                             student_profile['college_scorecard_ADM_RATE'] = self.map_gpa_to_admission_rate(gpa)
-                            logger.info(f"Parsed GPA: {gpa} → ADM_RATE: {student_profile['college_scorecard_ADM_RATE']}")
+                            logger.info("Parsed GPA: %s → ADM_RATE: %s", gpa, student_profile['college_scorecard_ADM_RATE'])
                             break
                     except ValueError:
                         continue
         
         # ===== INCOME LEVEL PARSING FOR PCTPELL =====
         if not student_profile.get('family_income_level') or student_profile.get('family_income_level') == 'unknown':
-            income_indicators = ['income', 'money', 'financial', 'family', 'economic', 'budget', 'afford']
-            if any(word in message_lower for word in income_indicators) or any(word in message_lower for word in ['low', 'medium', 'high', 'poor', 'rich', 'wealthy', 'struggling']):
+            if INCOME_INDICATORS_RE.search(message_lower) or INCOME_HINTS_RE.search(message_lower):
                 # Intelligent income mapping to standardized values
-                income_mapping = {
-                    'low': ['low', 'poor', 'struggling', 'minimum', 'barely', 'scraping', 'tight', 'limited', 'modest', 'humble'],
-                    'medium': ['medium', 'middle', 'average', 'moderate', 'decent', 'reasonable', 'stable'],
-                    'high': ['high', 'rich', 'wealthy', 'well-off', 'comfortable', 'affluent', 'privileged', 'upper', 'substantial']
-                }
-                
-                for standardized_level, variations in income_mapping.items():
-                    if any(word in message_lower for word in variations):
+                for standardized_level, variations in INCOME_LEVELS:
+                    if variations.search(message_lower):
                         student_profile['family_income_level'] = standardized_level
                         # Map to standardized PCTPELL values
-                        if standardized_level == 'low':
-                            student_profile['college_scorecard_PCTPELL'] = 0.7  # High Pell percentage
-                        elif standardized_level == 'medium':
-                            student_profile['college_scorecard_PCTPELL'] = 0.4  # Moderate Pell percentage
-                        else:  # high
-                            student_profile['college_scorecard_PCTPELL'] = 0.2  # Low Pell percentage
-                        logger.info(f"Parsed income: {standardized_level} → PCTPELL: {student_profile['college_scorecard_PCTPELL']}")
+                        student_profile['college_scorecard_PCTPELL'] = PELL_BY_INCOME[standardized_level]
+                        logger.info("Parsed income: %s → PCTPELL: %s", standardized_level, student_profile['college_scorecard_PCTPELL'])
                         
                         # Apply intelligent inference for related answers
                         self.infer_related_answers(message, student_profile, 'PCTPELL', standardized_level)
@@ -422,132 +1021,95 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
         
         # ===== CONFIDENCE PARSING FOR C150_4 =====
         if not student_profile.get('completion_confidence'):
-            confidence_indicators = ['confident', 'confidence', 'sure', 'certain', 'definitely', 'probably', 'likely', 'think', 'feel']
-            if any(word in message_lower for word in confidence_indicators) or re.search(r'^\d+$', message.strip()):
-                import re
-                
+            if CONFIDENCE_INDICATORS_RE.search(message_lower) or stripped.isdecimal():
                 # Look for numeric confidence levels (1-10 scale)
-                conf_match = re.search(r'(\d+)', message)
+                conf_match = has_digit and CONF_NUM_RE.search(message)
                 if conf_match:
                     confidence = int(conf_match.group(1))
                     if 1 <= confidence <= 10:
                         student_profile['completion_confidence'] = confidence
                         student_profile['college_scorecard_C150_4'] = self.map_confidence_to_completion_rate(confidence)
-                        logger.info(f"Parsed confidence: {confidence} → C150_4: {student_profile['college_scorecard_C150_4']}")
+                        logger.info("Parsed confidence: %s → C150_4: %s", confidence, student_profile['college_scorecard_C150_4'])
                         
                         # Apply intelligent inference for related answers
                         self.infer_related_answers(message, student_profile, 'C150_4', student_profile['college_scorecard_C150_4'])
                 else:
                     # Intelligent confidence mapping based on language intensity
-                    confidence_mapping = {
-                        0.8: ['very', 'extremely', 'highly', 'absolutely', 'completely', 'totally', 'definitely'],
-                        0.6: ['somewhat', 'moderate', 'fairly', 'reasonably', 'pretty', 'quite'],
-                        0.4: ['not', 'unsure', 'uncertain', 'doubtful', 'maybe', 'possibly', 'might']
-                    }
-                    
-                    for standardized_confidence, variations in confidence_mapping.items():
-                        if any(word in message_lower for word in variations):
+                    for standardized_confidence, variations in CONFIDENCE_LEVELS:
+                        matched = variations.search(message_lower)
+                        if matched:
                             student_profile['college_scorecard_C150_4'] = standardized_confidence
-                            logger.info(f"Parsed confidence: {variations[0]} → C150_4: {standardized_confidence}")
+                            logger.info("Parsed confidence: %s → C150_4: %s", matched.group(), standardized_confidence)
                             
                             # Apply intelligent inference for related answers
                             self.infer_related_answers(message, student_profile, 'C150_4', standardized_confidence)
                             break
                     else:
                         student_profile['college_scorecard_C150_4'] = 0.7  # Default moderate
-                        logger.info(f"Parsed confidence: default → C150_4: 0.7")
+                        logger.info("Parsed confidence: default → C150_4: 0.7")
                         
                         # Apply intelligent inference for related answers
                         self.infer_related_answers(message, student_profile, 'C150_4', 0.7)
         
         # ===== FULL-TIME STUDY PARSING FOR RET_FT4 =====
         if not student_profile.get('fulltime_study'):
-            study_time_indicators = ['full', 'part', 'time', 'study', 'enrollment', 'load', 'course']
-            if any(word in message_lower for word in study_time_indicators):
+            if STUDY_INDICATORS_RE.search(message_lower):
                 # Intelligent study mode mapping
-                study_mode_mapping = {
-                    'yes': ['full', 'full-time', 'fulltime', 'complete', 'entire'],
-                    'no': ['part', 'part-time', 'parttime', 'partial', 'some']
-                }
-                
-                for standardized_mode, variations in study_mode_mapping.items():
-                    if any(word in message_lower for word in variations):
+                for standardized_mode, variations in STUDY_MODES:
+                    if variations.search(message_lower):
                         student_profile['fulltime_study'] = standardized_mode
                         # Map to standardized RET_FT4 values
                         if standardized_mode == 'yes':
                             student_profile['college_scorecard_RET_FT4'] = 0.8  # Higher retention for full-time
                         else:
                             student_profile['college_scorecard_RET_FT4'] = 0.6  # Lower retention for part-time
-                        logger.info(f"Parsed study mode: {standardized_mode} → RET_FT4: {student_profile['college_scorecard_RET_FT4']}")
+                        logger.info("Parsed study mode: %s → RET_FT4: %s", standardized_mode, student_profile['college_scorecard_RET_FT4'])
                         
                         # Apply intelligent inference for related answers
                         self.infer_related_answers(message, student_profile, 'RET_FT4', student_profile['college_scorecard_RET_FT4'])
                         break
         
         # ===== INTERNATIONAL STATUS PARSING FOR TUITIONFEE_OUT =====
+        parsed_international = False
         if student_profile.get('international_student') is None:
-            international_indicators = ['international', 'foreign', 'overseas', 'abroad', 'country', 'nationality', 'citizen', 'local', 'locally']
-            if any(word in message_lower for word in international_indicators):
+            if INTERNATIONAL_INDICATORS_RE.search(message_lower):
                 # Intelligent international status mapping
-                international_mapping = {
-                    True: ['international', 'foreign', 'overseas', 'abroad', 'other', 'different'],
-                    False: ['local', 'locally', 'domestic', 'home', 'same', 'this', 'national', 'malaysia']
-                }
-                
-                for standardized_status, variations in international_mapping.items():
-                    if any(word in message_lower for word in variations):
+                for standardized_status, variations in INTERNATIONAL_STATUSES:
+                    if variations.search(message_lower):
                         student_profile['international_student'] = standardized_status
-                        # Map to standardized TUITIONFEE_OUT values
-                        if standardized_status:
-                            student_profile['college_scorecard_TUITIONFEE_OUT'] = 40000  # Higher for international
-                        else:
-                            student_profile['college_scorecard_TUITIONFEE_OUT'] = 30000  # Lower for domestic
-                        logger.info(f"Parsed international status: {standardized_status} → TUITIONFEE_OUT: {student_profile['college_scorecard_TUITIONFEE_OUT']}")
-                        
-                        # Apply intelligent inference for related answers
-                        self.infer_related_answers(message, student_profile, 'TUITIONFEE_OUT', student_profile['college_scorecard_TUITIONFEE_OUT'])
+                        parsed_international = True
                         break
         
-        # Also set TUITIONFEE_OUT if international_student is already set but TUITIONFEE_OUT is not
-        if student_profile.get('international_student') is not None and not student_profile.get('college_scorecard_TUITIONFEE_OUT'):
-            if student_profile['international_student']:
-                student_profile['college_scorecard_TUITIONFEE_OUT'] = 40000  # Higher for international
-            else:
-                student_profile['college_scorecard_TUITIONFEE_OUT'] = 30000  # Lower for domestic
-            logger.info(f"Set TUITIONFEE_OUT based on existing international status: {student_profile['international_student']} → TUITIONFEE_OUT: {student_profile['college_scorecard_TUITIONFEE_OUT']}")
+        # Map to standardized TUITIONFEE_OUT values - for a freshly parsed status, or a known one not yet mapped
+        international = student_profile.get('international_student')
+        if international is not None and (parsed_international or not student_profile.get('college_scorecard_TUITIONFEE_OUT')):
+            student_profile['college_scorecard_TUITIONFEE_OUT'] = INTL_TUITION if international else DOMESTIC_TUITION
+            logger.info("Parsed international status: %s → TUITIONFEE_OUT: %s", international, student_profile['college_scorecard_TUITIONFEE_OUT'])
+            
+            if parsed_international:
+                # Apply intelligent inference for related answers
+                self.infer_related_answers(message, student_profile, 'TUITIONFEE_OUT', student_profile['college_scorecard_TUITIONFEE_OUT'])
         
         # ===== TUITION BUDGET PARSING FOR TUITIONFEE_IN =====
-        if not student_profile.get('tuition_budget'):
-            budget_indicators = ['budget', 'tuition', 'cost', 'dollar', '$', 'pay', 'afford', 'price', 'fee']
-            if any(word in message_lower for word in budget_indicators) or re.search(r'^\d+$', message.strip()):
-                import re
-                
+        if has_digit and not student_profile.get('tuition_budget'):
+            if BUDGET_INDICATORS_RE.search(message_lower) or stripped.isdecimal():
                 # Look for dollar amounts with various formats
-                budget_patterns = [
-                    r'^\d+$',  # Standalone number like "25000"
-                    r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)',  # $25,000 or $25000.50
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*dollars?',  # 25000 dollars
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*k',  # 25k
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*thousand',  # 25 thousand
-                    r'(\d+)\s*(?:dollar|buck)',  # 25000 dollar
-                ]
-                
-                for pattern in budget_patterns:
-                    budget_match = re.search(pattern, message_lower)
+                for pattern in BUDGET_PATTERNS:
+                    budget_match = pattern.search(message_lower)
                     if budget_match:
                         try:
                             # Clean the number and convert to int
-                            if pattern == r'^\d+$':
+                            if not pattern.groups:
                                 budget_str = budget_match.group(0)
                             else:
                                 budget_str = budget_match.group(1).replace(',', '')
-                            budget = int(float(budget_str))
+                            budget = int(budget_str) if '.' not in budget_str else int(float(budget_str))
                             
                             # Validate reasonable tuition range
                             if 5000 <= budget <= 100000:
                                 student_profile['tuition_budget'] = budget
                                 student_profile['college_scorecard_TUITIONFEE_IN'] = self.map_budget_to_tuition(budget)
-                                logger.info(f"Parsed budget: ${budget} → TUITIONFEE_IN: {student_profile['college_scorecard_TUITIONFEE_IN']}")
+                                logger.info("Parsed budget: $%s → TUITIONFEE_IN: %s", budget, student_profile['college_scorecard_TUITIONFEE_IN'])
                                 
                                 # Apply intelligent inference for related answers
                                 self.infer_related_answers(message, student_profile, 'TUITIONFEE_IN', str(budget))
@@ -556,32 +1118,21 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
                             continue
         
         # ===== TOTAL BUDGET PARSING FOR COSTT4_A =====
-        if not student_profile.get('college_scorecard_COSTT4_A'):
-            total_cost_indicators = ['total', 'overall', 'complete', 'entire', 'all', 'including', 'plus']
-            if any(word in message_lower for word in total_cost_indicators) and any(word in message_lower for word in ['budget', 'cost', 'tuition']):
-                import re
-                
+        if has_digit and not student_profile.get('college_scorecard_COSTT4_A'):
+            if TOTAL_COST_INDICATORS_RE.search(message_lower) and COST_TERMS_RE.search(message_lower):
                 # Look for total cost amounts
-                total_patterns = [
-                    r'total[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "total: $50,000"
-                    r'total\s+budget[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "total budget $30,000"
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*total',  # "50000 total"
-                    r'including[:\s]*\$?(\d+(?:,\d{3})*(?:\.\d{2})?)',  # "including $50,000"
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*all\s+included',  # "50000 all included"
-                ]
-                
-                for pattern in total_patterns:
-                    total_match = re.search(pattern, message_lower)
+                for pattern in TOTAL_PATTERNS:
+                    total_match = pattern.search(message_lower)
                     if total_match:
                         try:
                             total_str = total_match.group(1).replace(',', '')
-                            total_budget = int(float(total_str))
+                            total_budget = int(total_str) if '.' not in total_str else int(float(total_str))
                             
                             # Validate reasonable total cost range
                             if 10000 <= total_budget <= 150000:
                                 student_profile['total_budget'] = total_budget
                                 student_profile['college_scorecard_COSTT4_A'] = self.map_total_budget_to_cost(total_budget)
-                                logger.info(f"Parsed total budget: ${total_budget} → COSTT4_A: {student_profile['college_scorecard_COSTT4_A']}")
+                                logger.info("Parsed total budget: $%s → COSTT4_A: %s", total_budget, student_profile['college_scorecard_COSTT4_A'])
                                 
                                 # Apply intelligent inference for related answers
                                 self.infer_related_answers(message, student_profile, 'COSTT4_A', student_profile['college_scorecard_COSTT4_A'])
@@ -589,104 +1140,25 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
                         except (ValueError, TypeError):
                             continue
         
-        # ===== FINANCIAL AID PARSING FOR NPT4_PUB =====
-        if not student_profile.get('financial_aid_eligible'):
-            aid_indicators = ['financial aid', 'aid', 'scholarship', 'grant', 'help', 'assistance', 'support']
-            if any(word in message_lower for word in aid_indicators):
-                # Intelligent financial aid mapping
-                aid_mapping = {
-                    'yes': ['yes', 'qualify', 'eligible', 'need', 'require', 'apply', 'get', 'receive'],
-                    'no': ['no', 'not', "don't", 'doesn\'t', 'ineligible', 'disqualify']
-                }
-                
-                for standardized_eligibility, variations in aid_mapping.items():
-                    if any(word in message_lower for word in variations):
-                        student_profile['financial_aid_eligible'] = standardized_eligibility
-                        # Map to standardized NPT4_PUB values
-                        if standardized_eligibility == 'yes':
-                            student_profile['college_scorecard_NPT4_PUB'] = 10000  # Lower net price with aid
-                        else:
-                            student_profile['college_scorecard_NPT4_PUB'] = 20000  # Higher net price without aid
-                        logger.info(f"Parsed financial aid: {standardized_eligibility} → NPT4_PUB: {student_profile['college_scorecard_NPT4_PUB']}")
-                        break
-        
-        # ===== PRIVATE INSTITUTION PREFERENCE PARSING FOR NPT4_PRIV =====
-        if not student_profile.get('prefer_private'):
-            private_indicators = ['private', 'public', 'institution', 'university', 'college', 'school']
-            if any(word in message_lower for word in private_indicators):
-                # Intelligent institution preference mapping
-                institution_mapping = {
-                    'yes': ['private', 'prefer', 'interested', 'consider', 'like', 'want'],
-                    'no': ['public', 'state', 'government', 'prefer', 'interested']
-                }
-                
-                for standardized_preference, variations in institution_mapping.items():
-                    if any(word in message_lower for word in variations):
-                        student_profile['prefer_private'] = standardized_preference
-                        # Map to standardized NPT4_PRIV values
-                        if standardized_preference == 'yes':
-                            student_profile['college_scorecard_NPT4_PRIV'] = 30000  # Higher private net price
-                        else:
-                            student_profile['college_scorecard_NPT4_PRIV'] = 20000  # Lower public net price
-                        logger.info(f"Parsed institution preference: {standardized_preference} → NPT4_PRIV: {student_profile['college_scorecard_NPT4_PRIV']}")
-                        break
-        
-        # ===== CLASS SIZE PREFERENCE PARSING FOR UGDS =====
-        if not student_profile.get('preferred_class_size'):
-            class_size_indicators = ['class size', 'class', 'size', 'crowd', 'intimate', 'personal', 'large', 'small']
-            if any(word in message_lower for word in class_size_indicators):
-                # Intelligent class size mapping
-                class_size_mapping = {
-                    'small': ['small', 'intimate', 'personal', 'individual', 'close', 'tight'],
-                    'large': ['large', 'crowded', 'big', 'huge', 'massive', 'many', 'lot'],
-                    'medium': ['medium', 'moderate', 'average', 'decent', 'reasonable']
-                }
-                
-                for standardized_size, variations in class_size_mapping.items():
-                    if any(word in message_lower for word in variations):
-                        student_profile['preferred_class_size'] = standardized_size
-                        # Map to standardized UGDS values
-                        if standardized_size == 'small':
-                            student_profile['college_scorecard_UGDS'] = 2000  # Small enrollment
-                        elif standardized_size == 'large':
-                            student_profile['college_scorecard_UGDS'] = 15000  # Large enrollment
-                        else:
-                            student_profile['college_scorecard_UGDS'] = 5000  # Medium enrollment
-                        logger.info(f"Parsed class size: {standardized_size} → UGDS: {student_profile['college_scorecard_UGDS']}")
+        # ===== PREFERENCE PARSING FOR NPT4_PUB, NPT4_PRIV, UGDS =====
+        for field, indicators, choices, variable, values, label in PREFERENCE_PARSERS:
+            if not student_profile.get(field) and indicators.search(message_lower):
+                # Intelligent mapping to standardized values
+                for standardized_value, variations in choices:
+                    if variations.search(message_lower):
+                        student_profile[field] = standardized_value
+                        student_profile[f'college_scorecard_{variable}'] = values[standardized_value]
+                        logger.info("Parsed %s: %s → %s: %s", label, standardized_value, variable, values[standardized_value])
                         break
         
         # ===== ACADEMIC INTERESTS PARSING =====
-        # Comprehensive list of academic fields with intelligent mapping to standardized values
-        academic_fields_mapping = {
-            'business': ['business', 'commerce', 'management', 'administration', 'entrepreneur'],
-            'engineering': ['engineering', 'engineer', 'technical', 'mechanical', 'electrical', 'civil'],
-            'arts': ['arts', 'art', 'creative', 'design', 'visual', 'fine', 'performing'],
-            'sciences': ['science', 'scientific', 'biology', 'chemistry', 'physics', 'natural'],
-            'computing': ['computing', 'computer', 'software', 'programming', 'coding', 'it', 'information'],
-            'technology': ['technology', 'tech', 'digital', 'innovation', 'ai', 'artificial'],
-            'design': ['design', 'graphic', 'web', 'ui', 'ux', 'visual'],
-            'hospitality': ['hospitality', 'hotel', 'tourism', 'travel', 'service', 'guest'],
-            'tourism': ['tourism', 'travel', 'hospitality', 'hotel', 'tourism'],
-            'finance': ['finance', 'financial', 'banking', 'investment', 'accounting', 'economics'],
-            'marketing': ['marketing', 'advertising', 'promotion', 'brand', 'sales'],
-            'management': ['management', 'leadership', 'administration', 'strategy', 'project'],
-            'medicine': ['medicine', 'medical', 'health', 'healthcare', 'nursing', 'pharmacy'],
-            'law': ['law', 'legal', 'justice', 'criminal', 'civil'],
-            'education': ['education', 'teaching', 'pedagogy', 'learning', 'academic'],
-            'psychology': ['psychology', 'psych', 'mental', 'behavior', 'counseling'],
-            'communications': ['communications', 'communication', 'media', 'journalism', 'public'],
-            'environmental': ['environmental', 'environment', 'sustainability', 'green', 'ecology'],
-            'mathematics': ['mathematics', 'math', 'statistics', 'data', 'analytics'],
-            'languages': ['language', 'linguistics', 'translation', 'interpretation', 'foreign']
-        }
-        
-        for standardized_field, variations in academic_fields_mapping.items():
-            if any(variation in message_lower for variation in variations):
+        for standardized_field, variations in ACADEMIC_FIELDS:
+            if variations.search(message_lower):
                 if 'academic_interests' not in student_profile:
                     student_profile['academic_interests'] = []
                 if standardized_field not in student_profile['academic_interests']:
                     student_profile['academic_interests'].append(standardized_field)
-                    logger.info(f"Parsed academic interest: {standardized_field}")
+                    logger.info("Parsed academic interest: %s", standardized_field)
         
         # ===== SET DEFAULT VALUES FOR MISSING VARIABLES =====
         # These defaults match the historical dataset patterns
@@ -697,9 +1169,8 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
         
         # ===== ADDITIONAL PROFILE ENHANCEMENTS =====
         # Parse first-generation status
-        first_gen_indicators = ['first generation', 'first-gen', 'firstgen', 'parents', 'family', 'college']
-        if any(word in message_lower for word in first_gen_indicators):
-            if any(word in message_lower for word in ['first', 'none', 'never', 'didn\'t', 'didnt']):
+        if FIRST_GEN_INDICATORS_RE.search(message_lower):
+            if FIRST_GEN_YES_RE.search(message_lower):
                 student_profile['first_generation'] = True
                 logger.info("Parsed first-generation status: yes")
             else:
@@ -707,538 +1178,371 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
                 logger.info("Parsed first-generation status: no")
         
         # Parse work experience
-        work_indicators = ['work', 'job', 'employment', 'experience', 'career', 'professional']
-        if any(word in message_lower for word in work_indicators):
-            if any(word in message_lower for word in ['yes', 'have', 'worked', 'experience', 'employed']):
+        if WORK_INDICATORS_RE.search(message_lower):
+            if WORK_YES_RE.search(message_lower):
                 student_profile['work_experience'] = True
                 logger.info("Parsed work experience: yes")
-            elif any(word in message_lower for word in ['no', 'not', 'never', 'none']):
+            elif WORK_NO_RE.search(message_lower):
                 student_profile['work_experience'] = False
                 logger.info("Parsed work experience: no")
         
         # Parse extracurricular activities
-        extracurricular_indicators = ['extracurricular', 'activity', 'club', 'sport', 'volunteer', 'hobby']
-        if any(word in message_lower for word in extracurricular_indicators):
+        if EXTRACURRICULAR_INDICATORS_RE.search(message_lower):
             if 'extracurriculars' not in student_profile:
                 student_profile['extracurriculars'] = []
             
-            # Common extracurricular activities
-            activities = ['sports', 'music', 'drama', 'debate', 'robotics', 'volunteer', 'leadership', 'art', 'dance']
-            for activity in activities:
-                if activity in message_lower and activity not in student_profile['extracurriculars']:
+            # Common extracurricular activities, recorded in EXTRACURRICULAR_ACTIVITIES order
+            mentioned = set(EXTRACURRICULAR_ACTIVITIES_RE.findall(message_lower))
+            for activity in EXTRACURRICULAR_ACTIVITIES:
+                if activity in mentioned and activity not in student_profile['extracurriculars']:
                     student_profile['extracurriculars'].append(activity)
-                    logger.info(f"Parsed extracurricular activity: {activity}")
+                    logger.info("Parsed extracurricular activity: %s", activity)
         
         # Log final profile state with mapping information
-        logger.info(f"Final profile state: GPA={student_profile.get('gpa')}, Income={student_profile.get('family_income_level')}, Interests={student_profile.get('academic_interests')}, Study Mode={student_profile.get('fulltime_study')}, International={student_profile.get('international_student')}")
-        logger.info(f"College Scorecard variables: ADM_RATE={student_profile.get('college_scorecard_ADM_RATE')}, PCTPELL={student_profile.get('college_scorecard_PCTPELL')}, C150_4={student_profile.get('college_scorecard_C150_4')}, RET_FT4={student_profile.get('college_scorecard_RET_FT4')}")
-        
-        # Log what was parsed in this call
-        logger.info(f"=== PARSED INFORMATION FROM MESSAGE ===")
-        logger.info(f"Message: '{message}'")
-        logger.info(f"Updated profile fields: {list(student_profile.keys())}")
-        logger.info(f"Profile after parsing: {student_profile}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Final profile state: GPA=%s, Income=%s, Interests=%s, Study Mode=%s, International=%s", student_profile.get('gpa'), student_profile.get('family_income_level'), student_profile.get('academic_interests'), student_profile.get('fulltime_study'), student_profile.get('international_student'))
+            logger.info("College Scorecard variables: ADM_RATE=%s, PCTPELL=%s, C150_4=%s, RET_FT4=%s", student_profile.get('college_scorecard_ADM_RATE'), student_profile.get('college_scorecard_PCTPELL'), student_profile.get('college_scorecard_C150_4'), student_profile.get('college_scorecard_RET_FT4'))
+            
+            # Log what was parsed in this call
+            logger.info("=== PARSED INFORMATION FROM MESSAGE ===")
+            logger.info("Message: '%s'", message)
+            logger.info("Updated profile fields: %s", list(student_profile.keys()))
+            logger.info("Profile after parsing: %s", student_profile)
     
-    def parse_grouped_response(self, message, student_profile):
-        """Parse responses that contain multiple answers for grouped questions"""
-        import re
-        message_lower = message.lower().strip()
-        
-        # Define patterns for different types of grouped responses
-        grouped_patterns = {
-            'academic_profile': {
-                'gpa_patterns': [
-                    r'gpa[:\s]*(\d+\.?\d*)',
-                    r'grade[:\s]*(\d+\.?\d*)',
-                    r'(\d+\.?\d*)\s*(?:gpa|grade)',
-                    r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)',  # GPA ranges
-                ],
-                'interests_patterns': [
-                    r'interest[:\s]*(business|engineering|computing|arts|hospitality|medicine)',
-                    r'(business|engineering|computing|arts|hospitality|medicine)',
-                ]
-            },
-            'study_preferences': {
-                'study_mode_patterns': [
-                    r'study[:\s]*(full|part|time)',
-                    r'(full|part)[\s-]*time',
-                    r'(fulltime|parttime)',
-                ],
-                'confidence_patterns': [
-                    r'confident[:\s]*(\d+)',
-                    r'confidence[:\s]*(\d+)',
-                    r'(\d+)\s*(?:out\s+of\s+10|scale)',
-                ],
-                'international_patterns': [
-                    r'(local|international|foreign)',
-                    r'(domestic|overseas)',
-                ]
-            },
-            'financial_profile': {
-                'title': 'Financial Profile',
-                'description': 'Let\'s understand your financial situation:',
-                'questions': [
-                    {
-                        'variable': 'PCTPELL',
-                        'question': 'What is your family income level?',
-                        'type': 'income',
-                        'options': [
-                            {'label': 'Low Income', 'value': 'low', 'mapped_value': 0.7},
-                            {'label': 'Medium Income', 'value': 'medium', 'mapped_value': 0.4},
-                            {'label': 'High Income', 'value': 'high', 'mapped_value': 0.2}
-                        ]
-                    },
-                    {
-                        'variable': 'TUITIONFEE_IN',
-                        'question': 'What is your budget for tuition per year?',
-                        'type': 'budget',
-                        'options': [
-                            {'label': '$10,000 - $20,000', 'value': '15000', 'mapped_value': 15000},
-                            {'label': '$20,000 - $30,000', 'value': '25000', 'mapped_value': 25000},
-                            {'label': '$30,000 - $40,000', 'value': '35000', 'mapped_value': 35000},
-                            {'label': '$40,000+', 'value': '45000', 'mapped_value': 45000}
-                        ]
-                    },
-                    {
-                        'variable': 'COSTT4_A',
-                        'question': 'What is your total budget including living expenses?',
-                        'type': 'total_budget',
-                        'options': [
-                            {'label': '$15,000 - $25,000', 'value': '20000', 'mapped_value': 20000},
-                            {'label': '$25,000 - $35,000', 'value': '30000', 'mapped_value': 30000},
-                            {'label': '$35,000 - $45,000', 'value': '40000', 'mapped_value': 40000},
-                            {'label': '$45,000+', 'value': '50000', 'mapped_value': 50000}
-                        ]
-                    },
-                    {
-                        'variable': 'NPT4_PUB',
-                        'question': 'Do you expect to receive financial aid?',
-                        'type': 'financial_aid',
-                        'options': [
-                            {'label': 'Yes, I expect significant aid', 'value': 'high_aid', 'mapped_value': 10000},
-                            {'label': 'Some aid, but limited', 'value': 'medium_aid', 'mapped_value': 15000},
-                            {'label': 'No, I will pay full price', 'value': 'no_aid', 'mapped_value': 20000}
-                        ]
-                    },
-                    {
-                        'variable': 'NPT4_PRIV',
-                        'question': 'What type of institution do you prefer?',
-                        'type': 'institution_type',
-                        'options': [
-                            {'label': 'Public University', 'value': 'public', 'mapped_value': 20000},
-                            {'label': 'Private University', 'value': 'private', 'mapped_value': 30000}
-                        ]
-                    }
-                ]
-            },
-            'campus_preferences': {
-                'title': 'Campus Preferences',
-                'description': 'Tell us about your campus preferences:',
-                'questions': [
-                    {
-                        'variable': 'UGDS',
-                        'question': 'What class size do you prefer?',
-                        'type': 'class_size',
-                        'options': [
-                            {'label': 'Small Classes (< 30 students)', 'value': 'small', 'mapped_value': 2000},
-                            {'label': 'Medium Classes (30-100 students)', 'value': 'medium', 'mapped_value': 5000},
-                            {'label': 'Large Classes (> 100 students)', 'value': 'large', 'mapped_value': 15000}
-                        ]
-                    }
-                ]
-            }
-        }
+    def get_asked_question_group(self, student_id):
+        """Variables of the question group last asked of this student, or None"""
+        if student_id in self._pending_question_groups:
+            return self._pending_question_groups[student_id]
+        return recruitment_service.students.get(student_id, {}).get('asked_question_group')
+    
+    def parse_grouped_selection(self, message, student_profile, asked_variables):
+        """
+        Map numeric answers ("1, 3, 2") positionally onto the last asked question group.
+        Returns the asked variables left unanswered (missing or out-of-range picks),
+        or None if the message isn't a group answer.
+        """
+        selections = [int(number) for number in CONF_NUM_RE.findall(message)]
+        
+        # A lone number only answers a group of one; otherwise it's a regular preset selection
+        if len(selections) == 1 and len(asked_variables) != 1:
+            return None
+        
+        unanswered = []
+        for variable, selection_number in zip(asked_variables, selections):
+            question = QUESTIONS_BY_VARIABLE.get(variable)
+            if question and 1 <= selection_number <= len(question['options']):
+                selected_option = question['options'][selection_number - 1]
+                self.map_preset_selection_to_profile(selected_option, question['type'], student_profile)
+                logger.info("Parsed grouped selection: %s = %s → %s", variable, selection_number, selected_option['label'])
+            else:
+                unanswered.append(variable)
+                logger.warning("Ignored grouped selection: %s = %s is not a valid option", variable, selection_number)
         
-        # Parse each group
-        for group_name, patterns in grouped_patterns.items():
-            if group_name == 'academic_profile':
-                # Parse GPA
-                for pattern in patterns['gpa_patterns']:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('gpa'):
-                        if len(match.groups()) == 2:  # GPA range
-                            gpa = float(match.group(1))
-                            student_profile['gpa'] = gpa
-                            student_profile['college_scorecard_ADM_RATE'] = self.map_gpa_to_admission_rate(gpa)
-                            logger.info(f"Parsed grouped GPA: {gpa}")
-                            
-                            # Apply intelligent inference for related answers
-                            self.infer_related_answers(message, student_profile, 'ADM_RATE', student_profile['college_scorecard_ADM_RATE'])
-                            break
-                        elif len(match.groups()) == 1:  # Single GPA
-                            gpa = float(match.group(1))
-                            student_profile['gpa'] = gpa
-                            student_profile['college_scorecard_ADM_RATE'] = self.map_gpa_to_admission_rate(gpa)
-                            logger.info(f"Parsed grouped GPA: {gpa}")
-                            
-                            # Apply intelligent inference for related answers
-                            self.infer_related_answers(message, student_profile, 'ADM_RATE', student_profile['college_scorecard_ADM_RATE'])
-                            break
-                
-                # Parse academic interests
-                for pattern in patterns['interests_patterns']:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('academic_interests'):
-                        interest = match.group(1)
-                        student_profile['academic_interests'] = [interest]
-                        logger.info(f"Parsed grouped interest: {interest}")
-                        break
-            
-            elif group_name == 'study_preferences':
-                # Parse study mode
-                for pattern in patterns['study_mode_patterns']:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('fulltime_study'):
-                        mode = match.group(1)
-                        if 'full' in mode:
-                            student_profile['fulltime_study'] = 'yes'
-                            student_profile['college_scorecard_RET_FT4'] = 0.8
-                        else:
-                            student_profile['fulltime_study'] = 'no'
-                            student_profile['college_scorecard_RET_FT4'] = 0.6
-                        logger.info(f"Parsed grouped study mode: {mode}")
-                        
+        # Questions past the last number given are still open too
+        unanswered.extend(asked_variables[len(selections):])
+        return unanswered
+    
+    def parse_grouped_response(self, message, student_profile, message_lower=None, has_digit=None):
+        """Parse responses that contain multiple answers for grouped questions"""
+        # parse_student_response passes its already lower-cased message along
+        if message_lower is None:
+            message_lower = message.lower().strip()
+        if has_digit is None:
+            has_digit = DIGIT_RE.search(message_lower) is not None
+        
+        # Parse GPA
+        if has_digit:
+            for pattern in GROUPED_GPA_PATTERNS:
+                match = pattern.search(message_lower)
+                if match and not student_profile.get('gpa'):
+                    if len(match.groups()) == 2:  # GPA range
+                        gpa = float(match.group(1))
+                        student_profile['gpa'] = gpa
+                        student_profile['college_scorecard_ADM_RATE'] = self.map_gpa_to_admission_rate(gpa)
+                        logger.info("Parsed grouped GPA: %s", gpa)
+                    
                         # Apply intelligent inference for related answers
-                        self.infer_related_answers(message, student_profile, 'RET_FT4', student_profile['college_scorecard_RET_FT4'])
+                        self.infer_related_answers(message, student_profile, 'ADM_RATE', student_profile['college_scorecard_ADM_RATE'])
                         break
-                
-                # Parse confidence
-                for pattern in patterns['confidence_patterns']:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('completion_confidence'):
-                        confidence = int(match.group(1))
-                        if 1 <= confidence <= 10:
-                            student_profile['completion_confidence'] = confidence
-                            student_profile['college_scorecard_C150_4'] = self.map_confidence_to_completion_rate(confidence)
-                            logger.info(f"Parsed grouped confidence: {confidence}")
-                            
-                            # Apply intelligent inference for related answers
-                            self.infer_related_answers(message, student_profile, 'C150_4', student_profile['college_scorecard_C150_4'])
-                            break
-                
-                # Parse international status
-                for pattern in patterns['international_patterns']:
-                    match = re.search(pattern, message_lower)
-                    if match and student_profile.get('international_student') is None:
-                        status = match.group(1)
-                        if status in ['international', 'foreign', 'overseas']:
-                            student_profile['international_student'] = True
-                            student_profile['college_scorecard_TUITIONFEE_OUT'] = 40000
-                        else:
-                            student_profile['international_student'] = False
-                            student_profile['college_scorecard_TUITIONFEE_OUT'] = 30000
-                        logger.info(f"Parsed grouped international status: {status}")
-                        
+                    elif len(match.groups()) == 1:  # Single GPA
+                        gpa = float(match.group(1))
+                        student_profile['gpa'] = gpa
+                        student_profile['college_scorecard_ADM_RATE'] = self.map_gpa_to_admission_rate(gpa)
+                        logger.info("Parsed grouped GPA: %s", gpa)
+                    
                         # Apply intelligent inference for related answers
-                        self.infer_related_answers(message, student_profile, 'TUITIONFEE_OUT', student_profile['college_scorecard_TUITIONFEE_OUT'])
+                        self.infer_related_answers(message, student_profile, 'ADM_RATE', student_profile['college_scorecard_ADM_RATE'])
                         break
-            
-            elif group_name == 'financial_profile':
-                # Parse income level
-                income_patterns = [
-                    r'income[:\s]*(low|medium|high)',
-                    r'(low|medium|high)\s*income',
-                ]
-                for pattern in income_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('family_income_level'):
-                        income = match.group(1)
-                        student_profile['family_income_level'] = income
-                        student_profile['college_scorecard_PCTPELL'] = self.map_income_to_pell_percentage(income)
-                        logger.info(f"Parsed grouped income: {income}")
-                        
+        
+        # Parse academic interests
+        for pattern in GROUPED_INTERESTS_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('academic_interests'):
+                interest = match.group(1)
+                student_profile['academic_interests'] = [interest]
+                logger.info("Parsed grouped interest: %s", interest)
+                break
+    
+        # Parse study mode
+        for pattern in GROUPED_STUDY_MODE_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('fulltime_study'):
+                mode = match.group(1)
+                if 'full' in mode:
+                    student_profile['fulltime_study'] = 'yes'
+                    student_profile['college_scorecard_RET_FT4'] = 0.8
+                else:
+                    student_profile['fulltime_study'] = 'no'
+                    student_profile['college_scorecard_RET_FT4'] = 0.6
+                logger.info("Parsed grouped study mode: %s", mode)
+                
+                # Apply intelligent inference for related answers
+                self.infer_related_answers(message, student_profile, 'RET_FT4', student_profile['college_scorecard_RET_FT4'])
+                break
+        
+        # Parse confidence
+        if has_digit:
+            for pattern in GROUPED_CONFIDENCE_PATTERNS:
+                match = pattern.search(message_lower)
+                if match and not student_profile.get('completion_confidence'):
+                    confidence = int(match.group(1))
+                    if 1 <= confidence <= 10:
+                        student_profile['completion_confidence'] = confidence
+                        student_profile['college_scorecard_C150_4'] = self.map_confidence_to_completion_rate(confidence)
+                        logger.info("Parsed grouped confidence: %s", confidence)
+                    
                         # Apply intelligent inference for related answers
-                        self.infer_related_answers(message, student_profile, 'PCTPELL', income)
+                        self.infer_related_answers(message, student_profile, 'C150_4', student_profile['college_scorecard_C150_4'])
                         break
+        
+        # Parse international status
+        for pattern in GROUPED_INTERNATIONAL_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and student_profile.get('international_student') is None:
+                status = match.group(1)
+                if status in ['international', 'foreign', 'overseas']:
+                    student_profile['international_student'] = True
+                    student_profile['college_scorecard_TUITIONFEE_OUT'] = INTL_TUITION
+                else:
+                    student_profile['international_student'] = False
+                    student_profile['college_scorecard_TUITIONFEE_OUT'] = DOMESTIC_TUITION
+                logger.info("Parsed grouped international status: %s", status)
                 
-                # Parse budget
-                budget_patterns = [
-                    r'budget[:\s]*\$?(\d+(?:,\d{3})*)',
-                    r'\$(\d+(?:,\d{3})*)',
-                    r'(\d+(?:,\d{3})*)\s*(?:dollar|k|thousand)',
-                ]
-                for pattern in budget_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('tuition_budget'):
-                        budget_str = match.group(1).replace(',', '')
-                        budget = int(budget_str)
-                        if 5000 <= budget <= 100000:
-                            student_profile['tuition_budget'] = budget
-                            student_profile['college_scorecard_TUITIONFEE_IN'] = self.map_budget_to_tuition(budget)
-                            logger.info(f"Parsed grouped budget: {budget}")
-                            
-                            # Apply intelligent inference for related answers
-                            self.infer_related_answers(message, student_profile, 'TUITIONFEE_IN', str(budget))
-                            break
-                
-                # Parse total budget (COSTT4_A)
-                total_budget_patterns = [
-                    r'total[:\s]*\$?(\d+(?:,\d{3})*)',
-                    r'cost[:\s]*\$?(\d+(?:,\d{3})*)',
-                    r'expenses[:\s]*\$?(\d+(?:,\d{3})*)',
-                ]
-                for pattern in total_budget_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('college_scorecard_COSTT4_A'):
-                        total_budget_str = match.group(1).replace(',', '')
-                        total_budget = int(total_budget_str)
-                        if 10000 <= total_budget <= 100000:
-                            student_profile['college_scorecard_COSTT4_A'] = self.map_total_budget_to_cost(total_budget)
-                            logger.info(f"Parsed grouped total budget: {total_budget}")
-                            
-                            # Apply intelligent inference for related answers
-                            self.infer_related_answers(message, student_profile, 'COSTT4_A', student_profile['college_scorecard_COSTT4_A'])
-                            break
-                
-                # Parse financial aid (NPT4_PUB)
-                financial_aid_patterns = [
-                    r'aid[:\s]*(yes|no|high|medium|low)',
-                    r'financial[:\s]*(aid|assistance)',
-                    r'(high|medium|low)\s*aid',
-                ]
-                for pattern in financial_aid_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('college_scorecard_NPT4_PUB'):
-                        aid_level = match.group(1)
-                        if aid_level in ['high', 'yes']:
-                            student_profile['college_scorecard_NPT4_PUB'] = 10000
-                        elif aid_level in ['medium']:
-                            student_profile['college_scorecard_NPT4_PUB'] = 15000
-                        else:
-                            student_profile['college_scorecard_NPT4_PUB'] = 20000
-                        logger.info(f"Parsed grouped financial aid: {aid_level}")
-                        break
+                # Apply intelligent inference for related answers
+                self.infer_related_answers(message, student_profile, 'TUITIONFEE_OUT', student_profile['college_scorecard_TUITIONFEE_OUT'])
+                break
+    
+        # Parse income level
+        for pattern in GROUPED_INCOME_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('family_income_level'):
+                income = match.group(1)
+                student_profile['family_income_level'] = income
+                student_profile['college_scorecard_PCTPELL'] = self.map_income_to_pell_percentage(income)
+                logger.info("Parsed grouped income: %s", income)
                 
-                # Parse institution type (NPT4_PRIV)
-                institution_patterns = [
-                    r'institution[:\s]*(public|private)',
-                    r'(public|private)\s*university',
-                    r'(public|private)\s*institution',
-                ]
-                for pattern in institution_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('college_scorecard_NPT4_PRIV'):
-                        inst_type = match.group(1)
-                        if inst_type == 'private':
-                            student_profile['college_scorecard_NPT4_PRIV'] = 30000
-                        else:
-                            student_profile['college_scorecard_NPT4_PRIV'] = 20000
-                        logger.info(f"Parsed grouped institution type: {inst_type}")
+                # Apply intelligent inference for related answers
+                self.infer_related_answers(message, student_profile, 'PCTPELL', income)
+                break
+        
+        # Parse budget
+        if has_digit:
+            for pattern in GROUPED_BUDGET_PATTERNS:
+                match = pattern.search(message_lower)
+                if match and not student_profile.get('tuition_budget'):
+                    budget_str = match.group(1).replace(',', '')
+                    budget = int(budget_str)
+                    if 5000 <= budget <= 100000:
+                        student_profile['tuition_budget'] = budget
+                        student_profile['college_scorecard_TUITIONFEE_IN'] = self.map_budget_to_tuition(budget)
+                        logger.info("Parsed grouped budget: %s", budget)
+                    
+                        # Apply intelligent inference for related answers
+                        self.infer_related_answers(message, student_profile, 'TUITIONFEE_IN', str(budget))
                         break
-            
-            elif group_name == 'campus_preferences':
-                # Parse class size preference
-                class_size_patterns = [
-                    r'class[:\s]*(small|medium|large)',
-                    r'(small|medium|large)\s*class',
-                    r'(small|medium|large)\s*classes',
-                    r'(\d+)\s*students?',
-                ]
-                for pattern in class_size_patterns:
-                    match = re.search(pattern, message_lower)
-                    if match and not student_profile.get('preferred_class_size'):
-                        size = match.group(1)
-                        student_profile['preferred_class_size'] = size
-                        student_profile['college_scorecard_UGDS'] = self.map_class_size_to_enrollment(size)
-                        logger.info(f"Parsed grouped class size: {size}")
+        
+        # Parse total budget (COSTT4_A)
+        if has_digit:
+            for pattern in GROUPED_TOTAL_BUDGET_PATTERNS:
+                match = pattern.search(message_lower)
+                if match and not student_profile.get('college_scorecard_COSTT4_A'):
+                    total_budget_str = match.group(1).replace(',', '')
+                    total_budget = int(total_budget_str)
+                    if 10000 <= total_budget <= 100000:
+                        student_profile['college_scorecard_COSTT4_A'] = self.map_total_budget_to_cost(total_budget)
+                        logger.info("Parsed grouped total budget: %s", total_budget)
+                    
+                        # Apply intelligent inference for related answers
+                        self.infer_related_answers(message, student_profile, 'COSTT4_A', student_profile['college_scorecard_COSTT4_A'])
                         break
+        
+        # Parse financial aid (NPT4_PUB)
+        for pattern in GROUPED_FINANCIAL_AID_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('college_scorecard_NPT4_PUB'):
+                aid_level = match.group(1)
+                if aid_level in ['high', 'yes']:
+                    student_profile['college_scorecard_NPT4_PUB'] = 10000
+                elif aid_level in ['medium']:
+                    student_profile['college_scorecard_NPT4_PUB'] = 15000
+                else:
+                    student_profile['college_scorecard_NPT4_PUB'] = 20000
+                logger.info("Parsed grouped financial aid: %s", aid_level)
+                break
+        
+        # Parse institution type (NPT4_PRIV)
+        for pattern in GROUPED_INSTITUTION_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('college_scorecard_NPT4_PRIV'):
+                inst_type = match.group(1)
+                if inst_type == 'private':
+                    student_profile['college_scorecard_NPT4_PRIV'] = 30000
+                else:
+                    student_profile['college_scorecard_NPT4_PRIV'] = 20000
+                logger.info("Parsed grouped institution type: %s", inst_type)
+                break
+    
+        # Parse class size preference
+        for pattern in GROUPED_CLASS_SIZE_PATTERNS:
+            match = pattern.search(message_lower)
+            if match and not student_profile.get('preferred_class_size'):
+                size = match.group(1)
+                student_profile['preferred_class_size'] = size
+                student_profile['college_scorecard_UGDS'] = self.map_class_size_to_enrollment(size)
+                logger.info("Parsed grouped class size: %s", size)
+                break
     
     def get_missing_college_scorecard_data(self, student_profile):
         """Get missing College Scorecard variables"""
-        required_variables = [
-            'ADM_RATE', 'PCTPELL', 'C150_4', 'RET_FT4',
-            'TUITIONFEE_IN', 'TUITIONFEE_OUT', 'COSTT4_A',
-            'NPT4_PUB', 'NPT4_PRIV', 'UGDS'
-        ]
-        
-        missing = []
-        for var in required_variables:
-            if not student_profile.get(f'college_scorecard_{var}'):
-                missing.append(var)
-        
-        return missing
+        return [var for var, key in zip(SCORECARD_VARIABLES, SCORECARD_KEYS) if not student_profile.get(key)]
     
     def get_next_college_scorecard_question(self, missing_variables, student_profile):
         """Get grouped questions to ask based on missing variables"""
+        # Narrow the missing variables to those whose answer field is still unset
+        still_missing = {
+            variable for variable in missing_variables
+            if variable not in ANSWER_FIELDS or student_profile.get(ANSWER_FIELDS[variable]) in (None, 'unknown')
+        }
         
-        # Define consolidated grouped questions with preset options - 3 smaller groups
-        grouped_questions = {
-            'academic_basics': {
-                'title': 'Academic Basics',
-                'description': 'Quick academic info:',
-                'questions': [
-                    {
-                        'variable': 'ADM_RATE',
-                        'question': 'Your GPA?',
-                        'type': 'gpa',
-                        'options': [
-                            {'label': '3.0-3.2', 'value': '3.1', 'mapped_value': 0.7},
-                            {'label': '3.3-3.5', 'value': '3.4', 'mapped_value': 0.8},
-                            {'label': '3.6-3.8', 'value': '3.7', 'mapped_value': 0.9},
-                            {'label': '3.9-4.0', 'value': '3.95', 'mapped_value': 0.95}
-                        ]
-                    },
-                    {
-                        'variable': 'academic_interests',
-                        'question': 'Main interest?',
-                        'type': 'academic_interests',
-                        'options': [
-                            {'label': 'Business', 'value': 'business', 'mapped_value': 'business'},
-                            {'label': 'Engineering', 'value': 'engineering', 'mapped_value': 'engineering'},
-                            {'label': 'Computing', 'value': 'computing', 'mapped_value': 'computing'},
-                            {'label': 'Arts', 'value': 'arts', 'mapped_value': 'arts'},
-                            {'label': 'Hospitality', 'value': 'hospitality', 'mapped_value': 'hospitality'},
-                            {'label': 'Medicine', 'value': 'medicine', 'mapped_value': 'medicine'}
-                        ]
-                    },
-                    {
-                        'variable': 'TUITIONFEE_OUT',
-                        'question': 'International student?',
-                        'type': 'international',
-                        'options': [
-                            {'label': 'Local', 'value': 'no', 'mapped_value': 30000},
-                            {'label': 'International', 'value': 'yes', 'mapped_value': 40000}
-                        ]
-                    }
-                ]
-            },
-            'study_preferences': {
-                'title': 'Study Preferences',
-                'description': 'Study mode & confidence:',
-                'questions': [
-                    {
-                        'variable': 'RET_FT4',
-                        'question': 'Study mode?',
-                        'type': 'study_mode',
-                        'options': [
-                            {'label': 'Full-time', 'value': 'yes', 'mapped_value': 0.8},
-                            {'label': 'Part-time', 'value': 'no', 'mapped_value': 0.6}
-                        ]
-                    },
-                    {
-                        'variable': 'C150_4',
-                        'question': 'Completion confidence?',
-                        'type': 'confidence',
-                        'options': [
-                            {'label': 'Low (1-3)', 'value': '2', 'mapped_value': 0.5},
-                            {'label': 'Medium (4-6)', 'value': '5', 'mapped_value': 0.6},
-                            {'label': 'High (7-8)', 'value': '7.5', 'mapped_value': 0.7},
-                            {'label': 'Very High (9-10)', 'value': '9.5', 'mapped_value': 0.8}
-                        ]
-                    },
-                    {
-                        'variable': 'UGDS',
-                        'question': 'Class size preference?',
-                        'type': 'class_size',
-                        'options': [
-                            {'label': 'Small (<30)', 'value': 'small', 'mapped_value': 2000},
-                            {'label': 'Medium (30-100)', 'value': 'medium', 'mapped_value': 5000},
-                            {'label': 'Large (>100)', 'value': 'large', 'mapped_value': 15000}
-                        ]
-                    }
-                ]
-            },
-            'financial_profile': {
-                'title': 'Financial Profile',
-                'description': 'Budget & financial aid:',
-                'questions': [
-                    {
-                        'variable': 'PCTPELL',
-                        'question': 'Family income?',
-                        'type': 'income',
-                        'options': [
-                            {'label': 'Low', 'value': 'low', 'mapped_value': 0.7},
-                            {'label': 'Medium', 'value': 'medium', 'mapped_value': 0.4},
-                            {'label': 'High', 'value': 'high', 'mapped_value': 0.2}
-                        ]
-                    },
-                    {
-                        'variable': 'TUITIONFEE_IN',
-                        'question': 'Tuition budget/year?',
-                        'type': 'budget',
-                        'options': [
-                            {'label': '$10K-20K', 'value': '15000', 'mapped_value': 15000},
-                            {'label': '$20K-30K', 'value': '25000', 'mapped_value': 25000},
-                            {'label': '$30K-40K', 'value': '35000', 'mapped_value': 35000},
-                            {'label': '$40K+', 'value': '45000', 'mapped_value': 45000}
-                        ]
-                    },
-                    {
-                        'variable': 'COSTT4_A',
-                        'question': 'Total budget (inc. living)?',
-                        'type': 'total_budget',
-                        'options': [
-                            {'label': '$15K-25K', 'value': '20000', 'mapped_value': 20000},
-                            {'label': '$25K-35K', 'value': '30000', 'mapped_value': 30000},
-                            {'label': '$35K-45K', 'value': '40000', 'mapped_value': 40000},
-                            {'label': '$45K+', 'value': '50000', 'mapped_value': 50000}
-                        ]
-                    },
-                    {
-                        'variable': 'NPT4_PUB',
-                        'question': 'Financial aid expectation?',
-                        'type': 'financial_aid',
-                        'options': [
-                            {'label': 'High aid needed', 'value': 'high_aid', 'mapped_value': 10000},
-                            {'label': 'Some aid', 'value': 'medium_aid', 'mapped_value': 15000},
-                            {'label': 'No aid needed', 'value': 'no_aid', 'mapped_value': 20000}
-                        ]
-                    },
-                    {
-                        'variable': 'NPT4_PRIV',
-                        'question': 'Institution type?',
-                        'type': 'institution_type',
-                        'options': [
-                            {'label': 'Public', 'value': 'public', 'mapped_value': 20000},
-                            {'label': 'Private', 'value': 'private', 'mapped_value': 30000}
-                        ]
-                    }
-                ]
+        # Pack missing questions from consecutive groups so one Claude call covers several variables
+        group_keys = []
+        group_questions = []
+        for group_key, group_data in GROUPED_QUESTIONS.items():
+            missing_in_group = [
+                question_data for question_data in group_data['questions']
+                if question_data['variable'] in still_missing
+            ]
+            if missing_in_group:
+                group_keys.append(group_key)
+                group_questions.extend(missing_in_group)
+            if len(group_questions) >= MAX_GROUPED_QUESTIONS:
+                break
+        
+        if group_questions:
+            # Return the grouped question format
+            first_group = GROUPED_QUESTIONS[group_keys[0]]
+            return {
+                'type': 'grouped',
+                'group_key': group_keys[0],
+                'title': ' & '.join(GROUPED_QUESTIONS[key]['title'] for key in group_keys),
+                'description': first_group['description'] if len(group_keys) == 1 else 'A few quick questions:',
+                'questions': group_questions[:MAX_GROUPED_QUESTIONS]
             }
-        }
         
-        # Check what information is already available
-        available_info = {
-            'ADM_RATE': student_profile.get('gpa') is not None,
-            'PCTPELL': student_profile.get('family_income_level') not in [None, 'unknown'],
-            'C150_4': student_profile.get('completion_confidence') is not None,
-            'RET_FT4': student_profile.get('fulltime_study') is not None,
-            'TUITIONFEE_IN': student_profile.get('tuition_budget') is not None,
-            'TUITIONFEE_OUT': student_profile.get('international_student') is not None,
-            'COSTT4_A': student_profile.get('college_scorecard_COSTT4_A') is not None,
-            'NPT4_PUB': student_profile.get('college_scorecard_NPT4_PUB') is not None,
-            'NPT4_PRIV': student_profile.get('college_scorecard_NPT4_PRIV') is not None,
-            'UGDS': student_profile.get('preferred_class_size') is not None,
-            'academic_interests': student_profile.get('academic_interests') is not None
+        # Nothing left to group - fall back to a single open question (error recovery only)
+        logger.info("All required information collected, moving to recommendation phase")
+        return "What are your main academic interests?"
+    
+    def generate_program_recommendations(self, message, student_profile, conversation_history, on_text=None):
+        """Generate program recommendations using ML predictions"""
+        messages, prediction = self._build_recommendation_messages(message, student_profile, conversation_history)
+        
+        # Call Claude API
+        ai_response = self._create_message(messages, 1000, on_text)
+        
+        # Enhance response with prediction insights
+        enhanced_response = self.enhance_response_with_prediction(ai_response, prediction)
+        if on_text is not None and len(enhanced_response) > len(ai_response):
+            # Enhancements are appended, so stream just the added text
+            on_text(enhanced_response[len(ai_response):])
+        
+        return {
+            'response': enhanced_response,
+            'prediction': prediction,
+            'confidence': prediction['confidence'] if prediction else 'low'
         }
+    
+    def generate_recommendations_batch(self, batch_requests, poll_interval=30, timeout=3600):
+        """
+        Generate program recommendations for many students through the Message Batches API.
+        Meant for non-interactive work such as re-scoring stored profiles after a retrain:
+        batched requests cost half as much and share one submission round-trip.
+        Each request is a dict with 'student_id', 'message' and optional 'conversation_history'.
+        Returns {student_id: result} in the same format as generate_program_recommendations.
+        If the batch hasn't ended within timeout seconds it is cancelled and TimeoutError is raised.
+        """
+        if not self.client:
+            logger.error("Claude client not initialized; cannot submit recommendation batch")
+            return {}
         
-        # Find the first group that has missing information
-        for group_key, group_data in grouped_questions.items():
-            missing_in_group = False
-            group_questions = []
-            
-            for question_data in group_data['questions']:
-                variable = question_data['variable']
-                if variable in missing_variables and not available_info.get(variable, False):
-                    missing_in_group = True
-                    group_questions.append(question_data)
+        pending = {}
+        batch_items = []
+        for index, request in enumerate(batch_requests):
+            student_id = request['student_id']
+            student_data = recruitment_service.students.get(student_id, {}).get('data', {})
+            student_profile = self.create_student_profile(student_data)
+            messages, prediction = self._build_recommendation_messages(
+                request.get('message') or "Which programs would you recommend for me?",
+                student_profile,
+                request.get('conversation_history')
+            )
             
-            if missing_in_group:
-                # Return the grouped question format
-                return {
-                    'type': 'grouped',
-                    'group_key': group_key,
-                    'title': group_data['title'],
-                    'description': group_data['description'],
-                    'questions': group_questions
+            # custom_id only allows [a-zA-Z0-9_-], so map back to the student by position
+            custom_id = f"student-{index}"
+            pending[custom_id] = (student_id, prediction)
+            batch_items.append({
+                'custom_id': custom_id,
+                'params': {
+                    'model': CLAUDE_MODEL,
+                    'max_tokens': 1000,
+                    'messages': messages,
+                    'temperature': 0.7
                 }
+            })
         
-        # If all variables are collected, move to recommendation phase
-        logger.info("All required information collected, moving to recommendation phase")
-        return "What are your main academic interests?"
+        if not batch_items:
+            return {}
+        
+        batch = self.client.messages.batches.create(requests=batch_items)
+        logger.info("Submitted recommendation batch %s for %s students", batch.id, len(batch_items))
+        
+        deadline = time.monotonic() + timeout
+        while self.client.messages.batches.retrieve(batch.id).processing_status != 'ended':
+            if time.monotonic() >= deadline:
+                self.client.messages.batches.cancel(batch.id)
+                logger.error("Recommendation batch %s did not finish within %ss; cancelled", batch.id, timeout)
+                raise TimeoutError(f"Recommendation batch {batch.id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+        
+        results = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            student_id, prediction = pending[entry.custom_id]
+            if entry.result.type != 'succeeded':
+                logger.error("Batch recommendation for student %s %s", student_id, entry.result.type)
+                continue
+            
+            ai_response = entry.result.message.content[0].text
+            results[student_id] = {
+                'response': self.enhance_response_with_prediction(ai_response, prediction),
+                'prediction': prediction,
+                'confidence': prediction['confidence'] if prediction else 'low'
+            }
+        
+        logger.info("Recommendation batch %s finished: %s/%s succeeded", batch.id, len(results), len(batch_items))
+        return results
     
-    def generate_program_recommendations(self, message, student_profile, conversation_history):
-        """Generate program recommendations using ML predictions"""
+    def _build_recommendation_messages(self, message, student_profile, conversation_history):
+        """Run the ML prediction and build the Claude messages for program recommendations"""
         # Extract features for ML prediction
         student_features = self.extract_student_features(message, student_profile)
         
@@ -1254,30 +1558,7 @@ IMPORTANT: Ask users to respond with just the number corresponding to their choi
             programs = sunway_programs_service.get_programs_by_interest(interests)
         
         # Create system prompt for program recommendations
-        system_prompt = """You are an AI university advisor for Sunway University. You have analyzed the student's profile and are now providing personalized program recommendations.
-
-Student Profile:
-{profile_summary}
-
-ML Analysis Results:
-- Recruitment Likelihood: {likelihood}
-- Recommended Program Cluster: {cluster}
-- Confidence Level: {confidence}
-
-Guidelines:
-- Present programs from ALL the student's academic interests
-- If the student has multiple interests (e.g., Engineering AND Medicine), ensure you mention programs from BOTH areas
-- Explain why each program is recommended based on their specific interests
-- Include key details like duration, tuition, and department
-- Be enthusiastic about Sunway University
-- Encourage the student to learn more about specific programs
-- Offer to help with the application process
-- Explicitly mention that you've considered all their interests when making recommendations
-
-Program Recommendations:
-{program_suggestions}
-
-Provide a warm, encouraging response that presents these programs and guides the student toward next steps. Make sure to acknowledge that you've considered all their academic interests.""".format(
+        system_prompt = RECOMMENDATION_PROMPT.format(
             profile_summary=self.format_profile_summary(student_profile),
             likelihood=f"{prediction['probability']*100:.1f}%" if prediction else "Analyzing...",
             cluster=prediction.get('cluster', 'General') if prediction else 'General',
@@ -1285,138 +1566,48 @@ Provide a warm, encouraging response that presents these programs and guides the
             program_suggestions=sunway_programs_service.format_program_suggestions(programs)
         )
         
-        # Build conversation history
-        messages = [{"role": "user", "content": system_prompt}]
-        
-        if conversation_history:
-            for conv in conversation_history[-3:]:
-                messages.append({"role": "user", "content": conv['message']})
-                messages.append({"role": "assistant", "content": conv['ai_response']})
-        
-        messages.append({"role": "user", "content": message})
-        
-        # Call Claude API
-        response = self.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
-            messages=messages,
-            temperature=0.7
-        )
-        
-        ai_response = response.content[0].text
-        
-        # Enhance response with prediction insights
-        enhanced_response = self.enhance_response_with_prediction(ai_response, prediction)
-        
-        return {
-            'response': enhanced_response,
-            'prediction': prediction,
-            'confidence': prediction['confidence'] if prediction else 'low'
-        }
+        messages = self._build_messages(system_prompt, message, conversation_history, history_turns=3)
+        return messages, prediction
     
     def format_profile_summary(self, student_profile):
         """Format student profile for display"""
-        summary = []
-        
-        if student_profile.get('academic_interests'):
-            summary.append(f"Interests: {', '.join(student_profile['academic_interests'])}")
-        
-        if student_profile.get('family_income_level') != 'unknown':
-            summary.append(f"Income Level: {student_profile['family_income_level']}")
-        
-        if student_profile.get('academic_level'):
-            summary.append(f"Academic Level: {student_profile['academic_level']}")
-        
-        if student_profile.get('gpa'):
-            summary.append(f"GPA: {student_profile['gpa']}")
-        
-        if student_profile.get('first_generation'):
-            summary.append("First Generation Student: Yes")
-        
-        if student_profile.get('international_student'):
-            summary.append("International Student: Yes")
-        
-        return "\n".join(summary) if summary else "Profile information being collected..."
+        return _format_profile_summary(
+            tuple(student_profile.get('academic_interests') or ()),
+            student_profile.get('family_income_level'),
+            student_profile.get('academic_level'),
+            student_profile.get('gpa'),
+            student_profile.get('first_generation'),
+            student_profile.get('international_student')
+        )
     
     def extract_student_features(self, message, student_profile):
         """Extract features from student profile for ML prediction"""
-        features = {}
-        
-        # Use collected College Scorecard variables
-        college_scorecard_variables = [
-            'ADM_RATE', 'PCTPELL', 'C150_4', 'RET_FT4',
-            'TUITIONFEE_IN', 'TUITIONFEE_OUT', 'COSTT4_A',
-            'NPT4_PUB', 'NPT4_PRIV', 'UGDS', 'CONTROL', 'LOCALE'
-        ]
-        
-        for var in college_scorecard_variables:
-            key = f'college_scorecard_{var}'
-            if key in student_profile:
-                features[var] = float(student_profile[key])
-            else:
-                # Use default values if not collected
-                features[var] = self.get_default_value_for_variable(var)
-        
-        return features
-    
-    def get_default_value_for_variable(self, variable):
-        """Get default value for College Scorecard variable"""
-        defaults = {
-            'ADM_RATE': 0.7,      # Moderate admission rate
-            'PCTPELL': 0.3,       # Moderate Pell percentage
-            'C150_4': 0.6,        # Moderate completion rate
-            'RET_FT4': 0.7,       # Moderate retention rate
-            'TUITIONFEE_IN': 25000,  # Moderate in-state tuition
-            'TUITIONFEE_OUT': 35000, # Moderate out-of-state tuition
-            'COSTT4_A': 30000,       # Moderate total cost
-            'NPT4_PUB': 15000,       # Moderate public net price
-            'NPT4_PRIV': 25000,      # Moderate private net price
-            'UGDS': 5000,            # Moderate enrollment
-            'CONTROL': 1,            # Public institution
-            'LOCALE': 2              # Suburban
+        # Use collected College Scorecard variables, falling back to defaults for any not collected
+        return {
+            var: float(student_profile[key]) if key in student_profile else SCORECARD_DEFAULTS[var]
+            for var, key in FEATURE_KEYS.items()
         }
-        return defaults.get(variable, 0.0)
     
     def map_gpa_to_admission_rate(self, gpa):
         """Map GPA to admission rate"""
         if not gpa:
             return 0.7  # Default moderate admission rate
         
-        gpa = float(gpa)
-        if gpa >= 3.8:
-            return 0.9  # High admission rate
-        elif gpa >= 3.5:
-            return 0.8
-        elif gpa >= 3.0:
-            return 0.7
-        else:
-            return 0.6
+        return _step_lookup(ADM_RATE_BY_GPA, float(gpa))
     
     def map_income_to_pell_percentage(self, income_level):
         """Map income level to Pell grant percentage"""
         if not income_level:
             return 0.3  # Default moderate
         
-        income_level = income_level.lower()
-        if income_level in ['low', 'very_low']:
-            return 0.7  # High Pell percentage
-        elif income_level == 'medium':
-            return 0.4
-        else:
-            return 0.2  # Low Pell percentage
+        return PELL_BY_INCOME.get(income_level.lower(), 0.2)  # Low Pell percentage otherwise
     
     def map_confidence_to_completion_rate(self, confidence):
         """Map confidence to completion rate"""
         if not confidence:
             return 0.6  # Default moderate
         
-        confidence = int(confidence)
-        if confidence >= 8:
-            return 0.8  # High completion rate
-        elif confidence >= 6:
-            return 0.7
-        else:
-            return 0.5
+        return _step_lookup(C150_BY_CONFIDENCE, int(confidence))
     
     def map_fulltime_to_retention_rate(self, fulltime):
         """Map full-time study to retention rate"""
@@ -1433,13 +1624,7 @@ Provide a warm, encouraging response that presents these programs and guides the
         if not budget:
             return 25000  # Default moderate tuition
         
-        budget = float(budget)
-        if budget >= 40000:
-            return 35000  # High tuition
-        elif budget >= 25000:
-            return 25000
-        else:
-            return 15000  # Low tuition
+        return _step_lookup(TUITION_BY_BUDGET, float(budget))
     
     def map_international_to_tuition(self, international):
         """Map international status to out-of-state tuition"""
@@ -1447,22 +1632,16 @@ Provide a warm, encouraging response that presents these programs and guides the
             return 35000  # Default out-of-state
         
         if international.lower() == 'yes':
-            return 40000  # Higher for international
+            return INTL_TUITION  # Higher for international
         else:
-            return 30000
+            return DOMESTIC_TUITION
     
     def map_total_budget_to_cost(self, total_budget):
         """Map total budget to cost of attendance"""
         if not total_budget:
             return 30000  # Default moderate cost
         
-        total_budget = float(total_budget)
-        if total_budget >= 50000:
-            return 45000  # High cost
-        elif total_budget >= 30000:
-            return 30000
-        else:
-            return 20000  # Low cost
+        return _step_lookup(COST_BY_TOTAL_BUDGET, float(total_budget))
     
     def map_financial_aid_to_net_price(self, financial_aid):
         """Map financial aid eligibility to net price"""
@@ -1489,13 +1668,7 @@ Provide a warm, encouraging response that presents these programs and guides the
         if not class_size:
             return 5000  # Default moderate enrollment
         
-        class_size = class_size.lower()
-        if class_size == 'small':
-            return 2000  # Small enrollment
-        elif class_size == 'large':
-            return 15000  # Large enrollment
-        else:
-            return 5000  # Medium enrollment
+        return ENROLLMENT_BY_CLASS_SIZE.get(class_size.lower(), 5000)  # Medium enrollment otherwise
     
     def enhance_response_with_prediction(self, ai_response, prediction):
         """Enhance AI response based on ML prediction"""
@@ -1503,42 +1676,27 @@ Provide a warm, encouraging response that presents these programs and guides the
             return ai_response
         
         # Add prediction-based enhancements
-        if prediction['prediction'] == 1 and prediction['probability'] > 0.7:
-            # High likelihood of recruitment
-            enhancement = "\n\n🎯 **Great news!** Based on your profile, you're an excellent match for Sunway University programs! Your background and interests align perfectly with our offerings."
-        elif prediction['prediction'] == 1:
-            # Moderate likelihood
-            enhancement = "\n\n✨ **Excellent potential!** Your profile shows strong compatibility with Sunway University. We believe you'll thrive in our academic environment."
+        if prediction['prediction'] == 1:
+            likelihood = 'high' if prediction['probability'] > 0.7 else 'moderate'
         else:
-            # Lower likelihood - provide more support
-            enhancement = "\n\n💡 **Every student's journey is unique!** While we've identified some areas for consideration, Sunway University offers various support programs and pathways to help you succeed."
+            likelihood = 'low'
         
-        # Add cluster-specific information
+        # Add cluster-specific information and callback encouragement
         cluster = prediction.get('cluster', 'general')
-        cluster_info = {
-            'engineering_tech': "\n🔧 **Engineering & Technology Focus:** Our programs emphasize practical skills and industry connections.",
-            'business_finance': "\n💼 **Business & Finance Excellence:** Access to real-world projects and industry partnerships.",
-            'computer_science': "\n💻 **Computer Science Innovation:** Cutting-edge technology and AI-focused curriculum.",
-            'arts_design': "\n🎨 **Creative Arts & Design:** State-of-the-art facilities and industry mentorship.",
-            'hospitality_tourism': "\n🏨 **Hospitality & Tourism:** International partnerships and hands-on training."
-        }
-        
-        enhancement += cluster_info.get(cluster, "\n🌟 **Personalized Learning:** Programs tailored to your interests and career goals.")
-        
-        # Add callback encouragement
-        callback_text = "\n\n📞 **Next Steps:** Would you like to schedule a personalized consultation with our admissions team? They can provide detailed information about programs, financial aid, and application requirements tailored to your specific situation."
-        
-        return ai_response + enhancement + callback_text
+        return "".join((
+            ai_response,
+            LIKELIHOOD_HIGHLIGHTS[likelihood],
+            CLUSTER_HIGHLIGHTS.get(cluster, DEFAULT_CLUSTER_HIGHLIGHT),
+            CALLBACK_TEXT
+        ))
     
     def analyze_conversation_sentiment(self, message):
         """Analyze conversation sentiment for better responses"""
-        positive_words = ['interested', 'excited', 'great', 'good', 'love', 'want', 'help']
-        negative_words = ['worried', 'concerned', 'expensive', 'difficult', 'hard', 'problem']
-        
         message_lower = message.lower()
         
-        positive_count = sum(1 for word in positive_words if word in message_lower)
-        negative_count = sum(1 for word in negative_words if word in message_lower)
+        # Each distinct word counts once, however often it is repeated
+        positive_count = len(set(POSITIVE_WORDS_RE.findall(message_lower)))
+        negative_count = len(set(NEGATIVE_WORDS_RE.findall(message_lower)))
         
         if positive_count > negative_count:
             return 'positive'
@@ -1549,124 +1707,31 @@ Provide a warm, encouraging response that presents these programs and guides the
     
     def get_preset_answer_options(self, question_type):
         """Get pre-set answer options mapped to dataset values"""
-        preset_options = {
-            'gpa': [
-                {'label': '3.0 - 3.2', 'value': '3.1', 'mapped_value': 0.7},
-                {'label': '3.3 - 3.5', 'value': '3.4', 'mapped_value': 0.8},
-                {'label': '3.6 - 3.8', 'value': '3.7', 'mapped_value': 0.9},
-                {'label': '3.9 - 4.0', 'value': '3.95', 'mapped_value': 0.95}
-            ],
-            'income': [
-                {'label': 'Low Income', 'value': 'low', 'mapped_value': 0.7},
-                {'label': 'Medium Income', 'value': 'medium', 'mapped_value': 0.4},
-                {'label': 'High Income', 'value': 'high', 'mapped_value': 0.2}
-            ],
-            'confidence': [
-                {'label': 'Not Very Confident (1-3)', 'value': '2', 'mapped_value': 0.5},
-                {'label': 'Somewhat Confident (4-6)', 'value': '5', 'mapped_value': 0.6},
-                {'label': 'Confident (7-8)', 'value': '7.5', 'mapped_value': 0.7},
-                {'label': 'Very Confident (9-10)', 'value': '9.5', 'mapped_value': 0.8}
-            ],
-            'study_mode': [
-                {'label': 'Full-time', 'value': 'yes', 'mapped_value': 0.8},
-                {'label': 'Part-time', 'value': 'no', 'mapped_value': 0.6}
-            ],
-            'international': [
-                {'label': 'Local Student', 'value': 'no', 'mapped_value': 30000},
-                {'label': 'International Student', 'value': 'yes', 'mapped_value': 40000}
-            ],
-            'budget': [
-                {'label': '$10,000 - $20,000', 'value': '15000', 'mapped_value': 15000},
-                {'label': '$20,000 - $30,000', 'value': '25000', 'mapped_value': 25000},
-                {'label': '$30,000 - $40,000', 'value': '35000', 'mapped_value': 35000},
-                {'label': '$40,000+', 'value': '45000', 'mapped_value': 45000}
-            ],
-            'academic_interests': [
-                {'label': 'Business & Management', 'value': 'business', 'mapped_value': 'business'},
-                {'label': 'Engineering & Technology', 'value': 'engineering', 'mapped_value': 'engineering'},
-                {'label': 'Computer Science', 'value': 'computing', 'mapped_value': 'computing'},
-                {'label': 'Arts & Design', 'value': 'arts', 'mapped_value': 'arts'},
-                {'label': 'Hospitality & Tourism', 'value': 'hospitality', 'mapped_value': 'hospitality'},
-                {'label': 'Medicine & Health', 'value': 'medicine', 'mapped_value': 'medicine'}
-            ],
-            'class_size': [
-                {'label': 'Small Classes (< 30 students)', 'value': 'small', 'mapped_value': 2000},
-                {'label': 'Medium Classes (30-100 students)', 'value': 'medium', 'mapped_value': 5000},
-                {'label': 'Large Classes (> 100 students)', 'value': 'large', 'mapped_value': 15000}
-            ],
-            'financial_aid': [
-                {'label': 'Yes, I need financial aid', 'value': 'yes', 'mapped_value': 10000},
-                {'label': 'No, I don\'t need financial aid', 'value': 'no', 'mapped_value': 20000}
-            ],
-            'institution_type': [
-                {'label': 'Public Institution', 'value': 'no', 'mapped_value': 20000},
-                {'label': 'Private Institution', 'value': 'yes', 'mapped_value': 30000}
-            ]
-        }
-        return preset_options.get(question_type, [])
+        return PRESET_ANSWER_OPTIONS.get(question_type, [])
+    
+    def get_preset_answer_options_by_label(self, question_type):
+        """Get pre-set answer options keyed by lower-cased label"""
+        return PRESET_OPTIONS_BY_LABEL.get(question_type, {})
+
+    def get_preset_options_text(self, question_type):
+        """Get pre-set answer options rendered for the prompt"""
+        return PRESET_OPTIONS_TEXT.get(question_type, "No preset options available for this question.")
 
     def get_question_type(self, question):
         """Determine the type of question being asked"""
         question_lower = question.lower()
         
-        if 'gpa' in question_lower or 'grade' in question_lower:
-            return 'gpa'
-        elif 'income' in question_lower or 'financial' in question_lower:
-            return 'income'
-        elif 'confident' in question_lower or 'confidence' in question_lower:
-            return 'confidence'
-        elif 'full-time' in question_lower or 'part-time' in question_lower or 'study' in question_lower:
-            return 'study_mode'
-        elif 'international' in question_lower or 'local' in question_lower:
-            return 'international'
-        elif 'budget' in question_lower or 'tuition' in question_lower or 'cost' in question_lower:
-            return 'budget'
-        elif 'interest' in question_lower or 'field' in question_lower or 'major' in question_lower:
-            return 'academic_interests'
-        elif 'class size' in question_lower or 'size' in question_lower:
-            return 'class_size'
-        elif 'financial aid' in question_lower or 'aid' in question_lower:
-            return 'financial_aid'
-        elif 'private' in question_lower or 'public' in question_lower or 'institution' in question_lower:
-            return 'institution_type'
-        else:
-            return 'general'
-
-    def format_preset_options(self, preset_options):
-        """Format preset options for display in the prompt"""
-        if not preset_options:
-            return "No preset options available for this question."
-        
-        formatted_options = []
-        for i, option in enumerate(preset_options, 1):
-            formatted_options.append(f"{i}. {option['label']}")
-        
-        return "\n".join(formatted_options)
+        for question_type, keywords in QUESTION_TYPES:
+            if keywords.search(question_lower):
+                return question_type
+        return 'general'
 
     def get_current_question_type(self, student_profile):
         """Determine what question should be asked next based on missing information"""
-        if not student_profile.get('gpa'):
-            return 'gpa'
-        elif not student_profile.get('family_income_level') or student_profile.get('family_income_level') == 'unknown':
-            return 'income'
-        elif not student_profile.get('completion_confidence'):
-            return 'confidence'
-        elif not student_profile.get('fulltime_study'):
-            return 'study_mode'
-        elif student_profile.get('international_student') is None:
-            return 'international'
-        elif not student_profile.get('tuition_budget'):
-            return 'budget'
-        elif not student_profile.get('academic_interests'):
-            return 'academic_interests'
-        elif not student_profile.get('preferred_class_size'):
-            return 'class_size'
-        elif not student_profile.get('financial_aid_eligible'):
-            return 'financial_aid'
-        elif not student_profile.get('prefer_private'):
-            return 'institution_type'
-        else:
-            return 'general'
+        for question_type, unanswered in CURRENT_QUESTION_RULES:
+            if unanswered(student_profile):
+                return question_type
+        return 'general'
 
     def map_preset_selection_to_profile(self, selected_option, question_type, student_profile):
         """Map a preset selection to the appropriate profile field"""
@@ -1703,6 +1768,11 @@ Provide a warm, encouraging response that presents these programs and guides the
             student_profile['college_scorecard_TUITIONFEE_IN'] = mapped_value
             logger.info(f"Mapped preset budget: {value} → TUITIONFEE_IN: {mapped_value}")
             
+        elif question_type == 'total_budget':
+            student_profile['total_budget'] = int(mapped_value)
+            student_profile['college_scorecard_COSTT4_A'] = mapped_value
+            logger.info(f"Mapped preset total budget: {value} → COSTT4_A: {mapped_value}")
+            
         elif question_type == 'academic_interests':
             if 'academic_interests' not in student_profile:
                 student_profile['academic_interests'] = []
@@ -1727,7 +1797,8 @@ Provide a warm, encouraging response that presents these programs and guides the
 
     def get_conversation_state(self, student_id):
         """Get the current conversation state for a student"""
-        student_data = recruitment_service.students.get(student_id, {}).get('data', {})
+        # Prefer a profile staged this turn over the last saved copy
+        student_data = self._pending_profiles.get(student_id) or recruitment_service.students.get(student_id, {}).get('data', {})
         conversation_history = recruitment_service.get_conversation_history(student_id)
         
         # Determine what information has been collected
@@ -1759,22 +1830,14 @@ Provide a warm, encouraging response that presents these programs and guides the
         }
 
     def save_conversation_state(self, student_id, conversation_state):
-        """Save the conversation state to the database"""
+        """Save the conversation state to the database (written by flush_pending_writes)"""
         try:
-            # Save to recruitment service
-            recruitment_service.add_student({
-                'id': student_id,
-                'data': conversation_state['student_profile'],
-                'conversation_state': conversation_state,
-                'last_updated': datetime.now().isoformat()
-            })
+            # Stage for the recruitment service
+            self._pending_profiles[student_id] = conversation_state['student_profile']
             
             # Save conversation history
             if conversation_state.get('conversation_history'):
-                recruitment_service.save_conversation_history(
-                    student_id, 
-                    conversation_state['conversation_history']
-                )
+                self._pending_histories.append((student_id, conversation_state['conversation_history']))
             
             logger.info(f"Conversation state saved for student {student_id}")
             return True
@@ -1839,8 +1902,6 @@ Provide a warm, encouraging response that presents these programs and guides the
         Intelligently infer answers to related questions based on a primary answer.
         This implements the linking logic where one answer can automatically answer related questions.
         """
-        import re
-        
         message_lower = message.lower().strip()
         
         # Define inference rules based on primary variable and value
@@ -1958,12 +2019,10 @@ Provide a warm, encouraging response that presents these programs and guides the
         Apply contextual inferences based on the message content and current profile state.
         This handles more complex relationships and natural language patterns.
         """
-        import re
-        
         message_lower = message.lower().strip()
         
         # Scholarship/Financial Aid inferences
-        if any(word in message_lower for word in ['scholarship', 'financial aid', 'need money', 'can\'t afford', 'expensive']):
+        if FINANCIAL_NEED_RE.search(message_lower):
             if not student_profile.get('college_scorecard_NPT4_PUB'):
                 student_profile['college_scorecard_NPT4_PUB'] = 10000  # High financial aid need
                 logger.info("Inferred high financial aid need from message context")
@@ -1973,7 +2032,7 @@ Provide a warm, encouraging response that presents these programs and guides the
                 logger.info("Inferred public institution preference from financial context")
         
         # Academic performance inferences
-        if any(word in message_lower for word in ['excellent', 'top', 'high achiever', 'straight a', 'outstanding']):
+        if ACADEMIC_EXCELLENCE_RE.search(message_lower):
             if not student_profile.get('college_scorecard_C150_4'):
                 student_profile['college_scorecard_C150_4'] = 0.9  # High completion confidence
                 logger.info("Inferred high completion confidence from academic excellence")
@@ -1983,7 +2042,7 @@ Provide a warm, encouraging response that presents these programs and guides the
                 logger.info("Inferred high admission rate from academic excellence")
         
         # Budget constraints inferences
-        if any(word in message_lower for word in ['budget', 'affordable', 'cheap', 'cost-effective', 'value']):
+        if BUDGET_CONSCIOUS_RE.search(message_lower):
             if not student_profile.get('college_scorecard_COSTT4_A'):
                 student_profile['college_scorecard_COSTT4_A'] = 25000  # Moderate total cost
                 logger.info("Inferred moderate total cost from budget-conscious language")
@@ -0,0 +1,12 @@
+# Gunicorn settings for career_forecast_service (see the command at the bottom of that module)
+
+# Import the app in the master so a warm-up there is inherited by every worker
+preload_app = True
+
+def when_ready(server):
+    """Precompute forecasts once per deployment, in the master, before any worker is forked"""
+    import career_forecast_service as service
+    if service.FORECAST_WARMUP:
+        service.warm_forecast_cache()
+        # Workers fork from the master next; don't hand them the pool's threads
+        service.shutdown_analytics_pool()
@@ -1018,6 +1018,10 @@ class RecruitmentMLService:
         
         return conversation
     
+    def conversation_count(self):
+        """Number of stored conversations (the store is an in-memory list, so this is O(1))"""
+        return len(self.conversations)
+    
     def update_conversation_callback(self, student_id, conversation_index, callback_requested):
         """Update callback status for a conversation"""
         try:
@@ -1052,11 +1056,18 @@ class RecruitmentMLService:
         else:
             data_to_store = actual_data
         
-        self.students[student_id] = {
+        student_record = {
             'id': student_id,
             'data': data_to_store,
             'created_at': datetime.now().isoformat()
         }
+        
+        # Chat dialogue state is stored beside the profile data; a None value clears it
+        asked_question_group = student_data.get('asked_question_group', self.students.get(student_id, {}).get('asked_question_group'))
+        if asked_question_group:
+            student_record['asked_question_group'] = asked_question_group
+        
+        self.students[student_id] = student_record
         self.save_data()
         return student_id
     
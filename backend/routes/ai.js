@@ -29,8 +29,10 @@ router.post('/chat', async (req, res) => {
     let responseData = '';
     let errorData = '';
 
+    // The handler writes raw UTF-8; decode across chunk boundaries
+    pythonProcess.stdout.setEncoding('utf8');
     pythonProcess.stdout.on('data', (data) => {
-      responseData += data.toString();
+      responseData += data;
     });
 
     pythonProcess.stderr.on('data', (data) => {
@@ -72,6 +74,66 @@ router.post('/chat', async (req, res) => {
   }
 });
 
+// AI Chat endpoint (streaming) - relays the handler's JSON-line events as Server-Sent Events
+router.post('/chat/stream', async (req, res) => {
+  const { message, student_id } = req.body;
+
+  if (!message || !student_id) {
+    return res.status(400).json({
+      success: false,
+      message: 'Message and student_id are required'
+    });
+  }
+
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive'
+  });
+  res.flushHeaders();
+
+  const pythonProcess = spawn('python', [
+    path.join(__dirname, '../ai_chat_handler.py'),
+    '--message', message,
+    '--student_id', student_id,
+    '--stream'
+  ]);
+
+  let buffered = '';
+  let errorData = '';
+  let finished = false;
+
+  // The handler writes raw UTF-8; decode across chunk boundaries
+  pythonProcess.stdout.setEncoding('utf8');
+  pythonProcess.stdout.on('data', (data) => {
+    buffered += data;
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      if (line.includes('"type":"done"')) finished = true;
+      res.write(`data: ${line}\n\n`);
+    }
+  });
+
+  pythonProcess.stderr.on('data', (data) => {
+    errorData += data.toString();
+  });
+
+  pythonProcess.on('close', (code) => {
+    if (!finished) {
+      console.error('Python process error:', errorData);
+      res.write(`data: ${JSON.stringify({ type: 'error', message: 'Error processing AI response' })}\n\n`);
+    }
+    res.end();
+  });
+
+  // Stop generating if the client goes away mid-stream
+  res.on('close', () => {
+    if (!res.writableEnded) pythonProcess.kill();
+  });
+});
+
 // Get conversations for a specific student (for admin analysis)
 router.get('/conversations/:studentId', async (req, res) => {
   try {
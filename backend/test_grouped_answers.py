@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test numeric replies to grouped questions ("1, 3, 2") and their positional mapping
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from claude_ai_service import ClaudeAIService, GROUP_ANSWERS_RE
+
+ACADEMIC_BASICS = ['ADM_RATE', 'academic_interests', 'TUITIONFEE_OUT']
+
+def test_group_answers_re():
+    """Only lists of whole numbers count as a grouped answer"""
+    for message in ['1', '1,3,2', '1, 3, 2', '1 3 2', '2; 1/3']:
+        assert GROUP_ANSWERS_RE.match(message), message
+    for message in ['', '3.5', '1, 3 and 2', 'option 2', '1,']:
+        assert not GROUP_ANSWERS_RE.match(message), message
+
+def test_positional_mapping():
+    """Each number picks an option of the question in the same position"""
+    service = ClaudeAIService()
+    profile = service.create_student_profile({})
+
+    unanswered = service.parse_grouped_selection('2, 3, 1', profile, ACADEMIC_BASICS)
+
+    assert unanswered == []
+    assert profile['gpa'] == 3.4
+    assert profile['college_scorecard_ADM_RATE'] == 0.8
+    assert profile['academic_interests'] == ['computing']
+    assert profile['international_student'] is False
+    assert profile['college_scorecard_TUITIONFEE_OUT'] == 30000
+
+def test_out_of_range_and_missing_picks_stay_unanswered():
+    """Invalid picks are skipped, and they and any unanswered trailing questions are returned"""
+    service = ClaudeAIService()
+    profile = service.create_student_profile({})
+
+    unanswered = service.parse_grouped_selection('3, 2', profile, ['RET_FT4', 'C150_4', 'UGDS'])
+
+    assert unanswered == ['RET_FT4', 'UGDS']
+    assert 'fulltime_study' not in profile
+    assert profile['completion_confidence'] == 5.0
+
+def test_lone_number_is_a_preset_selection():
+    """A single number only answers a group of one question"""
+    service = ClaudeAIService()
+    profile = service.create_student_profile({})
+
+    assert service.parse_grouped_selection('2', profile, ACADEMIC_BASICS) is None
+    assert service.parse_grouped_selection('2', profile, ['UGDS']) == []
+    assert profile['preferred_class_size'] == 'medium'
+
+if __name__ == "__main__":
+    test_group_answers_re()
+    test_positional_mapping()
+    test_out_of_range_and_missing_picks_stay_unanswered()
+    test_lone_number_is_a_preset_selection()
+    print("✅ Grouped answer tests passed")
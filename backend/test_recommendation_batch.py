@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the Message Batches re-scoring path with a fake Claude client
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from claude_ai_service import ClaudeAIService
+
+class FakeBatches:
+    """Stands in for client.messages.batches; finishes after `polls` retrieve calls"""
+
+    def __init__(self, polls=1):
+        self.polls = polls
+        self.requests = []
+        self.cancelled = []
+
+    def create(self, requests):
+        self.requests = requests
+        return SimpleNamespace(id='batch-1')
+
+    def retrieve(self, batch_id):
+        self.polls -= 1
+        return SimpleNamespace(processing_status='ended' if self.polls <= 0 else 'in_progress')
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+    def results(self, batch_id):
+        for request in self.requests:
+            if request['custom_id'] == 'student-1':
+                yield SimpleNamespace(custom_id='student-1', result=SimpleNamespace(type='errored'))
+                continue
+            message = SimpleNamespace(content=[SimpleNamespace(text=f"Programs for {request['custom_id']}")])
+            yield SimpleNamespace(custom_id=request['custom_id'], result=SimpleNamespace(type='succeeded', message=message))
+
+def make_service(batches):
+    service = ClaudeAIService()
+    service.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+    service._build_recommendation_messages = lambda message, profile, history: ([{'role': 'user', 'content': message}], None)
+    return service
+
+def test_batch_results_map_back_to_students():
+    """Results are keyed by student id; failed entries are left out"""
+    batches = FakeBatches(polls=2)
+    service = make_service(batches)
+
+    results = service.generate_recommendations_batch(
+        [{'student_id': 'alice'}, {'student_id': 'bob'}, {'student_id': 'carol', 'message': 'Any computing programs?'}],
+        poll_interval=0
+    )
+
+    assert [request['custom_id'] for request in batches.requests] == ['student-0', 'student-1', 'student-2']
+    assert batches.requests[2]['params']['messages'][0]['content'] == 'Any computing programs?'
+    assert results == {
+        'alice': {'response': 'Programs for student-0', 'prediction': None, 'confidence': 'low'},
+        'carol': {'response': 'Programs for student-2', 'prediction': None, 'confidence': 'low'}
+    }
+
+def test_batch_timeout_cancels():
+    """A batch still running at the deadline is cancelled and TimeoutError is raised"""
+    batches = FakeBatches(polls=100)
+    service = make_service(batches)
+
+    try:
+        service.generate_recommendations_batch([{'student_id': 'alice'}], poll_interval=0, timeout=0)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected TimeoutError")
+    assert batches.cancelled == ['batch-1']
+
+if __name__ == "__main__":
+    test_batch_results_map_back_to_students()
+    test_batch_timeout_cancels()
+    print("✅ Recommendation batch tests passed")